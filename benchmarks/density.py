@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# This benchmark creates a graphene flake with s+p orbitals and calculates
+# the density on a grid, comparing the direct method and the tiled method.
+
+# This benchmark may be called using:
+#
+#  python $0 [N] [nthreads]
+#
+# and it may be post-processed using
+#
+#  python stats.py $0.profile
+#
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import time
+
+import numpy as np
+
+import sisl
+
+pr = cProfile.Profile()
+pr.disable()
+
+if len(sys.argv) > 1:
+    N = int(sys.argv[1])
+else:
+    N = 4
+if len(sys.argv) > 2:
+    nthreads = int(sys.argv[2])
+else:
+    nthreads = None
+print(f"N = {N}")
+
+# Always fix the random seed to make each profiling concurrent
+np.random.seed(1234567890)
+
+R = 2.5
+r = np.linspace(0, R, 200)
+f = np.exp(-r)
+orbs = [
+    o for l in (0, 1) for o in sisl.SphericalOrbital(l, (r, f), 1.0).toAtomicOrbital()
+]
+C = sisl.Atom(6, orbs)
+gr = sisl.geom.graphene(atoms=C, orthogonal=True).tile(N, 0).tile(N, 1)
+
+# Random (symmetric) density matrix
+DM = sisl.DensityMatrix(gr)
+for ia in gr:
+    idx = gr.close(ia, R=2 * R)
+    for io in gr.a2o(ia, all=True):
+        jo = gr.a2o(idx, all=True)
+        DM[io, jo] = np.random.rand(len(jo))
+DM = (DM + DM.transpose()) / 2
+
+grid = sisl.Grid(0.1, geometry=gr)
+t0 = time.time()
+DM.density(grid, method="direct")
+t_direct = time.time() - t0
+rho_direct = grid.grid.copy()
+
+grid.fill(0.0)
+t0 = time.time()
+pr.enable()
+DM.density(grid, method="tiled", nthreads=nthreads)
+pr.disable()
+t_tiled = time.time() - t0
+pr.dump_stats(f"{sys.argv[0]}.profile")
+
+print(f"grid shape: {grid.shape}")
+print(f"density (direct): {t_direct:.3f} s")
+print(f"density (tiled): {t_tiled:.3f} s")
+print(f"max difference: {np.fabs(grid.grid - rho_direct).max():.3e}")
+
+stat = pstats.Stats(pr)
+# We sort against total-time
+stat.sort_stats("tottime")
+# Only print the first 20% of the routines.
+stat.print_stats("sisl", 0.2)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# This benchmark creates a very large graphene flake and uses construct
+# to create it, comparing the iter_block method and the neighbor list method.
+
+# This benchmark may be called using:
+#
+#  python $0
+#
+# and it may be post-processed using
+#
+#  python stats.py $0.profile
+#
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import time
+
+import numpy as np
+
+import sisl
+
+pr = cProfile.Profile()
+pr.disable()
+
+if len(sys.argv) > 1:
+    N = int(sys.argv[1])
+else:
+    N = 200
+print(f"N = {N}")
+
+# Always fix the random seed to make each profiling concurrent
+np.random.seed(1234567890)
+
+gr = sisl.geom.graphene(orthogonal=True).tile(N, 0).tile(N, 1)
+
+t0 = time.time()
+H_block = sisl.Hamiltonian(gr)
+H_block.construct([(0.1, 1.44), (0.0, -2.7)])
+H_block.finalize()
+t_block = time.time() - t0
+
+H = sisl.Hamiltonian(gr)
+t0 = time.time()
+pr.enable()
+H.construct([(0.1, 1.44), (0.0, -2.7)], method="neighbor")
+H.finalize()
+pr.disable()
+t_neighbor = time.time() - t0
+pr.dump_stats(f"{sys.argv[0]}.profile")
+
+print(f"construct (iter_block): {t_block:.3f} s")
+print(f"construct (neighbor): {t_neighbor:.3f} s")
+assert H.spsame(H_block)
+
+stat = pstats.Stats(pr)
+# We sort against total-time
+stat.sort_stats("tottime")
+# Only print the first 20% of the routines.
+stat.print_stats("sisl", 0.2)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# This benchmark creates very large graphene flakes by tiling and
+# repeating an orthogonal and a non-orthogonal (with overlap)
+# Hamiltonian along 2 lattice vectors.
+
+# This benchmark may be called using:
+#
+#  python $0 [N]
+#
+# where N is the number of repetitions along each lattice vector
+# (the final Hamiltonians have 4 * N ** 2 orbitals).
+#
+# and it may be post-processed using
+#
+#  python stats.py $0.profile
+#
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import time
+
+import numpy as np
+
+import sisl
+
+pr = cProfile.Profile()
+pr.disable()
+
+if len(sys.argv) > 1:
+    N = int(sys.argv[1])
+else:
+    N = 500
+print(f"N = {N}")
+
+# Always fix the random seed to make each profiling concurrent
+np.random.seed(1234567890)
+
+gr = sisl.geom.graphene(orthogonal=True)
+H = sisl.Hamiltonian(gr)
+H.construct([(0.1, 1.44), (0.0, -2.7)])
+HS = sisl.Hamiltonian(gr, orthogonal=False)
+HS.construct([(0.1, 1.44), ((0.0, 1.0), (-2.7, 0.1))])
+
+for name, M in [("H", H), ("HS", HS)]:
+    for method in ("tile", "repeat"):
+        pr.enable()
+        t0 = time.time()
+        big = getattr(getattr(M, method)(N, 0), method)(N, 1)
+        t1 = time.time()
+        pr.disable()
+        print(f"{name}.{method}: {t1 - t0:.3f} s, no = {big.no}, nnz = {big.nnz}")
+        del big
+
+pr.dump_stats(f"{sys.argv[0]}.profile")
+
+
+stat = pstats.Stats(pr)
+# We sort against total-time
+stat.sort_stats("tottime")
+# Only print the first 20% of the routines.
+stat.print_stats("sisl", 0.2)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+# This benchmark creates a synthetic (large) Wannier90 <>_hr.dat file
+# and reads the Hamiltonian from it.
+
+# This benchmark may be called using:
+#
+#  python $0 [no] [nsc]
+#
+# where no is the number of Wannier functions and nsc the number of
+# supercells along each lattice vector (nsc ** 3 blocks of no ** 2 elements).
+#
+# and it may be post-processed using
+#
+#  python stats.py $0.profile
+#
+from __future__ import annotations
+
+import cProfile
+import itertools
+import pstats
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+import sisl
+
+pr = cProfile.Profile()
+pr.disable()
+
+if len(sys.argv) > 1:
+    no = int(sys.argv[1])
+else:
+    no = 40
+if len(sys.argv) > 2:
+    nsc = int(sys.argv[2])
+else:
+    nsc = 9
+print(f"no = {no}, nsc = {nsc}")
+
+# Always fix the random seed to make each profiling concurrent
+np.random.seed(1234567890)
+
+hsc = nsc // 2
+iscs = list(itertools.product(*[range(-hsc, hsc + 1)] * 3))
+nws = len(iscs)
+ws = np.random.randint(1, 5, nws)
+
+tmp = tempfile.TemporaryDirectory()
+f = Path(tmp.name) / "benchmark_hr.dat"
+t0 = time.time()
+with open(f, "w") as fh:
+    fh.write(" written by the sisl benchmark\n")
+    fh.write(f"{no:12d}\n{nws:12d}\n")
+    for i in range(0, nws, 15):
+        fh.write("".join(f"{w:5d}" for w in ws[i : i + 15]) + "\n")
+    # rows run fastest
+    c, r = np.divmod(np.arange(no**2), no)
+    for isc in iscs:
+        h = np.random.rand(no**2, 2) - 0.5
+        h[np.random.rand(no**2) < 0.5] = 0.0
+        fh.writelines(
+            f"{isc[0]:5d}{isc[1]:5d}{isc[2]:5d}{ri + 1:5d}{ci + 1:5d}{hr:12.6f}{hi:12.6f}\n"
+            for ri, ci, (hr, hi) in zip(r, c, h)
+        )
+print(f"writing {nws * no ** 2} elements: {time.time() - t0:.3f} s")
+
+sile = sisl.io.wannier90.hrSileWannier90(f)
+t0 = time.time()
+pr.enable()
+H = sile.read_hamiltonian(lattice=sisl.Lattice(5.0))
+pr.disable()
+print(f"read_hamiltonian: {time.time() - t0:.3f} s")
+print(H)
+pr.dump_stats(f"{sys.argv[0]}.profile")
+
+stat = pstats.Stats(pr)
+# We sort against total-time
+stat.sort_stats("tottime")
+# Only print the first 20% of the routines.
+stat.print_stats("sisl", 0.2)
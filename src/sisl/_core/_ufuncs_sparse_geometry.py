@@ -244,6 +244,27 @@ def repeat(SA: SparseAtom, reps: int, axis: int) -> SparseAtom:
     return S
 
 
+def _sc_offset(geom: Geometry, geom_n: Geometry, reps: int, axis: int):
+    """Supercell offsets of connections when repeating `geom` `reps` times along `axis`
+
+    Returns
+    -------
+    offset :
+        column offset of the supercell in `geom_n` for each repetition
+        and supercell index of `geom`, shape ``(reps, geom.n_s)``
+    rep :
+        the repetition the connection points to, for each repetition
+        and supercell index of `geom`, shape ``(reps, geom.n_s)``
+    """
+    isc = np.tile(geom.sc_off.astype(np.int32), (reps, 1, 1))
+    isc[..., axis], rep = np.divmod(
+        isc[..., axis] + _a.arangei(reps).reshape(-1, 1), reps
+    )
+    offset = geom_n.isc_off[isc[..., 0], isc[..., 1], isc[..., 2]]
+    offset *= np.int32(geom_n.no)
+    return offset, rep
+
+
 @register_sisl_dispatch(SparseOrbital, module="sisl")
 def tile(SO: SparseOrbital, reps: int, axis: int) -> SparseOrbital:
     """Create a tiled sparse orbital object, equivalent to `Geometry.tile`
@@ -286,39 +307,28 @@ def tile(SO: SparseOrbital, reps: int, axis: int) -> SparseOrbital:
         del idx
 
     # Information for the new Hamiltonian sparse matrix
-    no_n = np.int32(S.no)
     geom_n = S.geometry
 
-    # First loop on axis tiling and local
-    # atoms in the geometry
-    sc_index = geom_n.sc_index
-
     # Create new indptr, indices and D
     ncol = np.tile(ncol, reps)
     # Now indptr is complete
     indptr = _ncol_to_indptr(ncol)
     del ncol
-    indices = _a.emptyi([indptr[-1]])
-    indices.shape = (reps, -1)
-
-    # Now we should fill the data
-    isc = geom.o2isc(col)
-    # resulting atom in the new geometry (without wrapping
-    # for correct supercell, that will happen below)
-    JO = col % no + no * isc[:, axis]
 
-    # Create repetitions
-    for rep in range(reps):
-        # Correct the supercell information
-        isc[:, axis], mod = np.divmod(JO, no_n)
-
-        indices[rep, :] = mod + sc_index(isc) * no_n
-
-        # Step orbitals
-        JO += no
+    # The new column of an element only depends on the orbital,
+    # the supercell index of the old column and the repetition.
+    # With JO = io + no * (isc[axis] + rep) the new column is
+    #   divmod(JO, no * reps) -> (isc[axis], orbital)
+    # so we calculate the offsets for each repetition and supercell
+    # index, and add the orbital index.
+    offset, rep = _sc_offset(geom, geom_n, reps, axis)
+    sc, JO = np.divmod(col, no)
+    indices = rep[:, sc] * no
+    indices += offset[:, sc]
+    indices += JO
 
     # Clean-up
-    del isc, JO
+    del sc, JO, offset, rep
 
     S._csr = SparseCSR(
         (np.tile(D, (reps, 1)), indices.ravel(), indptr),
@@ -368,13 +378,8 @@ def repeat(SO: SparseOrbital, reps: int, axis: int) -> SparseOrbital:
         del idx
 
     # Information for the new Hamiltonian sparse matrix
-    no_n = np.int32(S.no)
     geom_n = S.geometry
 
-    # First loop on axis tiling and local
-    # orbitals in the geometry
-    sc_index = geom_n.sc_index
-
     # Create new indptr, indices and D
     idx = _a.array_arange(
         np.repeat(geom.firsto[:-1], reps), np.repeat(geom.firsto[1:], reps)
@@ -382,59 +387,36 @@ def repeat(SO: SparseOrbital, reps: int, axis: int) -> SparseOrbital:
     ncol = csr.ncol[idx]
     # Now indptr is complete
     indptr = _ncol_to_indptr(ncol)
-    # Note that D above is already reduced to a *finalized* state
-    # So we have to re-create the reduced index pointer
-    # Then we take repeat the data by smart indexing
-    D = D[_a.array_arange(_ncol_to_indptr(csr.ncol)[idx], n=ncol), :]
     del ncol, idx
-    indices = _a.emptyi([indptr[-1]])
-
-    # Now we should fill the data
-    isc = geom.o2isc(col)
-    # resulting orbital in the new geometry (without wrapping
-    # for correct supercell, that will happen below)
-    JO = col % no
-    # Get number of orbitals per atom (lasto - firsto + 1)
-    # This is faster than the direct call
 
+    # The new columns are calculated as in `tile`, however, the orbital
+    # offset of a repetition depends on the number of orbitals of the atom.
+    # This is required for multi-orbital cases where
+    # we should tile atomic orbitals, and repeat the atoms (only).
+    offset, rep = _sc_offset(geom, geom_n, reps, axis)
+    sc, JO = np.divmod(col, no)
     ja = geom.o2a(JO)
-    oJ = geom.firsto[ja]
-    oA = geom.lasto[ja] + 1 - oJ
+    indices = rep[:, sc] * geom.orbitals[ja]
+    indices += offset[:, sc]
     # Shift the orbitals corresponding to the
     # repetitions of all previous atoms
-    JO += oJ * (reps - 1)
-    # Get the offset orbitals
-    O = isc[:, axis] - 1
-    # We need to create and indexable atomic array
-    # This is required for multi-orbital cases where
-    # we should tile atomic orbitals, and repeat the atoms (only).
-    # 'A' is now the first (non-repeated) atom in the new structure
-    A = _a.arangei(geom.na) * reps
-    AO = geom_n.lasto[A] - geom_n.firsto[A] + 1
-    # subtract AO for first iteration in repetition loop
-    OA = geom_n.firsto[A] - AO
-
-    # Clean
-    del ja, oJ, A
-
-    # Get view of ncol
-    ncol = SO._csr.ncol
-
-    # Create repetitions
-    for _ in range(reps):
-        # Update atomic offset
-        OA += AO
-        # Update the offset
-        O += 1
-        # Correct supercell information
-        isc[:, axis], mod = np.divmod(O, reps)
-
-        # Create the indices for the repetition
-        idx = _a.array_arange(indptr[_a.array_arange(OA, n=AO)], n=ncol)
-        indices[idx] = JO + oA * mod + sc_index(isc) * no_n
+    JO += geom.firsto[ja] * (reps - 1)
+    indices += JO
 
     # Clean-up
-    del isc, JO, O, OA, AO, idx
+    del sc, JO, ja, offset, rep
+
+    # The elements of an atom are contiguous in the old matrix, in the new
+    # matrix they are placed consecutively for each of the repetitions.
+    # Note that D above is already reduced to a *finalized* state
+    # So we have to re-create the reduced index pointer
+    ptr = _ncol_to_indptr(csr.ncol)[geom.firsto]
+    n = np.repeat(np.diff(ptr), reps)
+    ptr = np.repeat(ptr[:-1], reps)
+    D = D[_a.array_arange(ptr, n=n), :]
+    ptr += np.tile(_a.arangel(reps) * len(col), geom.na)
+    indices = indices.ravel()[_a.array_arange(ptr, n=n)]
+    del ptr, n
 
     # In the repeat we have to tile individual atomic couplings
     # So we should split the arrays and tile them individually
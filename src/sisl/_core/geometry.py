@@ -3710,12 +3710,12 @@ class Geometry(
         # supercell by add_R in each direction.
         # For extremely skewed lattices this will be way too much, hence we make
         # them square.
-        o = self.lattice.to.Cuboid(True)
+        o = self.lattice.to.Cuboid(orthogonal=True)
         lattice = Lattice(o._v + np.diag(2 * add_R), origin=o.origin - add_R)
 
         # Retrieve all atoms within the grid supercell
         # (and the neighbours that connect into the cell)
-        IA, XYZ, ISC = self.within_inf(lattice, periodic=self.pbc)
+        IA, XYZ, ISC = self.within_inf(lattice, periodic=self.pbc.tolist())
         XYZ -= self.lattice.origin.reshape(1, 3)
 
         # within_inf translates atoms to the unit cell to compute
@@ -3739,11 +3739,13 @@ class Geometry(
             corners_i = grid.index(corners)
 
             cmin = np.maximum(corners_i.min(axis=0), 0)
-            cmax = np.maximum(corners_i.max(axis=0) + 1, 0)
+            cmax = np.minimum(corners_i.max(axis=0) + 1, grid.shape)
+            # the sphere does not overlap with the grid
+            cmax = np.maximum(cmax, cmin)
 
-            rx = slice(cmin[0], min(cmax[0], grid.shape[0]))
-            ry = slice(cmin[1], min(cmax[1], grid.shape[1]))
-            rz = slice(cmin[2], min(cmax[2], grid.shape[2]))
+            rx = slice(cmin[0], cmax[0])
+            ry = slice(cmin[1], cmax[1])
+            rz = slice(cmin[2], cmax[2])
 
             indices = np.mgrid[rx, ry, rz].reshape(3, -1).T
 
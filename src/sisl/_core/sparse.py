@@ -1653,6 +1653,88 @@ column indices of the sparse elements
 
         return out
 
+    @classmethod
+    def from_coo(cls, rows, cols, data, shape, dtype=None, duplicates: str = "sum"):
+        """Create a sparse matrix from COO triplets in a single pass
+
+        The triplets are sorted (and duplicates reduced) in one go, so this
+        is much faster than setting the elements one row at a time.
+        The returned matrix is finalized.
+
+        Parameters
+        ----------
+        rows : array_like
+            row indices of the elements
+        cols : array_like
+            column indices of the elements
+        data : array_like
+            values of the elements, either of shape ``(nnz,)`` (the value is
+            used for all dimensions) or ``(nnz, K)``
+        shape : tuple of int
+            shape of the sparse matrix, ``(M, N)`` or ``(M, N, K)``
+        dtype : numpy.dtype, optional
+            data-type of the sparse matrix, defaults to the data-type of `data`
+        duplicates : {"sum", "overwrite"}
+            how duplicate ``(row, col)`` entries are handled, either they are summed,
+            or the last occurring element is retained.
+        """
+        rows = asarray(rows).ravel()
+        cols = asarray(cols).ravel()
+        data = asarray(data)
+        if dtype is None:
+            dtype = data.dtype
+        shape = tuple(shape)
+        if len(shape) == 2:
+            K = 1 if data.ndim < 2 else data.shape[1]
+            shape = shape + (K,)
+        M, N, K = shape
+
+        n = len(rows)
+        if len(cols) != n or data.shape[0] != n:
+            raise ValueError(
+                f"{cls.__name__}.from_coo requires rows, cols and data to have the same length"
+            )
+        if duplicates not in ("sum", "overwrite"):
+            raise ValueError(
+                f"{cls.__name__}.from_coo got unknown duplicates argument '{duplicates}', [sum, overwrite]"
+            )
+
+        out = cls(shape, dtype=dtype, nnzpr=1, nnz=1)
+        if n == 0:
+            return out
+
+        if (
+            np_any(rows < 0)
+            or np_any(M <= rows)
+            or np_any(cols < 0)
+            or np_any(N <= cols)
+        ):
+            raise ValueError(
+                f"{cls.__name__}.from_coo got indices outside the shape {shape[:2]}"
+            )
+        data = np.broadcast_to(data.reshape(n, -1), (n, K))
+
+        # Sort elements (stable, so the order of duplicates is retained)
+        key = rows.astype(np.int64) * N + cols
+        idx = argsort(key, kind="stable")
+        key = key[idx]
+        data = data[idx]
+        # first element of each unique key
+        start = concatenate(([True], diff(key) != 0)).nonzero()[0]
+        if duplicates == "sum":
+            D = np.add.reduceat(data, start, axis=0)
+        else:
+            D = data[concatenate((start[1:], [n])) - 1]
+        rows, cols = np.divmod(key[start], N)
+
+        out.ncol = np.bincount(rows, minlength=M).astype(int32, copy=False)
+        out.ptr = _ncol_to_indptr(out.ncol)
+        out.col = cols.astype(int32, copy=False)
+        out._nnz = len(out.col)
+        out._D = D.astype(dtype, copy=False)
+        out._finalized = True
+        return out
+
     def remove(self, indices):
         """Return a new sparse CSR matrix with all the indices removed
 
@@ -34,10 +34,11 @@ from sisl._core import Atom, Geometry, Orbital
 from sisl._internal import set_module
 from sisl.messages import SislError, SislWarning, deprecate_argument, progressbar, warn
 from sisl.typing import AtomsIndex, CellAxes, Coord, SeqOrScalarFloat
+from sisl.utils.mathematics import fnorm
 from sisl.utils.misc import direction
 from sisl.utils.ranges import list2str
 
-from .sparse import SparseCSR, _ncol_to_indptr, issparse
+from .sparse import SparseCSR, _ncol_to_indptr, _to_coo, issparse
 
 __all__ = ["SparseAtom", "SparseOrbital"]
 
@@ -630,6 +631,10 @@ class _SparseGeometry(NDArrayOperatorsMixin):
         ...     for ix, p in zip(idx, params):
         ...         self[ia, ix] = p
 
+        The returned function also has a ``vectorized`` attribute which sets
+        all elements from a complete neighbor list, it is used by
+        ``construct(..., method="neighbor")``.
+
         Notes
         -----
         This function only works for geometry sparse matrices (i.e. one
@@ -661,11 +666,144 @@ class _SparseGeometry(NDArrayOperatorsMixin):
             for ix, p in zip(idx, params):
                 self[ia, ix] = p
 
+        def vectorized(self, ia, ja, d):
+            shell = searchsorted(R, d)
+            self.set_bulk(ia, ja, np.asarray(params)[shell])
+
         func.R = R
         func.params = params
+        func.vectorized = vectorized
 
         return func
 
+    def set_bulk(self, i, j, values, duplicates: str = "overwrite"):
+        """Set many elements at once from COO triplets
+
+        Instead of extending the sparse pattern row by row (as done when setting
+        elements through indexing), all elements (including the existing ones)
+        are sorted and the sparse pattern is created in one pass.
+        The matrix will be finalized afterwards.
+
+        Parameters
+        ----------
+        i :
+           row indices
+        j :
+           column indices (including the supercell offsets)
+        values :
+           values for each element, either of shape ``(len(i),)`` in which case the value
+           is used for all dimensions, or ``(len(i), self.dim)``.
+        duplicates : {"overwrite", "sum"}
+           how duplicate elements are handled, also with respect to elements
+           already in the matrix. Either the last element is retained (i.e. like
+           ``self[i, j] = values``) or the values are summed (i.e. like
+           ``self[i, j] += values``).
+
+        See Also
+        --------
+        SparseCSR.from_coo : the routine that creates the sparse pattern
+        """
+        i = _a.asarrayi(i).ravel()
+        j = _a.asarrayi(j).ravel()
+        values = np.broadcast_to(
+            np.asarray(values).reshape(len(i), -1), (len(i), self.dim)
+        )
+        csr = self._csr
+        if csr.nnz > 0:
+            rows, cols, D = _to_coo(csr)
+            i = concatenate((rows, i))
+            j = concatenate((cols, j))
+            values = concatenate((D, values.astype(csr.dtype, copy=False)))
+        self._csr = SparseCSR.from_coo(
+            i, j, values, csr.shape, dtype=csr.dtype, duplicates=duplicates
+        )
+
+    def _construct_neighbor(self, func, R, eta=None):
+        """Construct the sparse model using a single neighbor list (see `construct`)"""
+        # Import here to avoid circular imports
+        from sisl.geom import NeighborFinder
+
+        geom = self.geometry
+        lattice = geom.lattice
+        na = geom.na
+        periodic = lattice.nsc > 1
+        # small buffer to not be affected by the finders comparison
+        R_max = R[-1] + 1e-4
+
+        # The neighbor finder requires all atoms to be inside the unit-cell.
+        # Along periodic directions we move atoms individually (and correct
+        # the supercell indices afterwards), along the non-periodic directions
+        # we translate all atoms and extend the lattice vector (if needed).
+        fxyz = geom.fxyz
+        shift = np.where(periodic, np.floor(fxyz), 0).astype(int32)
+        xyz = geom.xyz - shift @ lattice.cell
+        fmin = np.where(periodic, 0, fxyz.min(0))
+        xyz -= fmin @ lattice.cell
+
+        # Distance between the lattice planes. The bins in the finder are
+        # determined along the lattice vectors, so for skewed cells the bins
+        # needs to be larger to ensure they are wide enough.
+        spacing = 2 * np.pi / fnorm(lattice.rcell)
+        span = fxyz.max(0) - fxyz.min(0)
+        # number of repetitions (periodic) or scaling (non-periodic) of the
+        # lattice vectors to ensure the finder can do its job
+        reps = (2 * R_max + 0.01) / spacing
+        cell = lattice.cell.copy()
+        for ax in range(3):
+            if periodic[ax]:
+                reps[ax] = max(1, np.ceil(reps[ax]))
+            else:
+                cell[ax] *= max(1, reps[ax], span[ax] + 0.01)
+                reps[ax] = 1
+        reps = reps.astype(int32)
+
+        # Tile periodic directions that are too short
+        isc_tile = np.indices(reps[::-1]).reshape(3, -1)[::-1].T
+        xyz = (xyz.reshape(1, -1, 3) + (isc_tile @ cell).reshape(-1, 1, 3)).reshape(
+            -1, 3
+        )
+        cell *= reps.reshape(3, 1)
+
+        finder_lattice = lattice.copy(cell)
+        finder_lattice.pbc = [bool(p) for p in periodic]
+        finder_geom = Geometry(
+            xyz, geom.atoms.tile(len(isc_tile)), lattice=finder_lattice
+        )
+        finder = NeighborFinder(
+            finder_geom,
+            R=R_max,
+            bin_size=np.maximum(
+                2, finder_geom.length * fnorm(finder_lattice.rcell) / np.pi
+            ),
+        )
+        if len(isc_tile) == 1:
+            neighs = finder.find_neighbors(self_interaction=True)
+        else:
+            neighs = finder.find_neighbors(_a.arange(na), self_interaction=True)
+        ia = neighs.i
+        ja_tile, ja = np.divmod(neighs.j, na)
+        isc = neighs.isc * reps + isc_tile[ja_tile] + shift[ia] - shift[ja]
+
+        # Only retain couplings inside the supercell
+        valid = np.all(np.abs(isc) <= lattice.nsc // 2, axis=1)
+        ia = ia[valid]
+        ja = ja[valid]
+        isc = isc[valid]
+
+        # Distances in the original geometry
+        d = fnorm(geom.xyz[ja] + isc @ lattice.cell - geom.xyz[ia])
+
+        # Shells are R[s-1] < d <= R[s] (same as Geometry.close)
+        valid = d <= R[-1]
+        ia = ia[valid]
+        ja = ja[valid] + lattice.sc_index(isc[valid]) * na
+        d = d[valid]
+
+        eta = progressbar(self.na, f"{self.__class__.__name__ }.construct", "atom", eta)
+        func(self, ia, ja, d)
+        eta.update(self.na)
+        eta.close()
+
     def construct(self, func, na_iR: int = 1000, method: str = "rand", eta=None):
         """Automatically construct the sparse model based on a function that does the setting up of the elements
 
@@ -699,8 +837,14 @@ class _SparseGeometry(NDArrayOperatorsMixin):
         na_iR : int, optional
            number of atoms within the sphere for speeding
            up the `iter_block` loop.
-        method : {'rand', str}
-           method used in `Geometry.iter_block`, see there for details
+        method : {'rand', 'neighbor', str}
+           method used in `Geometry.iter_block`, see there for details.
+           If ``'neighbor'`` the full neighbor list is created once through
+           `~sisl.geom.NeighborFinder` and all elements are set in one go. In this case
+           `func` is called once as ``func(self, ia, ja, d)`` with arrays of all pairs
+           (``ja`` being supercell atomic indices and ``d`` the distances),
+           functions returned by `create_construct` handles this automatically.
+           This is *much* faster for large systems.
         eta : bool, optional
            whether an ETA will be printed
 
@@ -738,6 +882,19 @@ class _SparseGeometry(NDArrayOperatorsMixin):
         except AttributeError:
             R = None
 
+        if method == "neighbor":
+            try:
+                R_neigh = np.atleast_1d(func.R)
+            except AttributeError:
+                raise ValueError(
+                    f"{self.__class__.__name__}.construct(method='neighbor') requires "
+                    "a function with the radii attached (`func.R`), see `create_construct`."
+                )
+            self._construct_neighbor(
+                getattr(func, "vectorized", func), R_neigh, eta=eta
+            )
+            return
+
         iR = self.geometry.iR(na_iR, R=R)
 
         # Create eta-object
@@ -178,6 +178,43 @@ def test_diagonal_2d():
     assert np.allclose(d[:, 1], d2)
 
 
+@pytest.mark.parametrize("duplicates", ["sum", "overwrite"])
+def test_from_coo(duplicates):
+    rows = [0, 2, 1, 0, 2, 0]
+    cols = [3, 1, 1, 3, 0, 1]
+    data = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    s = SparseCSR.from_coo(rows, cols, data, (3, 4), duplicates=duplicates)
+    assert s.finalized
+    assert s.nnz == 5
+    assert s.shape == (3, 4, 1)
+    if duplicates == "sum":
+        assert s[0, 3] == 5.0
+    else:
+        assert s[0, 3] == 4.0
+    assert s[0, 1] == 6.0
+    assert s[2, 0] == 5.0
+    assert np.allclose(s.col[s.ptr[0] : s.ptr[1]], [1, 3])
+
+    # compare against scipy for random input
+    rng = np.random.default_rng(1234)
+    rows = rng.integers(0, 20, 200)
+    cols = rng.integers(0, 30, 200)
+    data = rng.random([200, 2])
+    s = SparseCSR.from_coo(rows, cols, data, (20, 30))
+    for d in range(2):
+        coo = sc.sparse.coo_matrix((data[:, d], (rows, cols)), shape=(20, 30))
+        assert np.allclose(s.tocsr(d).toarray(), coo.toarray())
+
+
+def test_from_coo_fail():
+    with pytest.raises(ValueError):
+        SparseCSR.from_coo([0, 1], [0], [1, 2], (2, 2))
+    with pytest.raises(ValueError):
+        SparseCSR.from_coo([0, 2], [0, 1], [1, 2], (2, 2))
+    with pytest.raises(ValueError):
+        SparseCSR.from_coo([0, 1], [0, 1], [1, 2], (2, 2), duplicates="min")
+
+
 def test_extend1():
     csr = SparseCSR((10, 10), nnzpr=1, dtype=np.int32)
     csr[1, 1] = 3
@@ -111,6 +111,47 @@ class TestSparseAtom:
         with pytest.raises(ValueError):
             s1.construct([[0.1, 1.5], [1]])
 
+    @pytest.mark.parametrize("shift", [0, -1.5])
+    @pytest.mark.parametrize("R", [[0.1, 1.5], [0.1, 1.1, 2.2]])
+    def test_construct_neighbor(self, setup, shift, R):
+        g = setup.g.move([shift] * 3)
+        P = np.arange(len(R)) + 1
+        s1 = SparseAtom(g)
+        s1.construct([R, P])
+        s2 = SparseAtom(g)
+        s2.construct([R, P], method="neighbor")
+        assert s1.spsame(s2)
+        assert np.allclose((s1 - s2)._csr._D, 0)
+
+    def test_construct_neighbor_molecule(self):
+        g = graphene().tile(3, 0).tile(2, 1).move([-10, 4, 0])
+        g.set_nsc([1] * 3)
+        s1 = SparseAtom(g)
+        s1.construct([[0.1, 1.5], [1, 2]])
+        s2 = SparseAtom(g)
+        s2.construct([[0.1, 1.5], [1, 2]], method="neighbor")
+        assert s1.spsame(s2)
+
+    def test_set_bulk(self, setup):
+        s1 = SparseAtom(setup.g, 2)
+        s1[0, [1, 2]] = 1.0
+        s1.set_bulk([1, 0, 2, 1], [0, 2, 3, 0], [[1, 2], [3, 4], [5, 6], [7, 8]])
+        assert s1.finalized
+        assert s1.nnz == 4
+        assert np.allclose(s1[0, 1], [1, 1])
+        assert np.allclose(s1[0, 2], [3, 4])
+        assert np.allclose(s1[1, 0], [7, 8])
+        s1.set_bulk([0, 0], [1, 1], [1, 2], duplicates="sum")
+        assert s1.nnz == 4
+        assert np.allclose(s1[0, 1], [4, 4])
+
+    def test_construct_neighbor_fail(self, setup):
+        def func(self, ia, atoms, atoms_xyz=None):
+            pass
+
+        with pytest.raises(ValueError):
+            setup.s1.construct(func, method="neighbor")
+
     def test_untile1(self, setup):
         s1 = SparseAtom(setup.g)
         s1.construct([[0.1, 1.5], [1, 2]])
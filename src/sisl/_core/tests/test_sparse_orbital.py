@@ -48,6 +48,43 @@ def test_sparse_orbital_symmetric(n0, n1, n2):
     assert s.nnz == nnz
 
 
+@pytest.mark.parametrize("method", ["tile", "repeat"])
+@pytest.mark.parametrize("axis", [0, 1, 2])
+@pytest.mark.parametrize("reps", [1, 2, 3])
+def test_sparse_orbital_tile_repeat_construct(method, axis, reps):
+    # multiple orbitals and more than nearest neighbour supercells
+    g = Geometry(
+        [[0, 0, 0], [1, 0.5, 0.5]],
+        [Atom(6, R=[2.1] * 3), Atom(1, R=2.1)],
+        lattice=Lattice([1.5, 2, 2.5], nsc=[5, 3, 3]),
+    )
+    R = [0.1, 1.6, 2.1]
+
+    def func(s, ia, atoms, atoms_xyz=None):
+        geom = s.geometry
+        idx = geom.close(ia, R=R, atoms=atoms, atoms_xyz=atoms_xyz)
+        for shell, JA in enumerate(idx):
+            for ja in JA:
+                lj = geom.firsto[ja % geom.na] + ja // geom.na * geom.no
+                for io in geom.a2o(ia, all=True):
+                    # values depend on the shell and the atomic orbitals
+                    s[io, geom.a2o(ja, all=True)] = [
+                        [shell + 1, io - geom.firsto[ia] + (jo - lj) / 10]
+                        for jo in geom.a2o(ja, all=True)
+                    ]
+
+    s = SparseOrbital(g, 2)
+    s.construct(func)
+    s1 = getattr(s, method)(reps, axis)
+
+    s2 = SparseOrbital(getattr(g, method)(reps, axis), 2)
+    s2.construct(func)
+    s1.finalize()
+    s2.finalize()
+    assert s1.spsame(s2)
+    assert np.allclose(s1._csr._D, s2._csr._D)
+
+
 @pytest.mark.parametrize("n0", [1, 3])
 @pytest.mark.parametrize("n1", [1, 4])
 @pytest.mark.parametrize("n2", [1, 2])
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import functools
 import warnings
+from collections import OrderedDict
 
 import numpy as np
 
@@ -15,9 +16,10 @@ __all__ += ["isndarray", "isiterable", "voigt_matrix"]
 __all__ += ["get_dtype"]
 __all__ += ["dtype_complex_to_real", "dtype_real_to_complex"]
 __all__ += ["wrap_filterwarnings"]
+__all__ += ["LRUCache"]
 
 # Wrappers typically used
-__all__ += ["xml_parse"]
+__all__ += ["xml_parse", "xml_iterparse"]
 
 
 # Base-class for string object checks
@@ -26,6 +28,7 @@ import collections.abc as collections_abc
 # Load the correct xml-parser
 try:
     from defusedxml import __version__ as defusedxml_version
+    from defusedxml.ElementTree import iterparse as xml_iterparse
     from defusedxml.ElementTree import parse as xml_parse
 
     try:
@@ -35,6 +38,7 @@ try:
     except Exception:
         raise ImportError
 except ImportError:
+    from xml.etree.ElementTree import iterparse as xml_iterparse
     from xml.etree.ElementTree import parse as xml_parse
 
 
@@ -267,3 +271,46 @@ def wrap_filterwarnings(*args, **kwargs):
         return wrap_func
 
     return decorator
+
+
+class LRUCache:
+    """A least-recently-used cache with a maximum number of entries
+
+    Contrary to `functools.lru_cache` this is an object that can be attached
+    to an instance, and hence its content lives (and dies) with the instance.
+
+    Parameters
+    ----------
+    maxsize :
+       maximum number of entries stored, if 0 nothing will be stored
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the value for `key` (and mark it as recently used), else `default`"""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def __setitem__(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries in the cache"""
+        self._data.clear()
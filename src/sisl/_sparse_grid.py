@@ -291,7 +291,7 @@ class SparseGridOrbitalBZ(Sparse4DGrid):
             # We should expand the coefficients to the whole supercell, applying phases.
             k = np.array(k, dtype=np.float64)
 
-            if np.any(k > 1e-5):
+            if np.any(np.fabs(k) > 1e-5):
                 # Compute phases
                 phases = phase_rsc(self.geometry.lattice, k, dtype=np.complex128)
                 # Expand the coefficients array.
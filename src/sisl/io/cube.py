@@ -3,6 +3,9 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+import re
+from itertools import islice
+
 import numpy as np
 
 from sisl import Atom, Geometry, Grid, Lattice, SislError
@@ -18,6 +21,85 @@ from ._help import header_to_dict
 __all__ = ["cubeSile"]
 
 
+# number of lines parsed in one go when reading the grid data
+_CHUNK_LINES = 65536
+
+# formats that can be written using `_format_e`
+_FMT_E = re.compile(r"^(\d*)\.([0-8])e$")
+
+
+def _format_e(values, width: int, prec: int, ncol: int = 6) -> str:
+    """Format `values` as ``"{:{width}.{prec}e}"`` with `ncol` values per line
+
+    The formatting is done with array operations on the digits,
+    instead of formatting each value individually.
+    The values are separated by a single space, and the text is identical
+    to formatting each value individually.
+    Only finite values with ``prec < 9`` are supported.
+    """
+
+    def scale(a, p):
+        # scale in two steps, 10 ** p overflows for very small (subnormal) values
+        p2 = p // 2
+        return a * np.power(10.0, p2) * np.power(10.0, p - p2)
+
+    a = np.fabs(values)
+    nz = a > 0
+    e = np.floor(np.log10(a, out=np.zeros_like(a), where=nz))
+    m = np.rint(scale(a, prec - e))
+    # correct inaccuracies of log10 and rounding to the next decade
+    lim = 10.0 ** (prec + 1)
+    fix = (m >= lim) | (nz & (m < lim / 10))
+    if fix.any():
+        e[fix] += np.where(m[fix] >= lim, 1, -1)
+        m[fix] = np.rint(scale(a[fix], prec - e[fix]))
+    m = m.astype(np.uint32)
+    e = e.astype(np.int32)
+    ae = np.abs(e)
+    neg = np.signbit(values)
+    # exponents are written with 2 digits, unless 3 digits are required
+    e2 = ae < 100
+
+    # Write all values right-aligned with 3 exponent digits, and
+    # remove the padding (and superfluous exponent digit) afterwards.
+    # digits, ".", "e", exponent sign and exponent digits
+    nchar = prec + 1 + int(prec > 0) + 2 + 3
+    w = max(width + 1, nchar + 1)
+
+    # the last column is the separator
+    chars = np.full((len(a), w + 1), ord(" "), dtype=np.uint8)
+    i = w - 1
+    for _ in range(3):
+        chars[:, i] = ae % 10 + ord("0")
+        ae //= 10
+        i -= 1
+    chars[:, i] = np.where(e < 0, ord("-"), ord("+"))
+    chars[:, i - 1] = ord("e")
+    i -= 2
+    for _ in range(prec):
+        chars[:, i] = m % 10 + ord("0")
+        m //= 10
+        i -= 1
+    if prec > 0:
+        chars[:, i] = ord(".")
+        i -= 1
+    chars[:, i] = m + ord("0")
+    i -= 1
+    chars[neg, i] = ord("-")
+
+    # number of characters (sign and padding) in front of the first digit
+    nlead = np.maximum(width - (nchar - e2), neg)
+    keep = np.ones(chars.shape, dtype=bool)
+    keep[:, : i + 1] = np.arange(i + 1) > i - nlead.reshape(-1, 1)
+    keep[e2, w - 3] = False
+
+    chars[ncol - 1 :: ncol, w] = ord("\n")
+    out = chars[keep].tobytes().decode()
+    if len(a) % ncol != 0:
+        out += "\n"
+    return out
+
+
 @set_module("sisl.io")
 class cubeSile(Sile):
     """CUBE file object
@@ -165,7 +247,13 @@ class cubeSile(Sile):
             The grid data is assumed to be unit-less, this unit only refers
             to the lattice vectors and atomic coordinates.
         buffersize : int, optional
-           size of the buffer while writing the data, (6144)
+           size of the buffer while writing the data, (98304 for
+           plain exponential formats, otherwise 6144)
+
+        Notes
+        -----
+        Exponential formats (``fmt="[width].<prec>e"`` with ``prec < 9``) are
+        formatted in bulk, and all values are aligned in columns of equal width.
         """
         # Check that we can write to the file
         sile_raise_write(self)
@@ -179,42 +267,47 @@ class cubeSile(Sile):
                 grid.geometry, size=grid.shape, unit=unit, *args, **kwargs
             )
 
-        buffersize = kwargs.get("buffersize", min(6144, grid.grid.size))
-        buffersize += buffersize % 6  # ensure multiple of 6
-
         # A CUBE file contains grid-points aligned like this:
         # for x
         #   for y
         #     for z
         #       write...
+        if imag:
+            data = grid.grid.imag
+        else:
+            data = grid.grid.real
+
+        # check whether the vectorized formatting can be used
+        fmt_e = _FMT_E.match(fmt)
+        if fmt_e is None:
+            buffersize = kwargs.get("buffersize", 6144)
+        else:
+            width = int(fmt_e.group(1) or 0)
+            prec = int(fmt_e.group(2))
+            buffersize = kwargs.get("buffersize", 6 * 2**14)
+        buffersize = min(buffersize, grid.grid.size)
+        buffersize += (6 - buffersize % 6) % 6  # ensure multiple of 6
+
         _fmt1 = "{:" + fmt + "} "
         _fmt6 = (_fmt1 * 6)[:-1] + "\n"
         __fmt = _fmt6 * (buffersize // 6)
 
-        if imag:
-            for z in np.nditer(
-                np.asarray(grid.grid.imag, order="C").reshape(-1),
-                flags=["external_loop", "buffered"],
-                op_flags=[["readonly"]],
-                order="C",
-                buffersize=buffersize,
-            ):
-                if z.shape[0] != buffersize:
-                    s = z.shape[0]
-                    __fmt = _fmt6 * (s // 6) + _fmt1 * (s % 6) + "\n"
-                self._write(__fmt.format(*z.tolist()))
-        else:
-            for z in np.nditer(
-                np.asarray(grid.grid.real, order="C").reshape(-1),
-                flags=["external_loop", "buffered"],
-                op_flags=[["readonly"]],
-                order="C",
-                buffersize=buffersize,
-            ):
-                if z.shape[0] != buffersize:
-                    s = z.shape[0]
-                    __fmt = _fmt6 * (s // 6) + _fmt1 * (s % 6) + "\n"
-                self._write(__fmt.format(*z.tolist()))
+        for z in np.nditer(
+            np.asarray(data, order="C").reshape(-1),
+            flags=["external_loop", "buffered"],
+            op_flags=[["readonly"]],
+            order="C",
+            buffersize=buffersize,
+        ):
+            if fmt_e is not None and np.isfinite(z).all():
+                self._write(_format_e(z, width, prec))
+                continue
+            if z.shape[0] != buffersize:
+                s = z.shape[0]
+                __fmt = _fmt6 * (s // 6)
+                if s % 6 != 0:
+                    __fmt += _fmt1 * (s % 6) + "\n"
+            self._write(__fmt.format(*z.tolist()))
 
         # Add a finishing line to ensure empty ending
         self._write("\n")
@@ -289,7 +382,7 @@ class cubeSile(Sile):
         return Geometry(xyz * unit2Ang, atom, lattice=lattice)
 
     @sile_fh_open()
-    def read_grid(self, imag=None) -> Grid:
+    def read_grid(self, imag=None, mmap=None) -> Grid:
         """Returns `Grid` object from the CUBE file
 
         Parameters
@@ -297,6 +390,10 @@ class cubeSile(Sile):
         imag : str or Sile or Grid
             the imaginary part of the grid. If the geometries does not match
             an error will be raised.
+        mmap : str or pathlib.Path, optional
+            store the grid data in a memory-mapped file at this path (it will be
+            overwritten), useful for grids larger than the available memory.
+            Only applies to the real part of the grid.
         """
         if not imag is None:
             if not isinstance(imag, Grid):
@@ -322,18 +419,39 @@ class cubeSile(Sile):
         for i in range(na):
             self.readline()
 
+        if mmap is None:
+            data = np.empty(ngrid, dtype=np.float64)
+        else:
+            data = np.memmap(mmap, dtype=np.float64, mode="w+", shape=tuple(ngrid))
+        flat = data.reshape(-1)
+        n = flat.size
+
+        # Parse chunks of lines in bulk, this enables reading
+        # 1-column data and 6-column data.
+        i = 0
+        while True:
+            lines = list(islice(self.fh, _CHUNK_LINES))
+            if len(lines) == 0:
+                break
+            vals = np.fromstring("".join(lines), dtype=np.float64, sep=" ")
+            if i + len(vals) > n:
+                raise SislError(
+                    f"{self!s} contains more grid values than the grid shape {ngrid}."
+                )
+            flat[i : i + len(vals)] = vals
+            i += len(vals)
+        if i != n:
+            raise SislError(
+                f"{self!s} contains fewer grid values than the grid shape {ngrid}."
+            )
+
+        # Since we populate the grid data afterwards there
+        # is no need to create a bigger grid than necessary.
         if geom is None:
-            grid = Grid(ngrid, dtype=np.float64, lattice=lattice)
+            grid = Grid([1, 1, 1], dtype=np.float64, lattice=lattice)
         else:
-            grid = Grid(ngrid, dtype=np.float64, geometry=geom)
-        grid.grid.shape = (-1,)
-
-        # TODO check performance of this
-        # We are currently doing this to enable reading
-        #  1-column data and 6-column data.
-        lines = [item for sublist in self.fh.readlines() for item in sublist.split()]
-        grid.grid[:] = np.array(lines).astype(grid.dtype, copy=False)
-        grid.grid.shape = ngrid
+            grid = Grid([1, 1, 1], dtype=np.float64, geometry=geom)
+        grid.grid = data
 
         if imag is None:
             return grid
@@ -3,10 +3,12 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+import threading
 from collections import deque, namedtuple
 from itertools import product
 from numbers import Integral
-from typing import Optional, Tuple
+from queue import Full, Queue
+from typing import List, Optional, Tuple
 
 import numpy as np
 
@@ -70,6 +72,145 @@ def _toF(array, dtype, scale=None):
     return out
 
 
+def _fortran_record_skip(fh) -> int:
+    """Skip the next sequential unformatted Fortran record (without reading the payload)
+
+    Records larger than 2 GB are split into sub-records (negative markers).
+
+    Returns
+    -------
+    int
+        the payload size of the record
+    """
+    size = 0
+    while True:
+        marker = np.frombuffer(fh.read(4), dtype=np.int32)
+        if len(marker) == 0:
+            raise EOFError("end of file reached while reading Fortran record")
+        marker = int(marker[0])
+        fh.seek(abs(marker) + 4, 1)
+        size += abs(marker)
+        if marker >= 0:
+            return size
+
+
+def _fortran_record_read(fh) -> bytes:
+    """Read the payload of the next sequential unformatted Fortran record (no sub-records)"""
+    marker = np.frombuffer(fh.read(4), dtype=np.int32)
+    if len(marker) == 0 or marker[0] < 0:
+        raise SileError("could not read Fortran record")
+    data = fh.read(int(marker[0]))
+    fh.seek(4, 1)
+    return data
+
+
+class _FortranRows:
+    """Sparse matrix data stored with one Fortran record per row (as Siesta does)
+
+    The data is read from a memory-map of the file by only skipping the record
+    markers, and may be placed directly in the final arrays.
+
+    Parameters
+    ----------
+    ncol :
+        number of elements in each row
+    """
+
+    def __init__(self, ncol):
+        self.ncol = ncol
+        self.ptr = _ncol_to_indptr(ncol)
+        self.nnz = int(self.ptr[-1])
+        self._mask = {}
+
+    def nbytes(self, itemsize: int) -> int:
+        """Size of all records (including the record markers)"""
+        return self.nnz * itemsize + 8 * len(self.ncol)
+
+    def _mask_of(self, itemsize: int):
+        """Mask of the data elements between the first and last record marker"""
+        mask = self._mask.get(itemsize)
+        if mask is None:
+            # the trailing and leading marker between rows is a whole number of elements
+            skip = 8 // itemsize
+            nrow = len(self.ncol)
+            mask = np.ones(self.nnz + skip * (nrow - 1), dtype=np.bool_)
+            markers = self.ptr[1:-1] + skip * _a.arangel(nrow - 1)
+            for i in range(skip):
+                mask[markers + i] = False
+            self._mask[itemsize] = mask
+        return mask
+
+    def read(self, buf, offset: int, dtype, out=None):
+        """Read the rows stored at `offset` in the memory-map `buf`
+
+        Parameters
+        ----------
+        buf : numpy.memmap
+            memory-map of the file (as ``uint8``)
+        offset :
+            file offset of the leading marker of the first row
+        dtype :
+            data-type of the stored elements
+        out : numpy.ndarray, optional
+            place the data in this array (of length ``nnz``)
+
+        Returns
+        -------
+        numpy.ndarray
+            the data of all rows
+        int
+            the file offset after the records
+        """
+        dtype = np.dtype(dtype)
+        itemsize = dtype.itemsize
+        if 8 % itemsize != 0:
+            raise SileError(f"cannot read records with element size {itemsize}")
+        end = offset + self.nbytes(itemsize)
+        if len(self.ncol) == 0:
+            return np.empty(0, dtype=dtype) if out is None else out, end
+
+        # check the leading and trailing markers of all records
+        markers = buf[offset:end].view(np.int32)
+        lead = (self.ptr[:-1] * itemsize) // 4 + 2 * _a.arangel(len(self.ncol))
+        size = self.ncol * itemsize
+        if not (
+            np.array_equal(markers[lead], size)
+            and np.array_equal(markers[lead + 1 + size // 4], size)
+        ):
+            raise SileError("inconsistent Fortran record markers")
+
+        data = buf[offset + 4 : end - 4].view(dtype)
+        mask = self._mask_of(itemsize)
+        if out is None:
+            out = np.compress(mask, data)
+        elif out.dtype == dtype:
+            np.compress(mask, data, out=out)
+        else:
+            out[:] = data[mask]
+        return out, end
+
+
+def _spin_select(spin, nspin: int):
+    """Indices of the spin components to read from a file with `nspin` components
+
+    A single component results in an unpolarized matrix, two components in a
+    polarized matrix, otherwise all components must be read (in order).
+    """
+    if spin is None:
+        return _a.arangei(nspin)
+    sel = _a.asarrayi(spin).ravel()
+    if np.any(sel < 0) or np.any(sel >= nspin):
+        raise ValueError(
+            f"spin components {sel.tolist()} are not in the range [0, {nspin})"
+        )
+    if len(sel) not in (1, 2) and not np.array_equal(sel, _a.arangei(nspin)):
+        raise ValueError(
+            "spin selection must be 1 component, 2 components or all components "
+            f"in order, got {sel.tolist()}"
+        )
+    return sel
+
+
 def _geometry_align(geom_b, geom_u, cls, method):
     """Routine used to align two geometries
 
@@ -288,13 +429,121 @@ class onlysSileSiesta(SileBinSiesta):
         # Create and return geometry object
         return Geometry(xyz, atom, lattice=lattice)
 
-    def read_overlap(self, **kwargs) -> Overlap:
-        """Returns the overlap matrix from the TranSiesta file"""
+    def _r_sparse_mmap(self, method: str, spin=None):
+        """Read the sparse matrices through a memory-map of the file
+
+        Only the requested data is read, and it is placed directly in the returned
+        data array.
+
+        Parameters
+        ----------
+        method :
+            name of the calling method (for error messages)
+        spin : array_like of int, optional
+            indices of the Hamiltonian components to read, if empty only the overlap
+            is read
+
+        Returns
+        -------
+        ncol : numpy.ndarray
+        col : numpy.ndarray
+            column indices (0-based)
+        D : numpy.ndarray
+            the Hamiltonian components (Fermi-level shifted, in eV) followed by
+            the overlap matrix in the last column
+        isc : numpy.ndarray
+            supercell offsets
+        """
+        with open(self.file, "rb") as fh:
+            rec = _fortran_record_read(fh)
+            if len(rec) != 4 or np.frombuffer(rec, dtype=np.int32)[0] != 1:
+                raise SileError(
+                    f"{self!r}.{method} memory-mapped reading requires a version 1 file."
+                )
+            _, no_u, no_s, nspin, nnz = np.frombuffer(
+                _fortran_record_read(fh)[:20], dtype=np.int32
+            ).tolist()
+            # nsc; cell, xa
+            for _ in range(2):
+                _fortran_record_skip(fh)
+            Gamma, _, onlyS = (
+                np.frombuffer(_fortran_record_read(fh)[:12], dtype=np.int32) != 0
+            ).tolist()
+            # kscell, kdispl
+            _fortran_record_skip(fh)
+            Ef = np.frombuffer(_fortran_record_read(fh)[:8], dtype=np.float64)[0]
+            # istep, ia1; lasto
+            for _ in range(2):
+                _fortran_record_skip(fh)
+            ncol = np.frombuffer(_fortran_record_read(fh), dtype=np.int32).copy()
+            offset = fh.tell()
+
+        if spin is None:
+            spin = _a.arangei(nspin)
+        if len(spin) > 0 and onlyS:
+            raise SileError(f"{self!r}.{method} file does not contain a Hamiltonian.")
+
+        rows = _FortranRows(ncol)
+        if rows.nnz != nnz:
+            raise SileError(f"{self!r}.{method} inconsistent number of elements.")
+
+        buf = np.memmap(self.file, dtype=np.uint8, mode="r")
+        try:
+            col, offset = rows.read(buf, offset, np.int32)
+            col -= 1
+
+            D = _a.emptyd([nnz, len(spin) + 1])
+            S = D[:, -1]
+            _, offset = rows.read(buf, offset, np.float64, out=S)
+
+            nbytes = rows.nbytes(8)
+            for i, s in enumerate(spin):
+                H = D[:, i]
+                rows.read(buf, offset + s * nbytes, np.float64, out=H)
+                if s < 2:
+                    # the diagonal spin components are shifted to the Fermi-level
+                    H -= Ef * S
+            if not onlyS:
+                offset += nspin * nbytes
+        finally:
+            del buf
+        D[:, :-1] *= _Ry2eV
+
+        if Gamma:
+            isc = _a.zerosi([no_s // no_u, 3])
+        else:
+            with open(self.file, "rb") as fh:
+                fh.seek(offset)
+                isc = np.frombuffer(_fortran_record_read(fh), dtype=np.int32)
+            isc = isc.reshape(-1, 3)
+
+        return ncol, col, D, isc
+
+    def read_overlap(self, mmap: bool = False, **kwargs) -> Overlap:
+        """Returns the overlap matrix from the TranSiesta file
+
+        Parameters
+        ----------
+        mmap :
+            read the sparse matrix through a memory-map of the file, directly into
+            the sparse matrix buffers (only version 1 files)
+        """
         tshs_g = self.read_geometry()
         geom = _geometry_align(
             tshs_g, kwargs.get("geometry", tshs_g), self.__class__, "read_overlap"
         )
 
+        if mmap:
+            ncol, col, D, isc = self._r_sparse_mmap("read_overlap", spin=[])
+            S = Overlap(geom, nnzpr=1)
+            S._csr.ncol = ncol
+            S._csr.ptr = _ncol_to_indptr(ncol)
+            S._csr.col = col
+            S._csr._nnz = len(col)
+            S._csr._D = D
+            _csr_from_sc_off(S.geometry, isc, S._csr)
+            return S.transpose(sort=kwargs.get("sort", True))
+
         # read the sizes used...
         sizes = _siesta.read_tshs_sizes(self.file)
         self._fortran_check("read_overlap", "could not read sizes.")
@@ -345,7 +594,9 @@ class onlysSileSiesta(SileBinSiesta):
 class tshsSileSiesta(onlysSileSiesta):
     """Geometry, Hamiltonian and overlap matrix file"""
 
-    def read_hamiltonian(self, geometry=None, **kwargs) -> Hamiltonian:
+    def read_hamiltonian(
+        self, geometry=None, spin=None, mmap: bool = False, **kwargs
+    ) -> Hamiltonian:
         """Electronic structure from the siesta.TSHS file
 
         The TSHS file format does *not* contain exact orbital information.
@@ -361,6 +612,14 @@ class tshsSileSiesta(onlysSileSiesta):
         geometry : Geometry, optional
            override the contained geometry in the returned Hamiltonian. Useful
            when reading files directly using this class.
+        spin : int or list of int, optional
+           only read these spin components (Siesta ordering of the components in the file).
+           A single component returns an unpolarized Hamiltonian, two components
+           a polarized Hamiltonian. Defaults to all components.
+        mmap : bool, optional
+           read the sparse matrices through a memory-map of the file, directly into
+           the sparse matrix buffers (only version 1 files). This reduces the peak
+           memory usage for large files.
 
         Examples
         --------
@@ -384,16 +643,49 @@ class tshsSileSiesta(onlysSileSiesta):
         # read the sizes used...
         sizes = _siesta.read_tshs_sizes(self.file)
         self._fortran_check("read_hamiltonian", "could not read sizes.")
+        sel = _spin_select(spin, sizes[0])
+        spin = len(sel)
+        no = sizes[2]
+        nnz = sizes[4]
+
+        if mmap:
+            ncol, col, D, isc = self._r_sparse_mmap("read_hamiltonian", spin=sel)
+            dS = D[:, -1]
+
+            # Check whether it is an orthogonal basis set
+            orthogonal = np.abs(dS).sum() == geom.no
+
+            # Find all indices where dS == 1
+            if np.any(col[np.isclose(dS, 1.0).nonzero()[0]] >= no):
+                raise SileError(
+                    f"{self!r}.read_hamiltonian could not assert "
+                    "the supercell connections in the primary unit-cell."
+                )
+
+            H = Hamiltonian(geom, spin, nnzpr=1, orthogonal=orthogonal)
+            H._csr.ncol = ncol
+            H._csr.ptr = _ncol_to_indptr(ncol)
+            H._csr.col = col
+            H._csr._nnz = len(col)
+            if orthogonal:
+                self._log("read orthogonal hamiltonian")
+                D = np.ascontiguousarray(D[:, :spin])
+            else:
+                self._log("read non-orthogonal hamiltonian")
+            H._csr._D = D
+
+            _mat_spin_convert(H)
+            _csr_from_sc_off(H.geometry, isc, H._csr)
+            return H.transpose(spin=False, sort=kwargs.get("sort", True))
+
         # see onlysSileSiesta.read_lattice for .T
         isc = _siesta.read_tshs_cell(self.file, sizes[3])[2].T
         self._fortran_check("read_hamiltonian", "could not read cell.")
-        spin = sizes[0]
-        no = sizes[2]
-        nnz = sizes[4]
-        ncol, col, dH, dS = _siesta.read_tshs_hs(self.file, spin, no, nnz)
+        ncol, col, dH, dS = _siesta.read_tshs_hs(self.file, sizes[0], no, nnz)
         self._fortran_check(
             "read_hamiltonian", "could not read Hamiltonian and overlap matrix."
         )
+        dH = dH[:, sel]
 
         # Check whether it is an orthogonal basis set
         orthogonal = np.abs(dS).sum() == geom.no
@@ -1314,15 +1606,22 @@ class hsxSileSiesta(SileBinSiesta):
         self._fortran_check("read_fermi_level", "could not read Fermi-level")
         return Ef * _Ry2eV
 
-    def _r_hamiltonian_v0(self, **kwargs):
+    def _r_hamiltonian_v0(self, spin=None, mmap: bool = False, **kwargs):
+        if mmap:
+            raise SileError(
+                f"{self!r}.read_hamiltonian memory-mapped reading requires a version 1 file."
+            )
         geom = self.read_geometry(**kwargs)
 
         # Now read the sizes used...
-        spin, _, no, no_s, nnz = _siesta.read_hsx_sizes(self.file)
+        nspin, _, no, no_s, nnz = _siesta.read_hsx_sizes(self.file)
         self._fortran_check("read_hamiltonian", "could not read Hamiltonian sizes.")
-        ncol, col, dH, dS, _ = _siesta.read_hsx_hsx0(self.file, spin, no, no_s, nnz)
+        sel = _spin_select(spin, nspin)
+        spin = len(sel)
+        ncol, col, dH, dS, _ = _siesta.read_hsx_hsx0(self.file, nspin, no, no_s, nnz)
         col -= 1
         self._fortran_check("read_hamiltonian", "could not read Hamiltonian.")
+        dH = dH[:, sel]
 
         if geom.no != no or geom.no_s != no_s:
             raise SileError(
@@ -1353,15 +1652,65 @@ class hsxSileSiesta(SileBinSiesta):
 
         return H.transpose(spin=False, sort=kwargs.get("sort", True))
 
-    def _r_hamiltonian_v1(self, **kwargs):
+    def _r_sparse_mmap_v1(self, method: str, spin=None):
+        """Read the sparse matrices through a memory-map of the file
+
+        See `onlysSileSiesta._r_sparse_mmap` for details, the returned Hamiltonian
+        components are shifted to the Fermi-level.
+        """
+        with open(self.file, "rb") as fh:
+            rec = _fortran_record_read(fh)
+            if len(rec) != 4 or np.frombuffer(rec, dtype=np.int32)[0] != 1:
+                raise SileError(
+                    f"{self!r}.{method} memory-mapped reading requires a version 1 file."
+                )
+            is_dp = np.frombuffer(_fortran_record_read(fh)[:4], dtype=np.int32)[0] != 0
+            dtype = np.float64 if is_dp else np.float32
+            sizes = np.frombuffer(_fortran_record_read(fh)[:28], dtype=np.int32)
+            _, no_u, nspin, nspecies = sizes[:4].tolist()
+            n_s = int(np.prod(sizes[4:]))
+            # ucell, Ef, qtot, temp
+            Ef = np.frombuffer(_fortran_record_read(fh)[:80], dtype=np.float64)[9]
+            # isc, xa, isa, lasto
+            isc = np.frombuffer(_fortran_record_read(fh)[: 12 * n_s], dtype=np.int32)
+            isc = isc.reshape(-1, 3)
+            # species information
+            for _ in range(nspecies + 1):
+                _fortran_record_skip(fh)
+            ncol = np.frombuffer(_fortran_record_read(fh), dtype=np.int32).copy()
+            offset = fh.tell()
+
+        if spin is None:
+            spin = _a.arangei(nspin)
+
+        rows = _FortranRows(ncol)
+        buf = np.memmap(self.file, dtype=np.uint8, mode="r")
+        try:
+            col, offset = rows.read(buf, offset, np.int32)
+            col -= 1
+
+            D = _a.emptyd([rows.nnz, len(spin) + 1])
+            S = D[:, -1]
+            nbytes = rows.nbytes(np.dtype(dtype).itemsize)
+            rows.read(buf, offset + nspin * nbytes, dtype, out=S)
+            for i, s in enumerate(spin):
+                H = D[:, i]
+                rows.read(buf, offset + s * nbytes, dtype, out=H)
+                if s < 2:
+                    # the diagonal spin components are shifted to the Fermi-level
+                    H -= Ef * S
+        finally:
+            del buf
+        D[:, :-1] *= _Ry2eV
+
+        return ncol, col, D, isc
+
+    def _r_hamiltonian_v1(self, spin=None, mmap: bool = False, **kwargs):
         # Now read the sizes used...
         geom = self.read_geometry(**kwargs)
 
-        spin, _, no, no_s, nnz = _siesta.read_hsx_sizes(self.file)
+        nspin, _, no, no_s, nnz = _siesta.read_hsx_sizes(self.file)
         self._fortran_check("read_hamiltonian", "could not read Hamiltonian sizes.")
-        ncol, col, dH, dS, isc = _siesta.read_hsx_hsx1(self.file, spin, no, no_s, nnz)
-        col -= 1
-        self._fortran_check("read_hamiltonian", "could not read Hamiltonian.")
 
         if geom.no != no or geom.no_s != no_s:
             raise SileError(
@@ -1370,6 +1719,27 @@ class hsxSileSiesta(SileBinSiesta):
                 "inconsistent with HSX file."
             )
 
+        sel = _spin_select(spin, nspin)
+        spin = len(sel)
+
+        if mmap:
+            ncol, col, D, isc = self._r_sparse_mmap_v1("read_hamiltonian", spin=sel)
+            H = Hamiltonian(geom, spin, nnzpr=1, orthogonal=False)
+            H._csr.ncol = ncol
+            H._csr.ptr = _ncol_to_indptr(ncol)
+            H._csr.col = col
+            H._csr._nnz = len(col)
+            H._csr._D = D
+
+            _mat_spin_convert(H)
+            _csr_from_sc_off(H.geometry, isc, H._csr)
+            return H.transpose(spin=False, sort=kwargs.get("sort", True))
+
+        ncol, col, dH, dS, isc = _siesta.read_hsx_hsx1(self.file, nspin, no, no_s, nnz)
+        col -= 1
+        self._fortran_check("read_hamiltonian", "could not read Hamiltonian.")
+        dH = dH[:, sel]
+
         # Create the Hamiltonian container
         H = Hamiltonian(geom, spin, nnzpr=1, dtype=np.float32, orthogonal=False)
 
@@ -1390,18 +1760,38 @@ class hsxSileSiesta(SileBinSiesta):
         # Convert the supercells to sisl supercells
         _csr_from_sc_off(H.geometry, isc.T, H._csr)
 
-        # Correct the fermi-level here
+        # Correct the fermi-level here (only the diagonal spin components)
         Ef = self.read_fermi_level()
-        H.shift(-Ef)
+        for i, s in enumerate(sel):
+            if s < 2:
+                H._csr._D[:, i] -= Ef * H._csr._D[:, spin]
 
         return H.transpose(spin=False, sort=kwargs.get("sort", True))
 
-    def read_hamiltonian(self, **kwargs) -> Hamiltonian:
-        """Returns the electronic structure from the siesta.TSHS file"""
-        return getattr(self, f"_r_hamiltonian_v{self.version}")(**kwargs)
+    def read_hamiltonian(self, spin=None, mmap: bool = False, **kwargs) -> Hamiltonian:
+        """Returns the electronic structure from the siesta.HSX file
+
+        Parameters
+        ----------
+        spin : int or list of int, optional
+           only read these spin components (Siesta ordering of the components in the file).
+           A single component returns an unpolarized Hamiltonian, two components
+           a polarized Hamiltonian. Defaults to all components.
+        mmap : bool, optional
+           read the sparse matrices through a memory-map of the file, directly into
+           the sparse matrix buffers (only version 1 files). This reduces the peak
+           memory usage for large files.
+        """
+        return getattr(self, f"_r_hamiltonian_v{self.version}")(
+            spin=spin, mmap=mmap, **kwargs
+        )
 
-    def _r_overlap_v0(self, **kwargs):
+    def _r_overlap_v0(self, mmap: bool = False, **kwargs):
         """Returns the overlap matrix from the siesta.HSX file"""
+        if mmap:
+            raise SileError(
+                f"{self!r}.read_overlap memory-mapped reading requires a version 1 file."
+            )
         geom = self.read_geometry(**kwargs)
 
         # Now read the sizes used...
@@ -1438,16 +1828,13 @@ class hsxSileSiesta(SileBinSiesta):
         # not really necessary with Hermitian transposing, but for consistency
         return S.transpose(sort=kwargs.get("sort", True))
 
-    def _r_overlap_v1(self, **kwargs):
+    def _r_overlap_v1(self, mmap: bool = False, **kwargs):
         """Returns the overlap matrix from the siesta.HSX file"""
         geom = self.read_geometry(**kwargs)
 
         # Now read the sizes used...
         spin, _, no, no_s, nnz = _siesta.read_hsx_sizes(self.file)
         self._fortran_check("read_overlap", "could not read overlap matrix sizes.")
-        ncol, col, dS, isc = _siesta.read_hsx_sx1(self.file, spin, no, no_s, nnz)
-        col -= 1
-        self._fortran_check("read_overlap", "could not read overlap matrix.")
 
         if geom.no != no or geom.no_s != no_s:
             raise SileError(
@@ -1456,6 +1843,21 @@ class hsxSileSiesta(SileBinSiesta):
                 "inconsistent with HSX file."
             )
 
+        if mmap:
+            ncol, col, D, isc = self._r_sparse_mmap_v1("read_overlap", spin=[])
+            S = Overlap(geom, nnzpr=1)
+            S._csr.ncol = ncol
+            S._csr.ptr = _ncol_to_indptr(ncol)
+            S._csr.col = col
+            S._csr._nnz = len(col)
+            S._csr._D = D
+            _csr_from_sc_off(S.geometry, isc, S._csr)
+            return S.transpose(sort=kwargs.get("sort", True))
+
+        ncol, col, dS, isc = _siesta.read_hsx_sx1(self.file, spin, no, no_s, nnz)
+        col -= 1
+        self._fortran_check("read_overlap", "could not read overlap matrix.")
+
         # Create the Hamiltonian container
         S = Overlap(geom, nnzpr=1)
 
@@ -1474,9 +1876,16 @@ class hsxSileSiesta(SileBinSiesta):
         # not really necessary with Hermitian transposing, but for consistency
         return S.transpose(sort=kwargs.get("sort", True))
 
-    def read_overlap(self, **kwargs) -> Overlap:
-        """Returns the electronic structure from the siesta.TSHS file"""
-        return getattr(self, f"_r_overlap_v{self.version}")(**kwargs)
+    def read_overlap(self, mmap: bool = False, **kwargs) -> Overlap:
+        """Returns the overlap matrix from the siesta.HSX file
+
+        Parameters
+        ----------
+        mmap : bool, optional
+           read the sparse matrix through a memory-map of the file, directly into
+           the sparse matrix buffers (only version 1 files).
+        """
+        return getattr(self, f"_r_overlap_v{self.version}")(mmap=mmap, **kwargs)
 
 
 @set_module("sisl.io.siesta")
@@ -1502,6 +1911,10 @@ class wfsxSileSiesta(SileBinSiesta):
         used to convert k [1/Ang] -> [b]
     lattice : Lattice, optional
         a supercell contains the lattice vectors to convert k
+    index_file : bool, optional
+        whether the offset index used for random access of the eigenstates
+        (`read_eigenstate` and `read_eigenstates`) is stored next to the file
+        (``<file>.index.npz``) and re-used while the WFSX file is unchanged
     """
 
     def _setup(self, *args, **kwargs):
@@ -1544,6 +1957,11 @@ class wfsxSileSiesta(SileBinSiesta):
         self._parent = parent
         self._geometry = geometry
         self._lattice = lattice
+
+        # offset index of the eigenstates, built on first random access
+        self._index = None
+        self._index_file = kwargs.get("index_file", False)
+
         if self._parent is None and self._geometry is None and self._lattice is None:
 
             def conv(k):
@@ -1860,6 +2278,192 @@ class wfsxSileSiesta(SileBinSiesta):
         # See onlysSileSiesta.read_lattice to understand why we transpose `state`
         return EigenstateElectron(state.T, eig, parent=self._parent, **info)
 
+    def _r_index(self):
+        """Offset index of all eigenstates (k-point and spin blocks) in the file
+
+        The index is built by skipping over the Fortran records, the eigenstate
+        coefficients are not decoded.
+
+        Returns
+        -------
+        namedtuple :
+                - 'sizes': the sizes, see `read_sizes`.
+                - 'k': k-points in the file (in 1/Bohr), shape ``(nk, 3)``.
+                - 'weight': weight of the k-points, shape ``(nk,)``.
+                - 'nwf': number of wavefunctions in each block, shape ``(nk, nspin)``.
+                - 'offset': file offset of the first wavefunction in each block, shape ``(nk, nspin)``.
+                - 'layout': payload sizes of the wavefunction index, eigenvalue and coefficient records.
+        """
+        stat = self.file.stat()
+        stamp = _a.arrayl([stat.st_mtime_ns, stat.st_size])
+        if self._index is not None and np.array_equal(self._index[0], stamp):
+            return self._index[1]
+
+        Sizes = namedtuple("Sizes", ["nspin", "no_u", "nk", "Gamma"])
+        Index = namedtuple(
+            "WFSXIndex", ["sizes", "k", "weight", "nwf", "offset", "layout"]
+        )
+
+        index_file = self.file.with_name(f"{self.file.name}.index.npz")
+        if self._index_file and index_file.is_file():
+            with np.load(index_file) as f:
+                if np.array_equal(f["stamp"], stamp):
+                    sizes = f["sizes"].tolist()
+                    sizes[3] = bool(sizes[3])
+                    index = Index(Sizes(*sizes), *(f[key] for key in Index._fields[1:]))
+                    self._index = (stamp, index)
+                    return index
+
+        def read_int(fh):
+            return int(np.frombuffer(_fortran_record_read(fh)[:4], dtype=np.int32)[0])
+
+        with open(self.file, "rb") as fh:
+            nk, Gamma = np.frombuffer(_fortran_record_read(fh)[:8], dtype=np.int32)
+            nspin = read_int(fh)
+            no_u = read_int(fh)
+            # basis information
+            _fortran_record_skip(fh)
+            sizes = Sizes(nspin, no_u, int(nk), bool(Gamma))
+
+            ns = 2 if nspin == 2 else 1
+            k = np.empty([nk, 3], dtype=np.float64)
+            weight = np.empty([nk], dtype=np.float64)
+            nwf = np.empty([nk, ns], dtype=np.int32)
+            offset = np.empty([nk, ns], dtype=np.int64)
+            layout = None
+
+            for ik, ispin in product(range(nk), range(ns)):
+                info = _fortran_record_read(fh)
+                file_ik = int(np.frombuffer(info[:4], dtype=np.int32)[0])
+                k[ik] = np.frombuffer(info[4:28], dtype=np.float64)
+                weight[ik] = np.frombuffer(info[28:36], dtype=np.float64)[0]
+                file_ispin = read_int(fh)
+                if file_ispin != ispin + 1 or file_ik != ik + 1:
+                    raise SileError(
+                        f"{self!s}._r_index WFSX indices do not match the expected ones. "
+                        f"Expected: [{ispin + 1}, {ik + 1}], found [{file_ispin}, {file_ik}]"
+                    )
+                nwf[ik, ispin] = read_int(fh)
+                offset[ik, ispin] = fh.tell()
+
+                if nwf[ik, ispin] == 0:
+                    continue
+                if layout is None:
+                    # all wavefunctions have the same record layout
+                    layout = _a.arrayl([_fortran_record_skip(fh) for _ in range(3)])
+                    fh.seek(offset[ik, ispin])
+                # each record has a leading and trailing marker
+                fh.seek(int(nwf[ik, ispin]) * int(layout.sum() + 24), 1)
+
+        if layout is None:
+            layout = _a.arrayl([4, 8, 0])
+
+        index = Index(sizes, k, weight, nwf, offset, layout)
+        self._index = (stamp, index)
+        if self._index_file:
+            try:
+                np.savez(
+                    index_file,
+                    stamp=stamp,
+                    sizes=_a.arrayl(sizes),
+                    **{key: getattr(index, key) for key in Index._fields[1:]},
+                )
+            except OSError:
+                # a read-only directory should not prevent reading
+                pass
+        return index
+
+    def _r_eigenstate_index(self, ik, ispin, states=None):
+        """Read the eigenstate of a k-point and spin index, by seeking directly to it
+
+        Parameters
+        ----------
+        ik: integer
+            the (python) k index of the eigenstate.
+        ispin: integer
+            the (python) spin index of the eigenstate.
+        states: array_like, optional
+            only decode these wavefunctions in the block (indices in ``range(nwf)``)
+        """
+        index = self._r_index()
+        sizes = index.sizes
+        nwf = int(index.nwf[ik, ispin])
+        size_idx, size_eig, size_state = index.layout.tolist()
+
+        if sizes.nspin in (4, 8):
+            no = sizes.no_u * 2
+            dtype_state = {8: np.complex64, 16: np.complex128}
+        elif sizes.Gamma:
+            no = sizes.no_u
+            dtype_state = {4: np.float32, 8: np.float64}
+        else:
+            no = sizes.no_u
+            dtype_state = {8: np.complex64, 16: np.complex128}
+        try:
+            dtype_state = dtype_state[size_state // max(1, no)]
+            dtype_idx = {4: np.int32, 8: np.int64}[size_idx]
+        except KeyError:
+            raise SileError(
+                f"{self!s} could not determine the data-types of the stored eigenstates"
+            )
+
+        # one wavefunction, including the Fortran record markers
+        dtype = np.dtype(
+            [
+                ("m0", np.int32),
+                ("idx", dtype_idx),
+                ("m1", np.int32),
+                ("m2", np.int32),
+                ("eig", np.float64),
+                ("m3", np.int32),
+                ("m4", np.int32),
+                ("state", dtype_state, (no,)),
+                ("m5", np.int32),
+            ]
+        )
+
+        offset = int(index.offset[ik, ispin])
+        with open(self.file, "rb") as fh:
+            if states is None:
+                fh.seek(offset)
+                data = np.frombuffer(fh.read(nwf * dtype.itemsize), dtype=dtype)
+            else:
+                states = _a.asarrayi(states).ravel()
+                if np.any(states < 0) or np.any(states >= nwf):
+                    raise IndexError(
+                        f"{self.__class__.__name__} requested states out of range [0, {nwf})"
+                    )
+                data = np.empty(len(states), dtype=dtype)
+                for i, j in enumerate(states):
+                    fh.seek(offset + int(j) * dtype.itemsize)
+                    data[i] = np.frombuffer(fh.read(dtype.itemsize), dtype=dtype)[0]
+
+        if len(data) > 0 and not (
+            np.all(data["m0"] == size_idx)
+            and np.all(data["m2"] == size_eig)
+            and np.all(data["m4"] == size_state)
+        ):
+            raise SileError(
+                f"{self!s} could not read eigenstate values [{ispin + 1}, {ik + 1}]"
+            )
+
+        info = dict(
+            k=self._convert_k(index.k[ik]),
+            weight=index.weight[ik],
+            gauge="orbital",
+            index=data["idx"].astype(np.int32) - 1,
+        )
+        if sizes.nspin == 2:
+            info["spin"] = ispin
+
+        # `eig` is already in eV
+        return EigenstateElectron(
+            np.ascontiguousarray(data["state"]),
+            data["eig"].copy(),
+            parent=self._parent,
+            **info,
+        )
+
     def read_sizes(self):
         """Reads the sizes related to this WFSX file
 
@@ -1893,13 +2497,24 @@ class wfsxSileSiesta(SileBinSiesta):
         self._close_wfsx()
         return basis
 
-    def yield_eigenstate(self):
+    def yield_eigenstate(self, prefetch: int = 0):
         r"""Iterates over the states in the WFSX file
 
+        Parameters
+        ----------
+        prefetch :
+            number of eigenstates read ahead (and decoded) in a background thread
+            while the caller processes the current eigenstate.
+            If 0, the eigenstates are read when requested.
+
         Yields
         ------
         EigenstateElectron
         """
+        if prefetch > 0:
+            yield from self._yield_eigenstate_prefetch(prefetch)
+            return
+
         # Open file and get parsing information
         self._setup_parsing(close=False)
 
@@ -1919,6 +2534,48 @@ class wfsxSileSiesta(SileBinSiesta):
             # The loop in which the generator was used has been broken.
             self._close_wfsx()
 
+    def _yield_eigenstate_prefetch(self, prefetch: int):
+        """Iterate the eigenstates while a background thread reads ahead into a bounded queue"""
+        queue = Queue(maxsize=prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            # regularly check whether the consumer has stopped
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def reader():
+            try:
+                index = self._r_index()
+                for ik, ispin in product(
+                    range(index.sizes.nk), range(index.nwf.shape[1])
+                ):
+                    if not put(self._r_eigenstate_index(ik, ispin)):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
+
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
     @deprecate_argument(
         "ktol",
         "atol",
@@ -1927,12 +2584,12 @@ class wfsxSileSiesta(SileBinSiesta):
         "0.16",
     )
     def read_eigenstate(
-        self, k=(0, 0, 0), spin: int = 0, atol: float = 1e-4
+        self, k=(0, 0, 0), spin: int = 0, atol: float = 1e-4, states=None
     ) -> EigenstateElectron:
         """Reads a specific eigenstate from the file.
 
-        This method iterates over the states until it finds a match. Do not call
-        this method repeatedly. If you want to loop eigenstates, use `yield_eigenstate`.
+        The first call builds an index of the eigenstates positions in the file,
+        subsequent calls seek directly to the requested eigenstate.
 
         Parameters
         ----------
@@ -1944,10 +2601,14 @@ class wfsxSileSiesta(SileBinSiesta):
         atol:
             The threshold value for considering two k-points the same (i.e. to match
             the query k point with the states k point).
+        states: array-like, optional
+            only read these states at the k-point (indices of the stored states
+            at the k-point). By default all states are read.
 
         See Also
         --------
         yield_eigenstate
+        read_eigenstates : read many eigenstates
 
         Returns
         -------
@@ -1959,15 +2620,54 @@ class wfsxSileSiesta(SileBinSiesta):
         LookupError :
             in case the requested k-point can not be found in the file.
         """
-        # Iterate over all eigenstates in the file
-        for state in self.yield_eigenstate():
-            info = state.info
-            if info.get("spin", 0) == spin and np.allclose(info["k"], k, atol=atol):
-                # This is the state that the user requested
-                return state
-        raise LookupError(
-            f"{self.__class__.__name__}.read_eigenstate could not find k-point: {k!s} eigenstate"
-        )
+        return self.read_eigenstates([k], spin, atol, states)[0]
+
+    def read_eigenstates(
+        self, ks, spin: int = 0, atol: float = 1e-4, states=None
+    ) -> List[EigenstateElectron]:
+        """Reads the eigenstates at several k-points from the file.
+
+        Parameters
+        ----------
+        ks: array-like of shape (nk, 3)
+            The k points of the states you want to find.
+        spin:
+            The spin index of the states you want to find. Only meaningful for polarized
+            calculations.
+        atol:
+            The threshold value for considering two k-points the same (i.e. to match
+            the query k point with the states k point).
+        states: array-like, optional
+            only read these states at each k-point (indices of the stored states
+            at the k-point). By default all states are read.
+
+        See Also
+        --------
+        read_eigenstate : read a single eigenstate
+
+        Returns
+        -------
+        list of EigenstateElectron:
+            the states in the same order as `ks`.
+
+        Raises
+        ------
+        LookupError :
+            in case any of the requested k-points can not be found in the file.
+        """
+        index = self._r_index()
+        kfile = self._convert_k(index.k)
+        ks = _a.asarrayd(ks).reshape(-1, 3)
+
+        out = []
+        for k in ks:
+            ik = np.isclose(kfile, k.reshape(1, 3), atol=atol).all(1).nonzero()[0]
+            if len(ik) == 0 or not 0 <= spin < index.nwf.shape[1]:
+                raise LookupError(
+                    f"{self.__class__.__name__}.read_eigenstates could not find k-point: {k!s} eigenstate"
+                )
+            out.append(self._r_eigenstate_index(ik[0], spin, states))
+        return out
 
     def read_info(self):
         """Reads the information for all the k points contained in the file
@@ -9,6 +9,7 @@ import logging
 import warnings
 from datetime import datetime
 from os.path import isfile
+from pathlib import Path
 from typing import Any, Optional
 
 import numpy as np
@@ -77,6 +78,11 @@ Bohr2Ang = unit_convert("Bohr", "Ang")
 _log = logging.getLogger(__name__)
 
 
+def _tolabel(label: str) -> str:
+    """Normalized fdf-label (case-insensitive, and disregarding ``_``, ``-`` and ``.``)"""
+    return label.lower().replace("_", "").replace("-", "").replace(".", "")
+
+
 def _order_remove_netcdf(order):
     """Removes the order elements that refer to siles based on NetCDF"""
     try:
@@ -151,6 +157,10 @@ class fdfSileSiesta(SileSiesta):
         # Public key for printing information about where stuff comes from
         self.track = kwargs.get("track", False)
 
+        # Index of labels, built on the first look-up
+        self._labels = None
+        self._labels_mtime = {}
+
     def _pushfile(self, f):
         if self.dir_file(f).is_file():
             self._parent_fh.append(self.fh)
@@ -215,23 +225,116 @@ class fdfSileSiesta(SileSiesta):
 
         return includes
 
-    @sile_fh_open()
+    def _r_label_index(self):
+        """Build an index of all labels in the fdf file (and included files) in a single pass
+
+        Each (normalized) label contains a list of entries ``(kind, file, value)``:
+
+        - ``"="``: a regular label, `value` is the line content
+        - ``"B"``: a block, `value` is the list of lines in the block
+        - ``"B<"``: a block piped from a file, `value` is the file to read
+        - ``"<"``: a label piped from another fdf file, `value` is the `fdfSileSiesta`
+
+        Only piped labels may not be present in the other file, hence the
+        entries are kept until the first entry with a definite value.
+        """
+        index = {}
+        mtimes = {}
+
+        def add(label, entry):
+            entries = index.setdefault(label, [])
+            if len(entries) == 0 or entries[-1][0] == "<":
+                entries.append(entry)
+
+        def current_file():
+            f = Path(getattr(self.fh, "name", self.file))
+            if f not in mtimes:
+                mtimes[f] = f.stat().st_mtime_ns
+            return f
+
+        # Ensure we start from the top file
+        while self._popfile():
+            pass
+
+        with self:
+            f = current_file()
+
+            while True:
+                l = self.readline()
+                if l == "":
+                    # end of (included) file
+                    if not self._popfile():
+                        break
+                    f = current_file()
+                    continue
+
+                ls = l.split("#")[0].split()
+                if len(ls) == 0:
+                    continue
+                lsl = list(map(_tolabel, ls))
+
+                # Check if there is a pipe in the line
+                if "<" in lsl:
+                    idx = lsl.index("<")
+                    if lsl[0] == "%block":
+                        # 1. the full block is piped into the label
+                        #    %block Label < file
+                        add(lsl[1], ("B<", f, self.dir_file(ls[idx + 1])))
+                    else:
+                        # 2. labels that should be read from a subsequent file
+                        #    Label1 Label2 < other.fdf
+                        fdf = fdfSileSiesta(
+                            self.dir_file(ls[idx + 1]), base=self._directory
+                        )
+                        for label in lsl[:idx]:
+                            add(label, ("<", f, fdf))
+
+                elif lsl[0] == "%block" and len(lsl) > 1:
+                    # Read in the block content
+                    lines = []
+                    l = self.readline()
+                    while l != "" and not _tolabel(l.strip()).startswith("%endblock"):
+                        l = l.strip()
+                        if len(l) > 0:
+                            lines.append(l)
+                        l = self.readline()
+                    add(lsl[1], ("B", f, lines))
+
+                elif lsl[0] == "%include":
+                    # We have to open a new file
+                    self._pushfile(ls[1])
+                    f = current_file()
+
+                else:
+                    add(lsl[0], ("=", f, " ".join(ls[1:]).strip()))
+
+        self._labels = index
+        self._labels_mtime = mtimes
+
+    def _r_label_index_valid(self) -> bool:
+        """Whether the label index is up to date with the files it was built from"""
+        if self._labels is None:
+            return False
+        try:
+            return all(
+                f.stat().st_mtime_ns == mtime for f, mtime in self._labels_mtime.items()
+            )
+        except OSError:
+            return False
+
     def _r_label(self, label: str):
         """Try and read the first occurence of a key
 
-        This will take care of blocks, labels and piped in labels
+        This will take care of blocks, labels and piped in labels.
+        The labels are looked up in an index built on the first call.
 
         Parameters
         ----------
         label : str
            label to find in the fdf file
         """
-        self._seek()
-
-        def tolabel(label):
-            return label.lower().replace("_", "").replace("-", "").replace(".", "")
-
-        labell = tolabel(label)
+        if not self._r_label_index_valid():
+            self._r_label_index()
 
         def valid_line(line):
             ls = line.strip()
@@ -239,78 +342,22 @@ class fdfSileSiesta(SileSiesta):
                 return False
             return not (ls[0] in self._comment)
 
-        def process_line(line):
-            # Split line by spaces
-            ls = line.split()
-            if len(ls) == 0:
-                return None
-
-            # Make a lower equivalent of ls
-            lsl = list(map(tolabel, ls))
-
-            # Check if there is a pipe in the line
-            if "<" in lsl:
-                idx = lsl.index("<")
-                # Now there are two cases
-
-                # 1. It is a block, in which case
-                #    the full block is piped into the label
-                #    %block Label < file
-                if lsl[0] == "%block" and lsl[1] == labell:
-                    # Correct line found
-                    # Read the file content, removing any empty and/or comment lines
-                    lines = self.dir_file(ls[3]).open("r").readlines()
-                    return [l.strip() for l in lines if valid_line(l)]
-
-                # 2. There are labels that should be read from a subsequent file
-                #    Label1 Label2 < other.fdf
-                if labell in lsl[:idx]:
-                    # Valid line, read key from other.fdf
-                    return fdfSileSiesta(
-                        self.dir_file(ls[idx + 1]), base=self._directory
-                    )._r_label(label)
-
-                # It is not in this line, either key is
-                # on the RHS of <, or the key could be "block". Say.
-                return None
-
-            # The last case is if the label is the first word on the line
-            # In that case we have found what we are looking for
-            if lsl[0] == labell:
-                return (" ".join(ls[1:])).strip()
-
-            elif lsl[0] == "%block":
-                if lsl[1] == labell:
-                    # Read in the block content
-                    lines = []
-
-                    # Now read lines
-                    l = self.readline().strip()
-                    while not tolabel(l).startswith("%endblock"):
-                        if len(l) > 0:
-                            lines.append(l)
-                        l = self.readline().strip()
-                    return lines
-
-            elif lsl[0] == "%include":
-                # We have to open a new file
-                self._pushfile(ls[1])
-
-            return None
-
-        # Perform actual reading of line
-        l = self.readline().split("#")[0]
-        if len(l) == 0:
-            return None
-        l = process_line(l)
-        while l is None:
-            l = self.readline().split("#")[0]
-            if len(l) == 0:
-                if not self._popfile():
-                    return None
-            l = process_line(l)
+        for kind, _, value in self._labels.get(_tolabel(label), []):
+            if kind == "<":
+                # Read key from other.fdf (it may not be there)
+                value = value._r_label(label)
+                if value is None:
+                    continue
+            elif kind == "B<":
+                # Read the file content, removing any empty and/or comment lines
+                with value.open("r") as fh:
+                    value = [l.strip() for l in fh if valid_line(l)]
+            elif kind == "B":
+                # the caller may change the block
+                value = value[:]
+            return value
 
-        return l
+        return None
 
     @classmethod
     def _type(cls, value: Any):
@@ -360,7 +407,6 @@ class fdfSileSiesta(SileSiesta):
 
         return "n"
 
-    @sile_fh_open()
     def type(self, label: str):
         """Return the type of the fdf-keyword
 
@@ -369,10 +415,8 @@ class fdfSileSiesta(SileSiesta):
         label : str
             the label to look-up
         """
-        self._seek()
         return self._type(self._r_label(label))
 
-    @sile_fh_open()
     def get(
         self,
         label: str,
@@ -531,6 +575,7 @@ class fdfSileSiesta(SileSiesta):
 
         # ensure the file is-reopened
         self._open()
+        self._labels = None
 
     @staticmethod
     def print(key: str, value: Any):
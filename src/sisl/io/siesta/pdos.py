@@ -3,13 +3,15 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+from typing import Optional, Sequence, Union
+
 import numpy as np
 
 from sisl._array import arrayd, arrayi, asarrayi
 from sisl._core.atom import Atom, Atoms, PeriodicTable
 from sisl._core.geometry import Geometry
 from sisl._core.orbital import AtomicOrbital
-from sisl._help import xml_parse
+from sisl._help import xml_iterparse, xml_parse
 from sisl._internal import set_module
 from sisl.messages import SislWarning, warn
 from sisl.unit.siesta import unit_convert
@@ -55,12 +57,22 @@ class pdosSileSiesta(SileSiesta):
         return Ef
 
     @sile_fh_open(True)
-    def read_data(self, as_dataarray: bool = False):
+    def read_data(
+        self,
+        as_dataarray: bool = False,
+        atoms: Optional[Union[int, Sequence[int]]] = None,
+        orbitals: Optional[Union[int, Sequence[int]]] = None,
+    ):
         r"""Returns data associated with the PDOS file
 
         For spin-polarized calculations the returned values are up/down, orbitals, energy.
         For non-collinear calculations the returned values are sum/x/y/z, orbitals, energy.
 
+        The file is parsed incrementally, and the PDOS is stored directly
+        in the returned array. Only the data of the requested orbitals
+        (`atoms` and/or `orbitals`) are converted, i.e. memory and time
+        can be saved by only reading the PDOS of a subset of the orbitals.
+
         Parameters
         ----------
         as_dataarray: bool, optional
@@ -68,38 +80,45 @@ class pdosSileSiesta(SileSiesta):
            and orbital information as coordinates in the data.
            The geometry, unit and Fermi level are stored as attributes in the
            DataArray.
+        atoms :
+           only read the PDOS of the orbitals on these atoms (0-based indices).
+        orbitals :
+           only read the PDOS of these orbitals (0-based indices).
+           If both `atoms` and `orbitals` are specified, the union is read.
 
         Returns
         -------
         geom : Geometry
-            instance with positions, atoms and orbitals.
+            instance with positions, atoms and orbitals (always the full geometry).
         E : numpy.ndarray
             the energies at which the PDOS has been evaluated at (if Fermi-level present in file energies are shifted to :math:`E - E_F = 0`).
         PDOS : numpy.ndarray
             an array of DOS with dimensions ``(nspin, geom.no, len(E))`` (with different spin-components) or ``(geom.no, len(E))`` (spin-symmetric).
+            If `atoms` or `orbitals` are specified, the second dimension only contains
+            the requested orbitals (in the order they appear in the file).
         all : xarray.DataArray
             if `as_dataarray` is True, only this data array is returned, in this case all data can be post-processed using the `xarray` selection routines.
         """
-        # Get the element-tree
-        root = xml_parse(self.fh).getroot()
-
-        # Get number of orbitals
-        nspin = int(root.find("nspin").text)
-        # Try and find the fermi-level
-        Ef = root.find("fermi_energy")
-        E = arrayd(root.find("energy_values").text.split())
-        if Ef is None:
-            warn(
-                f"{self!s}.read_data could not locate the Fermi-level in the XML tree, using E_F = 0. eV"
-            )
-        else:
-            Ef = float(Ef.text)
-            E -= Ef
-        ne = len(E)
+        # Orbitals that should be read (None for all)
+        select = atoms is not None or orbitals is not None
+        if atoms is not None:
+            atoms = set(asarrayi(atoms).ravel().tolist())
+        if orbitals is not None:
+            orbitals = set(asarrayi(orbitals).ravel().tolist())
+
+        def selected(ia, io):
+            if atoms is not None and ia in atoms:
+                return True
+            return orbitals is not None and io in orbitals
+
+        nspin = None
+        no = None
+        Ef = None
+        E = None
 
         # All coordinate, atoms and species data
         xyz = []
-        atoms = []
+        atoms_orbs = []
         atom_species = []
 
         def ensure_size(ia):
@@ -108,34 +127,119 @@ class pdosSileSiesta(SileSiesta):
                 xyz.append(None)
 
         def ensure_size_orb(ia, i):
-            while len(atoms) <= ia:
-                atoms.append([])
-            while len(atoms[ia]) <= i:
-                atoms[ia].append(None)
-
-        if nspin == 4:
-
-            def process(D):
-                tmp = np.empty(D.shape[0], D.dtype)
-                tmp[:] = D[:, 3]
-                D[:, 3] = D[:, 0] - D[:, 1]
-                D[:, 0] = D[:, 0] + D[:, 1]
-                D[:, 1] = D[:, 2]
-                D[:, 2] = tmp[:]
-                return D
-
-        elif nspin == 2:
-
-            def process(D):
-                tmp = D[:, 0] + D[:, 1]
-                D[:, 1] = D[:, 0] - D[:, 1]
-                D[:, 0] = tmp
-                return D
+            while len(atoms_orbs) <= ia:
+                atoms_orbs.append([])
+            while len(atoms_orbs[ia]) <= i:
+                atoms_orbs[ia].append(None)
+
+        # the PDOS data, either a preallocated array or a list of orbital PDOS
+        D = None
+        O_read = []
+
+        for _, elem in xml_iterparse(self.fh, events=("end",)):
+            tag = elem.tag
+            if tag == "nspin":
+                nspin = int(elem.text)
+            elif tag == "norbitals":
+                no = int(elem.text)
+            elif tag == "fermi_energy":
+                Ef = float(elem.text)
+            elif tag == "energy_values":
+                E = arrayd(elem.text.split())
+            elif tag == "orbital":
+                orb = elem
+
+                # Short-hand function to retrieve integers for the attributes
+                def oi(name):
+                    return int(orb.get(name))
+
+                # Get indices
+                ia = oi("atom_index") - 1
+                i = oi("index") - 1
+
+                species = orb.get("species")
+
+                # Create the atomic orbital
+                try:
+                    Z = oi("Z")
+                except Exception:
+                    try:
+                        Z = PeriodicTable().Z(species)
+                    except Exception:
+                        # Unknown
+                        Z = -1
+
+                try:
+                    P = orb.get("P") == "true"
+                except Exception:
+                    P = False
+
+                ensure_size(ia)
+                xyz[ia] = arrayd(orb.get("position").split())
+                atom_species[ia] = Z
+
+                # Construct the atomic orbital
+                O = AtomicOrbital(n=oi("n"), l=oi("l"), m=oi("m"), zeta=oi("z"), P=P)
+
+                # We know that the index is far too high. However,
+                # this ensures a consecutive orbital
+                ensure_size_orb(ia, i)
+                atoms_orbs[ia][i] = O
+
+                if not select or selected(ia, i):
+                    if D is None:
+                        ne = len(E)
+                        if select or no is None:
+                            D = []
+                        else:
+                            D = np.empty([nspin, no, ne], dtype=np.float64)
+
+                    # it is formed like : spin-1, spin-2 (however already in eV)
+                    DOS = np.fromstring(
+                        orb.find("data").text, dtype=np.float64, sep=" "
+                    ).reshape(ne, nspin)
+                    if isinstance(D, list):
+                        D.append(DOS.T)
+                    else:
+                        D[:, len(O_read)] = DOS.T
+                    O_read.append(O)
+
+                # release the memory of the parsed orbital
+                elem.clear()
 
+        if Ef is None:
+            warn(
+                f"{self!s}.read_data could not locate the Fermi-level in the XML tree, using E_F = 0. eV"
+            )
         else:
+            E -= Ef
+        ne = len(E)
 
-            def process(D):
-                return D
+        if D is None:
+            D = np.empty([nspin, 0, ne], dtype=np.float64)
+        elif isinstance(D, list):
+            D = np.stack(D, axis=1)
+        else:
+            D = D[:, : len(O_read)]
+
+        # Convert the spin components (up/down) to sum/z
+        if nspin in (2, 4):
+            tmp = D[0] - D[1]
+            D[0] += D[1]
+            if nspin == 4:
+                # sum, x, y, z
+                D[1] = D[2]
+                D[2] = D[3]
+                D[3] = tmp
+            else:
+                D[1] = tmp
+            del tmp
+
+        # Now we need to parse the data
+        # First reduce the atom
+        atoms_orbs = [[o for o in a if o] for a in atoms_orbs]
+        geom_atoms = Atoms(map(Atom, atom_species, atoms_orbs))
+        geom = Geometry(arrayd(xyz) * Bohr2Ang, geom_atoms)
 
         if as_dataarray:
             import xarray as xr
@@ -157,71 +261,14 @@ class pdosSileSiesta(SileSiesta):
                 coords = [E, spin, [o.n], [o.l], [o.m], [o.zeta], [o.P]]
 
                 return xr.DataArray(
-                    data=process(DOS).reshape(shape),
+                    data=DOS.T.reshape(shape),
                     dims=dims,
                     coords=coords,
                     name="PDOS",
                 )
 
-        else:
-
-            def to(o, DOS):
-                return process(DOS)
-
-        D = []
-
-        for orb in root.findall("orbital"):
-            # Short-hand function to retrieve integers for the attributes
-            def oi(name):
-                return int(orb.get(name))
-
-            # Get indices
-            ia = oi("atom_index") - 1
-            i = oi("index") - 1
-
-            species = orb.get("species")
-
-            # Create the atomic orbital
-            try:
-                Z = oi("Z")
-            except Exception:
-                try:
-                    Z = PeriodicTable().Z(species)
-                except Exception:
-                    # Unknown
-                    Z = -1
-
-            try:
-                P = orb.get("P") == "true"
-            except Exception:
-                P = False
-
-            ensure_size(ia)
-            xyz[ia] = arrayd(orb.get("position").split())
-            atom_species[ia] = Z
-
-            # Construct the atomic orbital
-            O = AtomicOrbital(n=oi("n"), l=oi("l"), m=oi("m"), zeta=oi("z"), P=P)
-
-            # We know that the index is far too high. However,
-            # this ensures a consecutive orbital
-            ensure_size_orb(ia, i)
-            atoms[ia][i] = O
-
-            # it is formed like : spin-1, spin-2 (however already in eV)
-            DOS = arrayd(orb.find("data").text.split()).reshape(-1, nspin)
-
-            D.append(to(O, DOS))
-
-        # Now we need to parse the data
-        # First reduce the atom
-        atoms = [[o for o in a if o] for a in atoms]
-        atoms = Atoms(map(Atom, atom_species, atoms))
-        geom = Geometry(arrayd(xyz) * Bohr2Ang, atoms)
-
-        if as_dataarray:
             # Create a new dimension without coordinates (orbital index)
-            D = xr.concat(D, "orbital")
+            D = xr.concat([to(O, D[:, io]) for io, O in enumerate(O_read)], "orbital")
             # Add attributes
             D.attrs["geometry"] = geom
             D.attrs["unit"] = "1/eV"
@@ -232,7 +279,6 @@ class pdosSileSiesta(SileSiesta):
 
             return D
 
-        D = np.moveaxis(np.stack(D, axis=0), 2, 0)
         return geom, E, D
 
     @default_ArgumentParser(
@@ -3,6 +3,7 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+import os
 import os.path as osp
 from pathlib import Path
 
@@ -207,6 +208,26 @@ def test_get_set(sisl_tmp):
     fdf.set("Flag1", "date-date", keep=False)
 
 
+def test_get_index_update(sisl_tmp):
+    f = sisl_tmp("file.fdf")
+    with open(f, "w") as fh:
+        fh.write("Flag1 date\n%block MyBlock\n  Flag2 block\n%endblock MyBlock\n")
+
+    fdf = fdfSileSiesta(f)
+    assert fdf.get("Flag1") == "date"
+    # block content are not labels
+    assert fdf.get("Flag2") is None
+    block = fdf.get("MyBlock")
+    block.append("changed")
+    assert fdf.get("MyBlock") == ["Flag2 block"]
+
+    # external changes are also tracked
+    with open(f, "a") as fh:
+        fh.write("Flag2 external\n")
+    os.utime(f, ns=(0, 0))
+    assert fdf.get("Flag2") == "external"
+
+
 def test_get_block(sisl_tmp):
     f = sisl_tmp("file.fdf")
     with open(f, "w") as fh:
@@ -137,3 +137,16 @@ def test_si_pdos_kgrid_hsx_1_same_tshs(sisl_files, sisl_tmp):
     assert np.allclose(gx.lattice.cell, gt.lattice.cell)
     assert np.allclose(gx.xyz, gt.xyz)
     assert np.allclose(gx.nsc, gt.nsc)
+
+
+def test_si_pdos_kgrid_hsx_mmap(sisl_files):
+    HSX = sisl.get_sile(sisl_files("siesta", "Si_pdos_k", "Si_pdos.HSX"))
+    HS1 = HSX.read_hamiltonian()
+    HS2 = HSX.read_hamiltonian(mmap=True)
+    assert HS1._csr.spsame(HS2._csr)
+    assert np.allclose(HS1._csr._D, HS2._csr._D)
+
+    S1 = HSX.read_overlap()
+    S2 = HSX.read_overlap(mmap=True)
+    assert S1._csr.spsame(S2._csr)
+    assert np.allclose(S1._csr._D, S2._csr._D)
@@ -53,3 +53,46 @@ def test_si_pdos_kgrid_xarray(sisl_files):
     assert X.spin[0] == "sum"
     size = np.prod(X.shape[2:])
     assert size >= X.geometry.no
+
+
+def _write_pdos(f, nspin, DOS):
+    """Write a minimal PDOS.xml file with 2 C atoms (s, p orbitals)"""
+    no, ne = DOS.shape[:2]
+    with open(f, "w") as fh:
+        fh.write(f"<pdos>\n<nspin>{nspin}</nspin>\n<norbitals>{no}</norbitals>\n")
+        fh.write('<fermi_energy units="eV"> -1.0 </fermi_energy>\n')
+        E = " ".join(map(str, np.linspace(-2, 2, ne)))
+        fh.write(f'<energy_values units="eV">\n{E}\n</energy_values>\n')
+        for io in range(no):
+            ia, l = divmod(io, 4)
+            l = min(l, 1)
+            fh.write(
+                f'<orbital index="{io + 1}" atom_index="{ia + 1}" species="C" '
+                f'position="{ia} 0 0" n="2" l="{l}" m="0" z="1" P="false" Z="6">\n'
+            )
+            data = "\n".join(" ".join(map(str, row)) for row in DOS[io])
+            fh.write(f"<data>\n{data}\n</data>\n</orbital>\n")
+        fh.write("</pdos>\n")
+
+
+@pytest.mark.parametrize("nspin", [1, 2, 4])
+def test_pdos_read_data_select(sisl_tmp, nspin):
+    f = sisl_tmp("test.PDOS.xml")
+    DOS = np.random.rand(8, 20, nspin)
+    _write_pdos(f, nspin, DOS)
+
+    geom, E, pdos = sisl.get_sile(f).read_data()
+    assert geom.na == 2 and geom.no == 8
+    assert np.allclose(E, np.linspace(-2, 2, 20) + 1)
+    assert pdos.shape == (nspin, 8, 20)
+
+    ref = np.moveaxis(DOS, 2, 0)
+    if nspin == 2:
+        ref = np.stack([ref[0] + ref[1], ref[0] - ref[1]])
+    elif nspin == 4:
+        ref = np.stack([ref[0] + ref[1], ref[2], ref[3], ref[0] - ref[1]])
+    assert np.allclose(pdos, ref)
+
+    geom_sel, _, pdos_sel = sisl.get_sile(f).read_data(atoms=1, orbitals=[0, 5])
+    assert geom_sel == geom
+    assert np.allclose(pdos_sel, pdos[:, [0, 4, 5, 6, 7]])
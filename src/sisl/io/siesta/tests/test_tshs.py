@@ -219,3 +219,54 @@ def test_tshs_missing_diagonal(sisl_tmp):
     H1[0, 0] = 0.0
     H1.finalize()
     assert H1._csr.spsame(H2._csr)
+
+
+@pytest.mark.filterwarnings("ignore", message="*is NOT Hermitian for on-site")
+@pytest.mark.parametrize("spin", ["unpolarized", "polarized", "non-colinear", "SO"])
+@pytest.mark.parametrize("orthogonal", [True, False])
+def test_tshs_mmap(sisl_tmp, spin, orthogonal):
+    H1 = sisl.Hamiltonian(
+        sisl.geom.graphene(), spin=sisl.Spin(spin), orthogonal=orthogonal
+    )
+    n = H1.spin.size
+    on = np.arange(1, n + 1) / 10
+    off = np.full(n, -0.2)
+    if not orthogonal:
+        on = np.append(on, 1.0)
+        off = np.append(off, 0.1)
+    H1.construct(([0.1, 1.44], [on, off]))
+
+    f = sisl_tmp("tmp.TSHS")
+    H1.write(f)
+    tshs = sisl.get_sile(f)
+
+    H2 = tshs.read_hamiltonian()
+    H3 = tshs.read_hamiltonian(mmap=True)
+    assert H2.spin == H3.spin
+    assert H2.orthogonal == H3.orthogonal
+    assert H2._csr.spsame(H3._csr)
+    assert np.allclose(H2._csr._D, H3._csr._D)
+
+    # only a single spin-component
+    sel = min(n, 2) - 1
+    H2 = tshs.read_hamiltonian(spin=sel)
+    H3 = tshs.read_hamiltonian(spin=sel, mmap=True)
+    assert H3.spin.is_unpolarized
+    assert H2._csr.spsame(H3._csr)
+    assert np.allclose(H2._csr._D, H3._csr._D)
+    assert np.allclose(H3.tocsr(0).toarray(), H1.tocsr(sel).toarray())
+
+    if not orthogonal:
+        S2 = tshs.read_overlap()
+        S3 = tshs.read_overlap(mmap=True)
+        assert S2._csr.spsame(S3._csr)
+        assert np.allclose(S2._csr._D, S3._csr._D)
+
+
+def test_tshs_spin_select_error(sisl_tmp):
+    H = sisl.Hamiltonian(sisl.geom.graphene(), spin=sisl.Spin("polarized"))
+    H.construct(([0.1, 1.44], [[0.0, 0.0], [-2.7, -2.7]]))
+    f = sisl_tmp("tmp.TSHS")
+    H.write(f)
+    with pytest.raises(ValueError):
+        sisl.get_sile(f).read_hamiltonian(spin=2)
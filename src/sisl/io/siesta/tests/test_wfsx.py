@@ -36,3 +36,108 @@ def test_wfsx_read(sisl_files):
 
     bz = wfsx.read_brillouinzone()
     assert len(bz) == 16
+
+
+def _write_wfsx(path, blocks, no_u, nspin=1, Gamma=False):
+    """Write a WFSX file with the Fortran record structure used by Siesta"""
+
+    def record(fh, *arrays):
+        data = b"".join(np.asarray(a).tobytes() for a in arrays)
+        marker = np.int32(len(data)).tobytes()
+        fh.write(marker + data + marker)
+
+    ns = 2 if nspin == 2 else 1
+    with open(path, "wb") as fh:
+        record(fh, np.int32(len(blocks) // ns), np.int32(Gamma))
+        record(fh, np.int32(nspin))
+        record(fh, np.int32(no_u))
+        label = np.frombuffer(b"C".ljust(20), "S1")
+        symmetry = np.frombuffer(b"pz".ljust(20), "S1")
+        basis = []
+        for io in range(no_u):
+            basis.extend([np.int32(1), label, np.int32(io + 1), np.int32(2), symmetry])
+        record(fh, *basis)
+        for i, (k, weight, eig, state) in enumerate(blocks):
+            ik, ispin = divmod(i, ns)
+            record(fh, np.int32(ik + 1), np.asarray(k, np.float64), np.float64(weight))
+            record(fh, np.int32(ispin + 1))
+            record(fh, np.int32(len(eig)))
+            for iwf in range(len(eig)):
+                record(fh, np.int32(iwf + 1))
+                record(fh, np.float64(eig[iwf]))
+                record(fh, state[iwf])
+
+
+@pytest.mark.parametrize("nspin", [1, 2, 4])
+def test_wfsx_read_eigenstates(sisl_tmp, nspin):
+    rng = np.random.default_rng(1234)
+    no_u = 4
+    no = no_u * 2 if nspin == 4 else no_u
+    blocks = []
+    for ik in range(5):
+        k = rng.random(3)
+        for _ in range(2 if nspin == 2 else 1):
+            nwf = 3 + ik
+            state = rng.random((nwf, no)) + 1j * rng.random((nwf, no))
+            blocks.append((k, 0.2, rng.random(nwf), state.astype(np.complex64)))
+
+    f = sisl_tmp("index.WFSX")
+    _write_wfsx(f, blocks, no_u, nspin)
+    geom = sisl.geom.graphene()
+
+    wfsx = sisl.get_sile(f, parent=geom, index_file=True)
+    states = list(wfsx.yield_eigenstate())
+    ks = [state.info["k"] for state in states]
+    spin = [state.info.get("spin", 0) for state in states]
+
+    # a new sile re-uses the stored index
+    for wfsx in (wfsx, sisl.get_sile(f, parent=geom, index_file=True)):
+        for i in (3, 0, len(states) - 1):
+            state = wfsx.read_eigenstate(ks[i], spin=spin[i])
+            assert np.allclose(state.info["k"], ks[i])
+            assert np.array_equal(state.info["index"], states[i].info["index"])
+            assert np.allclose(state.eig, states[i].eig)
+            assert np.allclose(state.state, states[i].state)
+
+            state = wfsx.read_eigenstate(ks[i], spin=spin[i], states=[2, 0])
+            assert np.allclose(state.state, states[i].state[[2, 0]])
+
+        read = wfsx.read_eigenstates(ks[::-1], spin=spin[-1])
+        assert len(read) == len(ks)
+        assert np.allclose(read[0].state, states[-1].state)
+
+    assert osp.isfile(f"{f}.index.npz")
+
+    with pytest.raises(LookupError):
+        wfsx.read_eigenstate([0.5, 0.5, 0.5])
+
+
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_wfsx_yield_prefetch(sisl_tmp, prefetch):
+    rng = np.random.default_rng(1234)
+    no_u = 4
+    blocks = []
+    for ik in range(6):
+        k = rng.random(3)
+        for _ in range(2):
+            state = rng.random((no_u, no_u)) + 1j * rng.random((no_u, no_u))
+            blocks.append((k, 1 / 6, rng.random(no_u), state.astype(np.complex64)))
+
+    f = sisl_tmp("prefetch.WFSX")
+    _write_wfsx(f, blocks, no_u, 2)
+    wfsx = sisl.get_sile(f, parent=sisl.geom.graphene())
+
+    states = list(wfsx.yield_eigenstate())
+    prefetched = list(wfsx.yield_eigenstate(prefetch=prefetch))
+    assert len(states) == len(prefetched)
+    for state, pstate in zip(states, prefetched):
+        assert state.info["spin"] == pstate.info["spin"]
+        assert np.allclose(state.info["k"], pstate.info["k"])
+        assert np.allclose(state.eig, pstate.eig)
+        assert np.allclose(state.state, pstate.state)
+
+    # breaking the loop stops the reading thread
+    for i, state in enumerate(wfsx.yield_eigenstate(prefetch=prefetch)):
+        if i == 2:
+            break
+    assert np.allclose(state.state, states[2].state)
@@ -24,7 +24,7 @@ from scipy.sparse import SparseEfficiencyWarning, csr_matrix, issparse
 import sisl._array as _a
 from sisl import Atoms, Geometry, constant
 from sisl._core.sparse import _ncol_to_indptr
-from sisl._help import wrap_filterwarnings
+from sisl._help import LRUCache, wrap_filterwarnings
 from sisl._internal import set_module
 from sisl.messages import SislError, deprecate, deprecate_argument, info, warn
 from sisl.physics.densitymatrix import DensityMatrix
@@ -128,6 +128,12 @@ class tbtncSileTBtrans(_devncSileTBtrans):
     -----
     The API for this class are largely equivalent to the arguments of the `sdata` command-line
     tool, with the execption that the command-line tool uses Fortran indexing numbers (1-based).
+
+    Energy resolved quantities are read lazily, i.e. only the requested energy (and k-point)
+    slices are read from the file. The latest read slices are kept in a cache such that
+    repeated queries at the same energies does not require reading the file again.
+    The number of cached slices can be controlled with the ``cache_size`` argument
+    (defaults to 16), ``cache_size=0`` disables the cache.
     """
 
     _trans_type = "TBT"
@@ -135,6 +141,18 @@ class tbtncSileTBtrans(_devncSileTBtrans):
 
     _k_avg = False
 
+    def _setup(self, *args, **kwargs):
+        super()._setup(*args, **kwargs)
+        # cache of energy slices, see _value_E
+        self._E_cache = LRUCache(kwargs.get("cache_size", 16))
+        # cache of sparse patterns, see _sparse_pattern and sparse_orbital_to_atom
+        self._pattern_cache = LRUCache(8)
+
+    def close(self):
+        self._E_cache.clear()
+        self._pattern_cache.clear()
+        super().close()
+
     def write_tbtav(self, *args, **kwargs):
         """Convert this to a TBT.AV.nc file, i.e. all k dependent quantites are averaged out.
 
@@ -232,33 +250,46 @@ class tbtncSileTBtrans(_devncSileTBtrans):
         # Ensure that it is an index
         iE = self.Eindex(E)
 
+        # Check whether this slice has already been read
+        if isinstance(kavg, bool):
+            key_kavg = ("avg", kavg)
+        elif isinstance(kavg, Integral):
+            key_kavg = ("k", int(kavg))
+        else:
+            raise ValueError(
+                f"{self.__class__.__name__} requires kavg argument to be either bool or an integer corresponding to the k-point index."
+            )
+        key_tree = tuple(tree) if isinstance(tree, list) else tree
+        key = (name, key_tree, key_kavg, int(iE))
+        data = self._E_cache.get(key)
+        if data is not None:
+            return data.copy()
+
         v = self._variable(name, tree=tree)
 
         if self._k_avg:
-            return v[iE, ...]
+            data = v[iE, ...]
 
-        wkpt = self.wk
-
-        # Perform normalization
-        if isinstance(kavg, bool):
+        elif isinstance(kavg, bool):
+            # Perform normalization
             if kavg:
+                wkpt = self.wk
                 nk = len(wkpt)
+                # only read a single k-point at a time
                 data = np.array(v[0, iE, ...]) * wkpt[0]
                 for i in range(1, nk):
                     data += v[i, iE, ...] * wkpt[i]
             else:
                 data = v[:, iE, ...]
 
-        elif isinstance(kavg, Integral):
+        else:
             data = v[kavg, iE, ...]
 
-        else:
-            raise ValueError(
-                f"{self.__class__.__name__} requires kavg argument to be either bool or an integer corresponding to the k-point index."
-            )
+        data = np.asarray(data)
+        self._E_cache[key] = data
 
-        # Return data
-        return data
+        # Return a copy to not expose the cached data
+        return data.copy()
 
     @missing_input_fdf([("TBT.T.All", "True")])
     def transmission(self, elec_from=0, elec_to=1, kavg=True) -> ndarray:
@@ -1096,21 +1127,50 @@ class tbtncSileTBtrans(_devncSileTBtrans):
         # retrieve and return data
         return self._value_E(name, elec, kavg, E)
 
-    def _sparse_data_to_matrix(self, data, isc=None, orbitals=None) -> csr_matrix:
-        """Internal routine for retrieving sparse data (orbital current, COOP)"""
-        # Get the geometry for obtaining the sparsity pattern.
+    def _sparse_pattern(self, isc=None, orbitals=None):
+        """Internal routine for retrieving the sparse pattern (orbital current, COOP)
+
+        The sparsity pattern is the same for all energies and k-points, hence it is
+        cached.
+
+        Returns
+        -------
+        rptr : numpy.ndarray
+            the row pointers of the sparse matrix
+        col : numpy.ndarray
+            the column indices of the sparse matrix
+        idx : numpy.ndarray or None
+            the indices of the sparse data that corresponds to the pattern, if None
+            all data is used
+        """
         geom = self.geometry
 
+        # sanitize the arguments to create a key for the cache
+        if orbitals is not None:
+            orbitals = geom._sanitize_orbs(orbitals).ravel()
+            key_orbs = orbitals.tobytes()
+        else:
+            key_orbs = None
+        if isc is None:
+            isc = [None, None, None]
+        else:
+            isc = list(isc)
+        key = ("pattern", tuple(isc), key_orbs)
+        pattern = self._pattern_cache.get(key)
+        if pattern is not None:
+            return pattern
+
         # These are the row-pointers...
         ncol = self._value("n_col")
 
         # Get column indices
         col = self._value("list_col") - 1
 
+        # the retained data indices
+        idx = None
+
         # get subset orbitals
         if not orbitals is None:
-            orbitals = geom._sanitize_orbs(orbitals)
-
             # select values for all supercells
             all_col = np.add.outer(np.arange(geom.n_s), orbitals).ravel()
 
@@ -1125,7 +1185,7 @@ class tbtncSileTBtrans(_devncSileTBtrans):
 
             # reduce space
             col = col[all_col]
-            data = data[..., all_col]
+            idx = all_col.nonzero()[0]
 
             # now calculate new subset rows
             row, nrow = np.unique(row[all_col], return_counts=True)
@@ -1135,18 +1195,6 @@ class tbtncSileTBtrans(_devncSileTBtrans):
 
         rptr = _ncol_to_indptr(ncol)
 
-        # Default matrix size
-        mat_size = [geom.no, geom.no_s]
-
-        # Figure out the super-cell indices that are requested
-        # First we figure out the indices, then
-        # we build the array of allowed columns
-        if isc is None:
-            isc = [None, None, None]
-
-        # reset for next phase
-        all_col = None
-
         if not (isc[0] is None and isc[1] is None and isc[2] is None):
             # The user has requested specific supercells
             # Here we create a list of supercell interactions.
@@ -1190,6 +1238,10 @@ class tbtncSileTBtrans(_devncSileTBtrans):
             all_col = np.isin(col, all_col)
             row = row[all_col]
             col = col[all_col]
+            if idx is None:
+                idx = all_col.nonzero()[0]
+            else:
+                idx = idx[all_col]
 
             # now calculate new subset rows
             row, nrow = np.unique(row, return_counts=True)
@@ -1199,9 +1251,22 @@ class tbtncSileTBtrans(_devncSileTBtrans):
             rptr = _ncol_to_indptr(ncol)
             del ncol, row, nrow
 
-            data = data[..., all_col]
+        pattern = (rptr, col, idx)
+        self._pattern_cache[key] = pattern
+        return pattern
+
+    def _sparse_data_to_matrix(self, data, isc=None, orbitals=None) -> csr_matrix:
+        """Internal routine for retrieving sparse data (orbital current, COOP)"""
+        geom = self.geometry
+        rptr, col, idx = self._sparse_pattern(isc, orbitals)
+        if idx is not None:
+            data = data[..., idx]
+
+        # Default matrix size
+        mat_size = [geom.no, geom.no_s]
 
-        return csr_matrix((data, col, rptr), shape=mat_size)
+        # copy the pattern since scipy may change it in-place
+        return csr_matrix((data, col.copy(), rptr.copy()), shape=mat_size)
 
     def _sparse_matrix(
         self, name, elec, E, kavg=True, isc=None, orbitals=None
@@ -1237,26 +1302,28 @@ class tbtncSileTBtrans(_devncSileTBtrans):
         """
         geom = self.geometry
         na = geom.na
-        o2a = geom.o2a
 
         if not uc:
             uc = Dij.shape[0] == Dij.shape[1]
 
-        # We convert to atomic bond-currents
-        if uc:
-            Dab = csr_matrix((na, na), dtype=Dij.dtype)
-
-            def map_col(c):
-                return o2a(c) % na
+        # Lets do array notation for speeding up the computations
+        if not (issparse(Dij) and Dij.format == "csr"):
+            Dij = Dij.tocsr()
 
+        if uc:
+            shape = (na, na)
         else:
-            Dab = csr_matrix((na, na * geom.n_s), dtype=Dij.dtype)
+            shape = (na, na * geom.n_s)
 
-            map_col = o2a
+        if sum_dup:
+            # Retrieve the (cached) reduction of the orbital pattern to the atomic pattern
+            indptr, indices, reduction = self._sparse_orbital_to_atom_map(Dij, uc)
+            return csr_matrix(
+                (reduction @ Dij.data, indices.copy(), indptr.copy()), shape=shape
+            )
 
-        # Lets do array notation for speeding up the computations
-        if not (issparse(Dij) and Dij.format == "csr"):
-            Dij = Dij.tocsr()
+        Dab = csr_matrix(shape, dtype=Dij.dtype)
+        o2a = self._o2a_map(uc)
 
         # Check for the simple case of 1-orbital systems
         if geom.na == geom.no:
@@ -1265,10 +1332,7 @@ class tbtncSileTBtrans(_devncSileTBtrans):
 
             # Transfer all columns to the new columns
             Dab.indptr[:] = Dij.indptr.copy()
-            if uc:
-                Dab.indices = (Dij.indices % na).astype(np.int32, copy=False)
-            else:
-                Dab.indices = Dij.indices.copy()
+            Dab.indices = o2a[Dij.indices]
 
         else:
             # The multi-orbital case
@@ -1287,16 +1351,67 @@ class tbtncSileTBtrans(_devncSileTBtrans):
             # been processed.
             Dab.indptr[:] = indptr[:]
             # Transfer all columns to the new columns
-            Dab.indices = map_col(Dij.indices).astype(np.int32, copy=False)
+            Dab.indices = o2a[Dij.indices]
 
         # Copy data
         Dab.data = np.copy(Dij.data)
 
-        if sum_dup:
-            Dab.sum_duplicates()
-
         return Dab
 
+    def _o2a_map(self, uc: bool = False) -> ndarray:
+        """Cached orbital to atom index map for all supercell orbitals"""
+        key = ("o2a", uc)
+        o2a = self._pattern_cache.get(key)
+        if o2a is None:
+            geom = self.geometry
+            o2a = geom.o2a(_a.arangei(geom.no_s)).astype(np.int32, copy=False)
+            if uc:
+                o2a %= geom.na
+            self._pattern_cache[key] = o2a
+        return o2a
+
+    def _sparse_orbital_to_atom_map(self, Dij, uc: bool):
+        """Cached reduction of an orbital sparse pattern to the atomic sparse pattern
+
+        Returns
+        -------
+        indptr, indices :
+            the atomic sparse pattern (sorted and without duplicates)
+        reduction : scipy.sparse.csr_matrix
+            the matrix summing the orbital data into the atomic data
+        """
+        key = ("o2a-pattern", Dij.shape, uc)
+        cached = self._pattern_cache.get(key)
+        if cached is not None:
+            indptr, indices, atom_pattern = cached
+            if np.array_equal(indptr, Dij.indptr) and np.array_equal(
+                indices, Dij.indices
+            ):
+                return atom_pattern
+
+        geom = self.geometry
+        na = geom.na
+        ncol = na if uc else na * geom.n_s
+
+        o2a = self._o2a_map(uc)
+        rows = o2a[np.repeat(_a.arangei(Dij.shape[0]), np.diff(Dij.indptr))]
+        cols = o2a[Dij.indices]
+        pair, inv = np.unique(rows.astype(np.int64) * ncol + cols, return_inverse=True)
+        rows, cols = np.divmod(pair, ncol)
+        atom_indptr = _ncol_to_indptr(np.bincount(rows, minlength=na))
+        nnz = len(inv)
+        reduction = csr_matrix(
+            (np.ones(nnz, dtype=np.int8), (inv.ravel(), _a.arangei(nnz))),
+            shape=(len(pair), nnz),
+        )
+        atom_pattern = (atom_indptr, cols.astype(np.int32), reduction)
+        self._pattern_cache[key] = (
+            Dij.indptr.copy(),
+            Dij.indices.copy(),
+            atom_pattern,
+        )
+        return atom_pattern
+
     @wrap_filterwarnings("ignore", category=SparseEfficiencyWarning)
     def sparse_atom_to_vector(self, Dab) -> ndarray:
         """Reduce an atomic sparse matrix to a vector contribution of each atom
@@ -419,6 +419,44 @@ def test_1_graphene_all_fail_kavg(sisl_files, sisl_tmp):
         tbt.transmission(kavg=[0, 1])
 
 
+def test_1_graphene_E_cache(sisl_files):
+    f = sisl_files("siesta", "tbtrans", "graphene", "graphene.TBT.nc")
+    tbt = sisl.get_sile(f)
+    E = tbt.E[1]
+    J = tbt.orbital_transmission(E, 0)
+    n = len(tbt._E_cache)
+    assert n > 0
+    # modifying the returned data may not change the cached data
+    J.data[:] = 1000.0
+    J = tbt.orbital_transmission(E, 0)
+    assert len(tbt._E_cache) == n
+    assert not np.allclose(J.data, 1000.0)
+
+    tbt0 = sisl.get_sile(f, cache_size=0)
+    assert np.allclose(J.toarray(), tbt0.orbital_transmission(E, 0).toarray())
+    assert len(tbt0._E_cache) == 0
+
+
+def test_1_graphene_pattern_cache(sisl_files):
+    f = sisl_files("siesta", "tbtrans", "graphene", "graphene.TBT.nc")
+    tbt = sisl.get_sile(f)
+    E = tbt.E[1]
+
+    for isc in (None, [0, 0, 0]):
+        T1 = tbt.orbital_transmission(E, 0, isc=isc)
+        # scipy may sort indices in-place, this should not change the cache
+        T1.sum_duplicates()
+        T2 = tbt.orbital_transmission(E, 0, isc=isc)
+        assert abs(T1 - T2).max() == 0
+
+        t1 = tbt.sparse_orbital_to_atom(T1)
+        t2 = tbt.sparse_orbital_to_atom(T2)
+        t3 = tbt.sparse_orbital_to_atom(T1, sum_dup=False)
+        t3.sum_duplicates()
+        assert abs(t1 - t2).max() == 0
+        assert abs(t1 - t3).max() < 1e-12
+
+
 def test_1_graphene_sparse_current(sisl_files, sisl_tmp):
     tbt = sisl.get_sile(sisl_files("siesta", "tbtrans", "graphene", "graphene.TBT.nc"))
 
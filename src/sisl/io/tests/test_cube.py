@@ -124,3 +124,104 @@ def test_imaginary_fail_geometry(sisl_tmp):
     grid2.write(fi, imag=True)
     with pytest.raises(SislError):
         grid.read(fr, imag=fi)
+
+
+@pytest.mark.parametrize("fmt", [".5e", "15.8e", ".10e", "12.3f"])
+def test_fmt(sisl_tmp, fmt):
+    f = sisl_tmp("GRID.cube")
+    grid = Grid([4, 5, 7])
+    grid.grid = np.random.randn(*grid.shape) * 10.0 ** np.random.randint(
+        -20, 20, grid.shape
+    )
+    grid.grid[0, 0, :3] = [np.nan, -np.inf, 0]
+    grid.write(f, fmt=fmt)
+    read = grid.read(f)
+    fmt = f"{{:{fmt}}}"
+    data = np.array([float(fmt.format(v)) for v in grid.grid.ravel()])
+    assert np.array_equal(read.grid.ravel(), data, equal_nan=True)
+
+
+def _format_ref(v, fmt):
+    """Per-value formatting, 6 values per line"""
+    lines = []
+    for i in range(0, len(v), 6):
+        line = " ".join(f"{x:{fmt}}" for x in v[i : i + 6])
+        lines.append(line if len(v) - i >= 6 else line + " ")
+    return "\n".join(lines) + "\n"
+
+
+def test_format_e():
+    from sisl.io.cube import _format_e
+
+    v = np.random.randn(1000) * 10.0 ** np.random.randint(-90, 90, 1000)
+    v[:6] = [0, -0.0, 1, 9.9999951, -9.9999949, 1e-99]
+    for width, prec in [(0, 5), (15, 8), (0, 0), (12, 3)]:
+        fmt = f"{{:.{prec}e}}"
+        assert _format_e(v, width, prec).split() == [fmt.format(x) for x in v]
+        lines = _format_e(v, width, prec).splitlines()
+        assert len(lines) == 167
+
+    # 3 digit exponents are only used where needed
+    v[0] = 1e-100
+    v[7] = -2.5e-310
+    for width, prec in [(0, 5), (15, 8), (0, 0), (12, 3), (13, 5)]:
+        for n in [1000, 12, 1]:
+            assert _format_e(v[:n], width, prec) == _format_ref(
+                v[:n], f"{width}.{prec}e"
+            )
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+def test_format_e_small():
+    from sisl.io.cube import _format_e
+
+    tiny = np.finfo(np.float64).tiny
+    # subnormal and the smallest normal values
+    v = np.array([5e-320, 2.5e-310, -2.5e-310, 5e-324, tiny, -tiny, 1e-307, 1e300])
+    for width, prec in [(0, 5), (15, 8), (0, 0)]:
+        data = np.array([float(f"{x:.{prec}e}") for x in v])
+        out = np.fromstring(_format_e(v, width, prec), sep=" ")
+        assert np.array_equal(out, data)
+        assert np.all(out[:-1] != 0)
+
+
+@pytest.mark.parametrize("nan", [False, True])
+@pytest.mark.parametrize("buffersize", [48, 1000])
+def test_fmt_e_text(sisl_tmp, buffersize, nan):
+    f = sisl_tmp("GRID.cube")
+    grid = Grid([4, 5, 7])
+    grid.grid = np.random.randn(*grid.shape) * 10.0 ** np.random.randint(
+        -20, 20, grid.shape
+    )
+    grid.grid[0, 0, :2] = [2.5e-310, -1e-120]
+    grid.grid[1, 2, :2] = [1e150, -5e-320]
+    if nan:
+        # the last values are written one by one
+        grid.grid[-1, -1, -1] = np.nan
+    grid.write(f, buffersize=buffersize)
+    with open(f) as fh:
+        text = fh.read()
+    assert text.endswith("\n" + _format_ref(grid.grid.ravel(), ".5e") + "\n")
+
+
+def test_mmap(sisl_tmp):
+    f = sisl_tmp("GRID.cube")
+    grid = Grid(0.2)
+    grid.grid = np.random.rand(*grid.shape)
+    grid.write(f)
+    read = cubeSile(f).read_grid(mmap=sisl_tmp("GRID.dat"))
+    assert isinstance(read.grid, np.memmap)
+    assert np.allclose(grid.grid, read.grid)
+
+
+def test_fail_size(sisl_tmp):
+    f = sisl_tmp("GRID.cube")
+    grid = Grid(0.2)
+    grid.grid = np.random.rand(*grid.shape)
+    grid.write(f)
+    with open(f) as fh:
+        lines = fh.readlines()
+    with open(f, "w") as fh:
+        fh.writelines(lines[:-3])
+    with pytest.raises(SislError):
+        cubeSile(f).read_grid()
@@ -3,17 +3,14 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
-from numbers import Integral
-
 import numpy as np
 
 from sisl import Grid
 from sisl._internal import set_module
 
-from .._help import grid_reduce_indices
 from ..sile import add_sile, sile_fh_open
 from .car import carSileVASP
-from .sile import SileVASP
+from .sile import _read_grid_values
 
 __all__ = ["chgSileVASP"]
 
@@ -67,69 +64,15 @@ class chgSileVASP(carSileVASP):
         geom = self.read_geometry()
         V = geom.lattice.volume
 
-        rl = self.readline
-
-        # Now we are past the cell and geometry
-        # We can now read the size of CHGCAR
-        rl()
-        nx, ny, nz = list(map(int, rl().split()))
-        n = nx * ny * nz
-
-        is_index = True
-        if isinstance(index, Integral):
-            max_index = index + 1
-        else:
-            is_index = False
-            max_index = len(index)
-
-        vals = []
-        vext = vals.extend
-
-        is_chgcar = True
-        i = 0
-        while i < n * max_index:
-            line = rl()
-            if line == "":
-                raise ValueError(
-                    f"{self.__class__.__name__}.read_grid cannot find requested index in {self!r}"
-                )
-            line = line.split()
+        def separator(ncol):
             # CHG: 10 columns, CHGCAR: 5 columns
-            if is_chgcar and len(line) > 5:
-                # we have a data line with more than 5 columns, must be a CHG file
-                is_chgcar = False
-            vext(line)
-            i = len(vals)
-
-            if i % n == 0 and i < n * max_index:
-                if is_chgcar:
-                    # Read over augmentation occupancies
-                    line = rl()
-                    while "augmentation" in line:
-                        occ = int(line.split()[-1])
-                        j = 0
-                        while j < occ:
-                            j += len(rl().split())
-                        line = rl()
-                    # read over an additional block with geom.na entries???
-                    j = len(line.split())
-                    while j < geom.na:
-                        j += len(rl().split())
-
-                # one line of nx, ny, nz
-                assert np.allclose(list(map(int, rl().split())), [nx, ny, nz])
-
-        # Cut size before proceeding (otherwise it *may* fail)
-        vals = np.array(vals).astype(dtype, copy=False)
-        if is_index:
-            val = vals[n * index : n * (index + 1)].reshape(nz, ny, nx)
-        else:
-            vals = vals[: n * max_index].reshape(-1, nz, ny, nx)
-            val = grid_reduce_indices(vals, index, axis=0)
-        del vals
-
-        # Make it C-ordered with nx, ny, nz
-        val = np.swapaxes(val, 0, 2) / V
+            # only CHGCAR has augmentation occupancies and an additional block
+            # with geom.na entries
+            is_chgcar = ncol <= 5
+            return is_chgcar, is_chgcar
+
+        val = _read_grid_values(self, geom.na, index, dtype, separator)
+        val /= V
 
         # Create the grid with data
         # Since we populate the grid data afterwards there
@@ -3,8 +3,6 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
-from numbers import Integral
-
 import numpy as np
 
 from sisl import Grid
@@ -12,10 +10,9 @@ from sisl._internal import set_module
 from sisl.typing import UnitsVar
 from sisl.unit import serialize_units_arg, unit_convert
 
-from .._help import grid_reduce_indices
 from ..sile import add_sile, sile_fh_open
 from .car import carSileVASP
-from .sile import SileVASP
+from .sile import _read_grid_values
 
 __all__ = ["locpotSileVASP"]
 
@@ -60,55 +57,15 @@ class locpotSileVASP(carSileVASP):
         geom = self.read_geometry()
         V = geom.lattice.volume
 
-        # Now we are past the cell and geometry
-        # We can now read the size of LOCPOT
-        self.readline()
-        nx, ny, nz = list(map(int, self.readline().split()))
-        n = nx * ny * nz
-
-        is_index = True
-        if isinstance(index, Integral):
-            max_index = index + 1
-        else:
-            is_index = False
-            max_index = len(index)
-
-        rl = self.readline
-        vals = []
-        vapp = vals.append
-
-        i = 0
-        while i < n * max_index:
-            dat = [l for l in rl().split()]
-            vapp(dat)
-            i += len(dat)
-
-            if i % n == 0 and i < n * max_index:
-                # Each time a new spin-index is present, we need to read the coordinates
-                j = 0
-                while j < geom.na:
-                    j += len(rl().split())
-
-                # one line of nx, ny, nz
-                rl()
-
-        # Cut size before proceeding (otherwise it *may* fail)
-        vals = np.array(vals).astype(dtype).ravel()
-        if is_index:
-            val = vals[n * index : n * (index + 1)].reshape(nz, ny, nx)
-        else:
-            vals = vals[: n * max_index].reshape(-1, nz, ny, nx)
-            val = grid_reduce_indices(vals, index, axis=0)
-        del vals
-
-        # Make it C-ordered with nx, ny, nz
-        val = np.swapaxes(val, 0, 2) / V
+        # Each spin-index is preceded by a block with geom.na entries
+        val = _read_grid_values(self, geom.na, index, dtype, lambda ncol: (False, True))
+        val *= eV2unit / V
 
         # Create the grid with data
         # Since we populate the grid data afterwards there
         # is no need to create a bigger grid than necessary.
         grid = Grid([1, 1, 1], dtype=dtype, geometry=geom)
-        grid.grid = val * eV2unit
+        grid.grid = val
 
         return grid
 
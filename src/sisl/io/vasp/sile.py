@@ -6,6 +6,11 @@ from __future__ import annotations
 """
 Define a common VASP Sile
 """
+from itertools import islice
+from numbers import Integral
+
+import numpy as np
+
 import sisl._array as _a
 from sisl._internal import set_module
 
@@ -58,6 +63,165 @@ def _geometry_group(geometry, ret_index=False):
     return geometry.sub(idx)
 
 
+# number of lines parsed in one go when reading volumetric data
+_GRID_CHUNK_LINES = 65536
+
+
+def _grid_block(sile, n: int, dtype, out=None, factor=1) -> int:
+    r"""Read a single block of `n` volumetric data values
+
+    The values are parsed in chunks of many lines at a time.
+    If `out` is None the lines are skipped without converting the values.
+    Otherwise the values are stored in the flat array `out` (``factor is None``),
+    or added to `out` after being multiplied by `factor`.
+
+    Returns
+    -------
+    int
+        number of columns in the data lines
+    """
+
+    def store(i, vals):
+        if out is None:
+            return
+        m = len(vals)
+        if factor is None:
+            out[i : i + m] = vals
+        elif factor == 1:
+            out[i : i + m] += vals
+        else:
+            out[i : i + m] += vals * factor
+
+    line = sile.readline()
+    vals = np.fromstring(line, dtype=dtype, sep=" ")
+    ncol = len(vals)
+    if ncol == 0:
+        raise ValueError(
+            f"{sile.__class__.__name__}.read_grid could not read volumetric data in {sile!r}"
+        )
+
+    fh = sile.fh
+    i = 0
+    while True:
+        m = len(vals)
+        if i + m > n:
+            raise ValueError(
+                f"{sile.__class__.__name__}.read_grid found more values than expected in a data block in {sile!r}"
+            )
+        store(i, vals)
+        i += m
+        if i == n:
+            break
+
+        if out is None:
+            # all lines but the last one are completely filled, so there is
+            # no need to parse them, the following separator checks we ended correctly
+            nlines = (n - i - 1) // ncol
+            sile._line += sum(1 for _ in islice(fh, nlines))
+            i += nlines * ncol
+            vals = sile.readline().split()
+        else:
+            # read as many lines as required to complete the block
+            lines = list(islice(fh, min(-(-(n - i) // ncol), _GRID_CHUNK_LINES)))
+            sile._line += len(lines)
+            vals = np.fromstring("".join(lines), dtype=dtype, sep=" ")
+        if len(vals) == 0:
+            raise ValueError(
+                f"{sile.__class__.__name__}.read_grid cannot find requested index in {sile!r}"
+            )
+
+    return ncol
+
+
+def _grid_skip_separator(sile, shape, na: int, augmentation: bool, atoms: bool):
+    """Step past the section separating two volumetric data blocks
+
+    Parameters
+    ----------
+    augmentation :
+       whether ``augmentation occupancies`` sections are present (CHGCAR)
+    atoms :
+       whether a block with `na` values is present
+    """
+    rl = sile.readline
+
+    def skip(j, n):
+        # skip lines until `n` values have been read (`j` already read)
+        while j < n:
+            line = rl()
+            if not line:
+                break
+            j += len(line.split())
+
+    line = rl()
+    if augmentation:
+        # the header of each section holds the number of values
+        while "augmentation" in line:
+            skip(0, int(line.split()[-1]))
+            line = rl()
+    if atoms:
+        skip(len(line.split()), na)
+        line = rl()
+
+    if line.split() != list(map(str, shape)):
+        raise ValueError(
+            f"{sile.__class__.__name__}.read_grid cannot find requested index in {sile!r}"
+        )
+
+
+def _read_grid_values(sile, na: int, index, dtype, separator):
+    r"""Read the volumetric data of a CHG/CHGCAR/LOCPOT file into a preallocated buffer
+
+    The file-handle should be positioned just after the geometry.
+    Only the data blocks required by `index` are converted, any
+    other blocks are skipped (and the remaining file is never read).
+
+    Parameters
+    ----------
+    sile :
+       the sile to read from
+    na :
+       number of atoms in the geometry
+    index : int or array_like
+       the index of the data block, or the fractional contributions
+       of each data block.
+    dtype :
+       data-type of the returned values
+    separator : callable
+       ``separator(ncol)`` returns the tuple ``(augmentation, atoms)`` passed to
+       `_grid_skip_separator` for data lines with ``ncol`` columns
+
+    Returns
+    -------
+    numpy.ndarray
+       the values with shape ``(nx, ny, nz)`` in Fortran order
+    """
+    rl = sile.readline
+    rl()
+    shape = list(map(int, rl().split()))
+    n = np.prod(shape)
+
+    if isinstance(index, Integral):
+        factors = [0] * index + [None]
+    else:
+        factors = index
+
+    # the file is stored with the first lattice vector index running fastest
+    values = np.zeros(shape, dtype=dtype, order="F")
+    flat = values.reshape(-1, order="F")
+
+    for ib, factor in enumerate(factors):
+        if ib > 0:
+            _grid_skip_separator(sile, shape, na, *separator(ncol))
+        if factor is None or factor != 0:
+            ncol = _grid_block(sile, n, dtype, flat, factor)
+        else:
+            # skip blocks that do not contribute
+            ncol = _grid_block(sile, n, dtype)
+
+    return values
+
+
 @set_module("sisl.io.vasp")
 class SileVASP(Sile):
     geometry_group = staticmethod(_geometry_group)
@@ -8,6 +8,7 @@ import os.path as osp
 import numpy as np
 import pytest
 
+from sisl import Atom, Geometry, Lattice
 from sisl.io.vasp.chg import *
 
 pytestmark = [pytest.mark.io, pytest.mark.vasp]
@@ -104,3 +105,51 @@ def test_nitric_oxide_soi(sisl_files, chg_type, np_dtype):
     grid.grid /= 2
     up_spin = chgSileVASP(f).read_grid([0.5, 0, 0, 0.5], dtype=np_dtype)
     assert np.allclose(grid.grid, up_spin.grid)
+
+
+def _write_chg(f, geom, grids, ncol):
+    """Write a minimal CHG(CAR) file, CHGCAR files (5 columns) have augmentation occupancies"""
+    geom.write(chgSileVASP(f, "w"))
+    shape = grids[0].shape
+    with open(f, "a") as fh:
+        for i, grid in enumerate(grids):
+            fh.write(
+                "\n {} {} {}\n".format(*shape)
+                if i == 0
+                else " {} {} {}\n".format(*shape)
+            )
+            vals = grid.ravel(order="F") * geom.volume
+            for j in range(0, vals.size, ncol):
+                fh.write(" ".join(f"{v:18.11E}" for v in vals[j : j + ncol]) + "\n")
+            if ncol == 5:
+                for ia in range(geom.na):
+                    fh.write(f"augmentation occupancies {ia + 1} 7\n")
+                    fh.write(" 0.1 0.2 0.3 0.4 0.5\n 0.6 0.7\n")
+                if i < len(grids) - 1:
+                    fh.write(" ".join(["0.0"] * geom.na) + "\n")
+
+
+@pytest.mark.parametrize("ncol", [5, 10])
+def test_chg_read_index(sisl_tmp, ncol, np_dtype):
+    geom = Geometry([[0, 0, 0], [1, 1, 1]], Atom(6), Lattice(4))
+    # the number of values does not fill the last line
+    shape = (7, 4, 3)
+    grids = np.random.default_rng(1234).random((4, *shape))
+    f = sisl_tmp("test_read_index.CHGCAR")
+    _write_chg(f, geom, grids, ncol)
+
+    # single precision values near zero need an absolute tolerance
+    atol = 1e-6 if np_dtype == np.float32 else 1e-8
+
+    sile = chgSileVASP(f)
+    for i in range(4):
+        grid = sile.read_grid(i, dtype=np_dtype)
+        assert grid.dtype == np_dtype
+        assert grid.shape == shape
+        assert np.allclose(grid.grid, grids[i], rtol=1e-5, atol=atol)
+
+    grid = sile.read_grid([0.5, 0, 0, -0.5], dtype=np_dtype)
+    assert np.allclose(grid.grid, (grids[0] - grids[3]) / 2, rtol=1e-5, atol=atol)
+
+    with pytest.raises(ValueError):
+        sile.read_grid(4)
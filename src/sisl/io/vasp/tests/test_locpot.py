@@ -8,6 +8,7 @@ import os.path as osp
 import numpy as np
 import pytest
 
+from sisl import Atom, Geometry, Lattice
 from sisl.io.vasp.locpot import *
 
 pytestmark = [pytest.mark.io, pytest.mark.vasp]
@@ -33,3 +34,25 @@ def test_graphene_locpot_index_float(sisl_files):
     gridh = locpotSileVASP(f).read_grid(index=[0.5])
 
     assert grid.grid.sum() / 2 == pytest.approx(gridh.grid.sum())
+
+
+def test_locpot_read_index(sisl_tmp):
+    geom = Geometry([[0, 0, 0], [1, 1, 1]], Atom(6), Lattice(4))
+    # the number of values does not fill the last line
+    shape = (7, 4, 3)
+    grids = np.random.rand(2, *shape)
+    f = sisl_tmp("test_read_index.LOCPOT")
+    geom.write(locpotSileVASP(f, "w"))
+    with open(f, "a") as fh:
+        fh.write("\n")
+        for grid in grids:
+            fh.write(" {} {} {}\n".format(*shape))
+            vals = grid.ravel(order="F") * geom.volume
+            for j in range(0, vals.size, 5):
+                fh.write(" ".join(f"{v:18.11E}" for v in vals[j : j + 5]) + "\n")
+            fh.write(" ".join(["0.0"] * geom.na) + "\n")
+
+    sile = locpotSileVASP(f)
+    assert np.allclose(sile.read_grid(0).grid, grids[0])
+    assert np.allclose(sile.read_grid(1).grid, grids[1])
+    assert np.allclose(sile.read_grid([0.5, 0.5]).grid, grids.sum(0) / 2)
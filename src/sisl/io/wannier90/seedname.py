@@ -6,12 +6,11 @@ from __future__ import annotations
 """
 Sile object for reading/writing Wannier90 in/output
 """
-from collections import defaultdict
+from itertools import islice
 from pathlib import Path
 
 import numpy as np
 import scipy.sparse as sps
-from scipy.sparse import lil_matrix
 
 import sisl._array as _a
 from sisl import Geometry, Lattice
@@ -33,24 +32,49 @@ __all__ = [
 ]
 
 
-def _construct_hamiltonian(geometry: Geometry, Hsc):
-    # Get supercell size
-    nsc = _a.zerosi(3)
-    for isc in Hsc.keys():
-        for i in (0, 1, 2):
-            nsc[i] = max(abs(isc[i]), nsc[i])
-
-    # Create the full supercell
-    nsc = nsc * 2 + 1
+def _construct_hamiltonian(
+    geometry: Geometry, isc, rows, cols, H, ws, dtype, cutoff: float
+) -> Hamiltonian:
+    """Create the Hamiltonian from the arrays of all matrix elements
+
+    Parameters
+    ----------
+    geometry :
+       geometry of the Hamiltonian, its number of supercells will be updated
+       to contain all supercells in `isc` (also those only with elements below `cutoff`)
+    isc :
+       supercell offsets of the elements, shape ``(n, 3)``
+    rows, cols :
+       (0-based) orbital indices of the elements
+    H :
+       real and imaginary parts of the elements, shape ``(n, 2)``
+    ws :
+       Wigner-Seitz degeneracy weights of each element
+    dtype :
+       data-type of the Hamiltonian, for real data-types the imaginary part is discarded
+    cutoff :
+       elements with an absolute value below this are not stored
+    """
+    if np.iscomplexobj(dtype(1)):
+        h = (H[:, 0] + 1j * H[:, 1]) * ws
+    else:
+        h = H[:, 0] * ws
+    # Create the full supercell (from all supercells in the file)
+    nsc = np.abs(isc).max(0, initial=0) * 2 + 1
     geometry.set_nsc(nsc)
 
-    # Create the big matrix
-    H = []
-    for isc in geometry.lattice.sc_off:
-        H.append(Hsc[tuple(isc)].tocsr())
-
-    H = sps.hstack(H)
-
+    idx = (np.abs(h) > cutoff).nonzero()[0]
+    isc = isc[idx]
+
+    no = geometry.no
+    if len(idx) > 0:
+        cols = cols[idx] + geometry.lattice.sc_index(isc) * no
+    else:
+        cols = idx
+    H = sps.csr_matrix(
+        (h[idx].astype(dtype, copy=False), (rows[idx], cols)),
+        shape=(no, no * geometry.n_s),
+    )
     return Hamiltonian.fromsp(geometry, H)
 
 
@@ -497,43 +521,35 @@ class tbSileWannier90(hamSileWannier90):
             )
 
         ws = self._r_wigner_seitz_weights()
+        nws = len(ws)
 
-        # List for holding the Hamiltonian
-        Hsc = defaultdict(lambda: lil_matrix((geometry.no, geometry.no), dtype=dtype))
-        is_complex = np.iscomplexobj(dtype(1))
-
-        # Parse hamiltonian matrix elements
-        for w in ws:
-            l = self.readline()  # Skip empty line
-            if not l.strip() == "":
-                raise ValueError(
-                    f"{self.__class__.__name__}"
-                    ".read_hamiltonian unable to parse <>_tb.dat file, due to "
-                    "error in file format."
-                )
-
-            # Get super-cell
-            isc = map(int, self.readline().split())
-
-            # Get Hamiltonian matrix elements
-            Hr = Hsc[tuple(isc)]
-            for _ in range(no**2):
-                l = self.readline().split()
-
-                # Get row and column):
-                r, c = map(int, l[:2])
-
-                # Scale matrix elements
-                hr = float(l[2]) * w
-                if is_complex:
-                    h = hr + 1j * float(l[3]) * w
-                else:
-                    h = hr
-
-                if abs(h) > cutoff:
-                    Hr[r - 1, c - 1] = h
-
-        return _construct_hamiltonian(geometry, Hsc)
+        # Each supercell block consists of an empty line, the supercell offset
+        # and no ** 2 lines of matrix elements (the position matrix elements follow).
+        # Parse all blocks in one go
+        lines = list(islice(self.fh, nws * (no**2 + 2)))
+        if any(l.strip() != "" for l in lines[:: no**2 + 2]):
+            raise ValueError(
+                f"{self.__class__.__name__}"
+                ".read_hamiltonian unable to parse <>_tb.dat file, due to "
+                "error in file format."
+            )
+        data = np.fromstring("".join(lines), dtype=np.float64, sep=" ")
+        if data.size != nws * (3 + 4 * no**2):
+            raise ValueError(
+                f"{self.__class__.__name__}"
+                ".read_hamiltonian unable to parse <>_tb.dat file, due to "
+                "error in file format."
+            )
+        data = data.reshape(nws, -1)
+        isc = np.repeat(data[:, :3].astype(np.int32), no**2, axis=0)
+        data = data[:, 3:].reshape(-1, 4)
+        ws = np.repeat(ws, no**2)
+
+        rows = data[:, 0].astype(np.int32) - 1
+        cols = data[:, 1].astype(np.int32) - 1
+        return _construct_hamiltonian(
+            geometry, isc, rows, cols, data[:, 2:], ws, dtype, cutoff
+        )
 
 
 class hrSileWannier90(hamSileWannier90):
@@ -587,41 +603,19 @@ class hrSileWannier90(hamSileWannier90):
 
         ws = self._r_wigner_seitz_weights()
 
-        # List for holding the Hamiltonian
-        Hsc = defaultdict(lambda: lil_matrix((geometry.no, geometry.no), dtype=dtype))
-        is_complex = np.iscomplexobj(dtype(1))
-
-        iws = -1
-        isc = [0, 0, 0]
-        while True:
-            l = self.readline()
-            if l == "":
-                break
+        # Parse all matrix elements in one go, each line contains
+        # the supercell offset, row, column and the real and imaginary parts
+        data = np.fromstring(self.fh.read(), dtype=np.float64, sep=" ").reshape(-1, 7)
+        isc = data[:, :3].astype(np.int32)
+        rows = data[:, 3].astype(np.int32) - 1
+        cols = data[:, 4].astype(np.int32) - 1
 
-            # Split here...
-            l = l.split()
+        # A new degeneracy point starts at each (1, 1) element
+        iws = np.cumsum((rows + cols) == 0) - 1
 
-            # Get super-cell, row and column
-            isc[0], isc[1], isc[2], r, c = map(int, l[:5])
-
-            # Update index for degeneracy, if required
-            if r + c == 2:
-                iws += 1
-
-            # Get degeneracy of this element
-            w = ws[iws]
-
-            # Scale matrix elements
-            hr = float(l[5]) * w
-            if is_complex:
-                h = hr + 1j * float(l[6]) * w
-            else:
-                h = hr
-
-            if abs(h) > cutoff:
-                Hsc[tuple(isc)][r - 1, c - 1] = h
-
-        return _construct_hamiltonian(geometry, Hsc)
+        return _construct_hamiltonian(
+            geometry, isc, rows, cols, data[:, 5:], ws[iws], dtype, cutoff
+        )
 
 
 add_sile("win", winSileWannier90, gzip=True)
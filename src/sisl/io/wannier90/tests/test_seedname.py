@@ -104,3 +104,60 @@ def test_seedname_read_lattice(sisl_files):
     lat1 = f.read_lattice(order="tb")
     lat2 = f.read_lattice(order="win")
     assert np.allclose(lat1.cell, lat2.cell)
+
+
+def _write_ham(f_hr, f_tb, no, iscs, ws, H):
+    """Write the same Hamiltonian in the <>_hr.dat and <>_tb.dat formats"""
+    c, r = np.divmod(np.arange(no**2), no)
+    nws = len(iscs)
+    header = f"{no:12d}\n{nws:12d}\n" + "".join(f"{w:5d}" for w in ws) + "\n"
+    with open(f_hr, "w") as fh:
+        fh.write(" written by sisl\n" + header)
+        for isc, h in zip(iscs, H):
+            for ri, ci, (hr, hi) in zip(r, c, h):
+                fh.write(f"{isc[0]:5d}{isc[1]:5d}{isc[2]:5d}{ri + 1:5d}{ci + 1:5d}")
+                fh.write(f"{hr:12.6f}{hi:12.6f}\n")
+    with open(f_tb, "w") as fh:
+        fh.write(" written by sisl\n")
+        fh.write(" 4.0 0.0 0.0\n 0.0 4.0 0.0\n 0.0 0.0 4.0\n" + header)
+        for isc, h in zip(iscs, H):
+            fh.write(f"\n{isc[0]:5d}{isc[1]:5d}{isc[2]:5d}\n")
+            for ri, ci, (hr, hi) in zip(r, c, h):
+                fh.write(f"{ri + 1:5d}{ci + 1:5d}{hr:15.6E}{hi:15.6E}\n")
+        # position matrix elements (not read)
+        for isc in iscs:
+            fh.write(f"\n{isc[0]:5d}{isc[1]:5d}{isc[2]:5d}\n")
+            for ri, ci in zip(r, c):
+                fh.write(f"{ri + 1:5d}{ci + 1:5d}" + " 0.0" * 6 + "\n")
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.complex128])
+def test_hr_tb_read_ham(sisl_tmp, dtype):
+    f_hr = sisl_tmp("test_hr.dat")
+    f_tb = sisl_tmp("test_tb.dat")
+    no = 3
+    iscs = [[0, 0, 0], [1, 0, 0], [-1, 0, 0], [0, 2, 0], [0, -2, 0]]
+    ws = [1, 2, 2, 4, 4]
+    H = np.random.rand(len(iscs), no**2, 2) - 0.5
+    # the last supercells are below the cutoff
+    H[3:] = 1e-6
+    _write_ham(f_hr, f_tb, no, iscs, ws, H)
+
+    lattice = tbSileWannier90(f_tb).read_lattice()
+    hr = hrSileWannier90(f_hr).read_hamiltonian(lattice=lattice, dtype=dtype)
+    tb = tbSileWannier90(f_tb).read_hamiltonian(dtype=dtype)
+    assert hr.dtype == dtype
+    # all supercells in the file are present, also those without elements
+    assert np.allclose(hr.nsc, [3, 5, 1])
+    assert np.allclose(tb.nsc, [3, 5, 1])
+    assert hr.spsame(tb)
+    assert hr.tocsr()[:, hr.geometry.sc_index([0, 2, 0]) * no :][:, :no].nnz == 0
+    assert np.allclose(hr.tocsr().toarray(), tb.tocsr().toarray(), atol=1e-6)
+
+    # element (2, 1) in the [1, 0, 0] supercell (rows run fastest)
+    h = H[1, no * 0 + 1] / ws[1]
+    if np.iscomplexobj(dtype(1)):
+        ref = h[0] + 1j * h[1]
+    else:
+        ref = h[0]
+    assert hr[1, hr.geometry.sc_index([1, 0, 0]) * no] == pytest.approx(ref, abs=1e-6)
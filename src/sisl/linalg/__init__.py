@@ -20,6 +20,7 @@ like `numpy` and `scipy`.
    solve
    eig
    eigh
+   eigh_batch
    svd
    eigs
    eigsh
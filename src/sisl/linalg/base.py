@@ -3,6 +3,9 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from functools import partial as _partial
 
 # Create a _copy_ of the scipy.linalg.solve routine and implement
@@ -18,6 +21,13 @@ from scipy.linalg.lapack import get_lapack_funcs
 
 from sisl._internal import set_module
 
+try:
+    from threadpoolctl import threadpool_limits
+
+    _has_threadpoolctl = True
+except ImportError:
+    _has_threadpoolctl = False
+
 __all__ = ["linalg_info"]
 
 
@@ -285,6 +295,133 @@ eigh = _partial(sl.eigh, check_finite=False, overwrite_a=False, overwrite_b=Fals
 eigh_destroy = _partial(sl.eigh, check_finite=False, overwrite_a=True, overwrite_b=True)
 __all__ += _append("eigh", ["", "_destroy"])
 
+
+def _available_cpus() -> int:
+    """Number of CPUs available for the current process"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except Exception:
+        return os.cpu_count() or 1
+
+
+def _blas_limits(blas_threads: int):
+    """Context limiting the number of threads used by BLAS/LAPACK (requires ``threadpoolctl``)"""
+    if _has_threadpoolctl:
+        return threadpool_limits(limits=blas_threads)
+    return nullcontext()
+
+
+@set_module("sisl.linalg")
+def eigh_batch(
+    a,
+    b=None,
+    eigvals_only: bool = False,
+    nthreads=None,
+    blas_threads=None,
+    overwrite: bool = False,
+    out=None,
+    **kwargs,
+):
+    """Solve a stack of Hermitian eigenvalue problems using a pool of threads
+
+    Each eigenvalue problem is solved with `eigh` in a separate thread.
+    LAPACK releases the GIL, and hence the problems are solved in parallel
+    without the overhead of processes.
+
+    Parameters
+    ----------
+    a : (n, m, m) array_like
+       stack of Hermitian matrices
+    b : (n, m, m) array_like, optional
+       stack of Hermitian positive definite matrices (generalized eigenvalue problems)
+    eigvals_only :
+       only calculate eigenvalues
+    nthreads : int, optional
+       number of threads used, defaults to the number of available CPUs (but
+       at most the number of matrices).
+    blas_threads : int, optional
+       number of threads each BLAS/LAPACK call may use. This requires ``threadpoolctl``,
+       and defaults to the number of available CPUs divided by `nthreads` to
+       prevent oversubscription.
+    overwrite :
+       whether the matrices in `a` and `b` may be overwritten
+    out : numpy.ndarray or tuple of numpy.ndarray, optional
+       preallocated arrays for the eigenvalues (and eigenvectors)
+    **kwargs :
+       passed directly to `scipy.linalg.eigh`
+
+    Returns
+    -------
+    eigenvalues : (n, m) numpy.ndarray
+    eigenvectors : (n, m, m) numpy.ndarray
+       only returned if `eigvals_only` is false
+    """
+    a = np.asarray(a)
+    if a.ndim != 3:
+        raise ValueError(f"eigh_batch: requires a 3D stack of matrices, got {a.ndim}D")
+    n = a.shape[0]
+    if b is not None:
+        b = np.asarray(b)
+        if b.shape != a.shape:
+            raise ValueError("eigh_batch: a and b must have the same shape")
+
+    ncpus = _available_cpus()
+    if nthreads is None:
+        nthreads = ncpus
+    nthreads = max(1, min(int(nthreads), n))
+    if blas_threads is None:
+        blas_threads = max(1, ncpus // nthreads)
+
+    func = _partial(
+        sl.eigh,
+        check_finite=False,
+        overwrite_a=overwrite,
+        overwrite_b=overwrite,
+        eigvals_only=eigvals_only,
+        **kwargs,
+    )
+
+    if b is None:
+
+        def solve(i):
+            return func(a[i])
+
+    else:
+
+        def solve(i):
+            return func(a[i], b[i])
+
+    with _blas_limits(blas_threads):
+        if nthreads == 1:
+            results = map(solve, range(n))
+            results = _fill_batch(results, n, eigvals_only, out)
+        else:
+            with ThreadPoolExecutor(nthreads) as pool:
+                results = _fill_batch(pool.map(solve, range(n)), n, eigvals_only, out)
+
+    return results
+
+
+def _fill_batch(results, n: int, eigvals_only: bool, out):
+    """Collect the results from an iterator into stacked arrays"""
+    for i, res in enumerate(results):
+        if eigvals_only:
+            if out is None:
+                out = np.empty([n, *res.shape], dtype=res.dtype)
+            out[i] = res
+        else:
+            if out is None:
+                out = (
+                    np.empty([n, *res[0].shape], dtype=res[0].dtype),
+                    np.empty([n, *res[1].shape], dtype=res[1].dtype),
+                )
+            out[0][i] = res[0]
+            out[1][i] = res[1]
+    return out
+
+
+__all__ += ["eigh_batch"]
+
 eigvalsh = _partial(
     sl.eigvalsh, check_finite=False, overwrite_a=False, overwrite_b=False
 )
@@ -7,7 +7,7 @@ import numpy as np
 import pytest
 import scipy.linalg as sl
 
-from sisl.linalg import eig, eig_destroy, eigh, eigh_destroy
+from sisl.linalg import eig, eig_destroy, eigh, eigh_batch, eigh_destroy
 
 pytestmark = [pytest.mark.linalg, pytest.mark.eig]
 
@@ -58,3 +58,28 @@ def test_eigh_d1():
     x, v = eigh_destroy(a)
     assert np.allclose(xs, x)
     assert np.allclose(vs, v)
+
+
+@pytest.mark.parametrize("nthreads", [1, 3])
+def test_eigh_batch(nthreads):
+    np.random.seed(1204982)
+    a = np.random.rand(5, 10, 10)
+    a = a + a.transpose(0, 2, 1)
+    b = np.random.rand(5, 10, 10)
+    b = b @ b.transpose(0, 2, 1) + np.eye(10) * 10
+    ac = a.copy()
+
+    x = eigh_batch(a, eigvals_only=True, nthreads=nthreads)
+    assert x.shape == (5, 10)
+    x, v = eigh_batch(a, b, nthreads=nthreads)
+    assert v.shape == (5, 10, 10)
+    for i in range(5):
+        xs, vs = sl.eigh(a[i], b[i])
+        assert np.allclose(xs, x[i])
+        assert np.allclose(np.abs(vs), np.abs(v[i]))
+    assert np.allclose(a, ac)
+
+
+def test_eigh_batch_fail():
+    with pytest.raises(ValueError):
+        eigh_batch(np.random.rand(10, 10))
@@ -21,6 +21,8 @@ Brillouin zone
    BrillouinZone - base class
    MonkhorstPack - MP class
    BandStructure - bandstructure class
+   BrillouinZonePool - persistent pool for parallel BZ calculations
+   EigenstateCache - eigenstates shared between Brillouin zone calculations
 
 
 Spin configuration
@@ -51,6 +53,12 @@ Bloch's theorem
    Bloch
 
 
+Real-space grids
+================
+
+   OrbitalValuesCache - orbital values on grids shared between projections
+
+
 Distribution functions
 ======================
 
@@ -89,7 +97,9 @@ Sparse matrices
 
 """
 
+from ._eigenstate_cache import *
 from ._feature import *
+from ._orbital_values import *
 from .distribution import *
 from .sparse import *
 from .spin import *
@@ -7,9 +7,15 @@ from __future__ import annotations
 
 This module should not expose any methods!
 """
+import hashlib
 import operator as op
+import os
+import pickle
+import tempfile
+import weakref
 from functools import reduce, wraps
 from itertools import zip_longest
+from typing import Optional
 
 import numpy as np
 from numpy import cross, pi
@@ -46,6 +52,7 @@ from .brillouinzone import BrillouinZone, MonkhorstPack
 # We expose the Apply and ParentApply classes
 __all__ = ["BrillouinZoneApply", "BrillouinZoneParentApply"]
 __all__ += ["MonkhorstPackApply", "MonkhorstPackParentApply"]
+__all__ += ["BrillouinZonePool"]
 
 
 def _asoplist(arg):
@@ -62,6 +69,236 @@ def _correct_str(orig, insert):
     return f"Apply{{{insert}, {orig[i:]}"
 
 
+# Parent objects that have been shipped to the current (worker) process.
+# The key is the token of the serialized parent, i.e. an object version.
+_worker_parents = {}
+
+
+def _worker_parent(token, path):
+    """Retrieve the parent object identified by `token` in a worker process
+
+    The parent will only be read (and unpickled) once per worker and object version.
+    """
+    parent = _worker_parents.get(token)
+    if parent is None:
+        # only retain the latest version, older versions are not needed anymore
+        _worker_parents.clear()
+        with open(path, "rb") as fh:
+            parent = pickle.load(fh)
+        _worker_parents[token] = parent
+    return parent
+
+
+def _worker_apply(task):
+    """Run a method on a chunk of k-points in a worker process"""
+    token, path, method, args, kwargs, wrap, k, w = task
+    if token is None:
+        # the method is shipped with the task
+        parent = getattr(method, "__self__", None)
+    else:
+        parent = _worker_parent(token, path)
+        method = getattr(parent, method)
+    return [
+        wrap(method(*args, k=ki, **kwargs), parent=parent, k=ki, weight=wi)
+        for ki, wi in zip(k, w)
+    ]
+
+
+def _cleanup_pool(pool, path):
+    """Shut down the processes in `pool` and remove the shipped parent file"""
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+@set_module("sisl.physics")
+class BrillouinZonePool:
+    r"""A persistent pool of worker processes used for parallel `BrillouinZone.apply` calls
+
+    The default parallel behaviour of `BrillouinZone.apply` creates (and tears down)
+    a pool of processes for each call, and the parent object will be serialized
+    for every single k-point.
+    This pool retains its worker processes until it is closed, and the parent
+    object will only be shipped to the workers once per *version* of the parent.
+    The version of the parent is determined by the content of the serialized object,
+    so any changes to the parent will automatically be shipped to the workers.
+
+    The k-points are distributed in chunks, each chunk evaluated in one go
+    by a worker.
+
+    This requires the package ``pathos`` to be available.
+
+    Parameters
+    ----------
+    nprocs : int, optional
+       number of worker processes, defaults to ``SISL_NUM_PROCS``.
+    **init :
+       additional arguments passed to the constructor of the
+       underlying ``multiprocess.Pool``.
+
+    Examples
+    --------
+    Use the same pool for several calculations, the Hamiltonian
+    will only be sent to the workers once.
+
+    >>> H = Hamiltonian(...)
+    >>> mp = MonkhorstPack(H, [10, 10, 10])
+    >>> with BrillouinZonePool(4) as pool:
+    ...     par = mp.apply.renew(pool=pool)
+    ...     eigs = par.array.eigh()
+    ...     DOS = par.average.eigenstate(wrap=lambda es: es.DOS(E))
+    """
+
+    def __init__(self, nprocs: Optional[int] = None, **init):
+        if not _has_pathos:
+            raise SislError(
+                f"{self.__class__.__name__} requires the package 'pathos' to be installed."
+            )
+        from pathos.helpers import mp as _mp
+
+        if nprocs is None:
+            nprocs = get_environ_variable("SISL_NUM_PROCS")
+        self._ncpus = max(1, int(nprocs))
+        self._pool = _mp.Pool(self._ncpus, **init)
+
+        # The currently shipped parent
+        self._token = None
+        fd, self._path = tempfile.mkstemp(prefix="sisl_bz_pool_", suffix=".pkl")
+        os.close(fd)
+
+        # Ensure the processes are shut down when this object is collected
+        self._finalizer = weakref.finalize(self, _cleanup_pool, self._pool, self._path)
+
+    def __str__(self):
+        return f"{self.__class__.__name__}{{ncpus: {self.ncpus}, open: {self.is_open}}}"
+
+    @property
+    def ncpus(self) -> int:
+        """Number of worker processes in the pool"""
+        return self._ncpus
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the pool can still be used for calculations"""
+        return self._finalizer.alive
+
+    def _check_open(self):
+        if not self.is_open:
+            raise SislError(f"{self.__class__.__name__} has been closed.")
+
+    def ship(self, parent) -> str:
+        """Ship `parent` to the workers (if it has changed since last time)
+
+        Parameters
+        ----------
+        parent : object
+           the object that will be made available in the worker processes
+
+        Returns
+        -------
+        str
+           the token identifying the version of `parent` in the worker processes
+        """
+        self._check_open()
+        blob = pickle.dumps(parent, protocol=pickle.HIGHEST_PROTOCOL)
+        token = hashlib.blake2b(blob, digest_size=16).hexdigest()
+        if token != self._token:
+            # write to a temporary file and atomically replace, workers
+            # currently reading the old version will still have a valid file
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=os.path.dirname(self._path), delete=False
+            ) as fh:
+                fh.write(blob)
+            os.replace(fh.name, self._path)
+            self._token = token
+        return token
+
+    def imap(
+        self,
+        method,
+        k,
+        w,
+        args=(),
+        kwargs=None,
+        wrap=None,
+        chunksize: int = 1,
+    ):
+        """Iterate `method` over all k-points, yielding the results in order
+
+        Parameters
+        ----------
+        method : callable
+           the method called for each k-point. If it is a bound method of
+           a picklable object, the object will be shipped to the workers once
+           (see `ship`), otherwise it will be shipped with each chunk.
+        k : array_like
+           the k-points passed to `method`
+        w : array_like
+           weights of the k-points (passed to `wrap`)
+        args : tuple, optional
+           positional arguments passed to `method`
+        kwargs : dict, optional
+           keyword arguments passed to `method`
+        wrap : callable, optional
+           post-processing of the return value of `method`, called as
+           ``wrap(v, parent=parent, k=k, weight=w)``
+        chunksize : int, optional
+           number of k-points evaluated in each task
+        """
+        self._check_open()
+        if kwargs is None:
+            kwargs = {}
+        if wrap is None:
+
+            def wrap(v, parent=None, k=None, weight=None):
+                return v
+
+        parent = getattr(method, "__self__", None)
+        token = path = None
+        name = getattr(method, "__name__", None)
+        if (
+            parent is not None
+            and name is not None
+            and getattr(parent, name, None) == method
+        ):
+            try:
+                token = self.ship(parent)
+                path = self._path
+                method = name
+            except Exception:
+                # fall back to ship the method with each chunk
+                token = None
+
+        chunksize = max(1, int(chunksize))
+        tasks = (
+            (
+                token,
+                path,
+                method,
+                args,
+                kwargs,
+                wrap,
+                k[i : i + chunksize],
+                w[i : i + chunksize],
+            )
+            for i in range(0, len(k), chunksize)
+        )
+        for chunk in self._pool.imap(_worker_apply, tasks):
+            yield from chunk
+
+    def close(self) -> None:
+        """Shut down the worker processes, the pool cannot be used afterwards"""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def _pool_procs(pool, size: int):
     """
     This is still a bit mysterious to me.
@@ -74,11 +311,11 @@ def _pool_procs(pool, size: int):
 
     This method is working via 3 different allowed argument types:
 
-    pool = int | bool
+    pool = int | bool | BrillouinZonePool
 
         in this case it just uses defaults.
 
-    pool = int | bool, {run}
+    pool = int | bool | BrillouinZonePool, {run}
 
         here the {run} is the arguments used for the mapping
         tool in the parallel region (i.e. `imap(..., **run)`
@@ -88,6 +325,8 @@ def _pool_procs(pool, size: int):
         here the {init} is the arguments used for the constructor
         of the ProcessPool (except ``nodes``).
         And {run} is equivalent to the before.
+
+    A `BrillouinZonePool` is persistent and will be re-used as is.
     """
     nprocs = get_environ_variable("SISL_NUM_PROCS")
     nchunk = get_environ_variable("SISL_PAR_CHUNKSIZE")
@@ -126,8 +365,11 @@ def _pool_procs(pool, size: int):
         import pathos
 
         pool = pathos.pools.ProcessPool(ncpus=pool, **init)
-    else:
 
+    elif isinstance(pool, BrillouinZonePool):
+        ncpus = pool.ncpus
+
+    else:
         ncpus = None
         try:
             ncpus = pool.ncpus
@@ -140,11 +382,12 @@ def _pool_procs(pool, size: int):
             except Exception:
                 pass
 
-        # we don't know
-        warn(
-            f"{__module__} could not determine number of CPUs from the pool, expecting 2"
-        )
-        ncpus = 2
+        if ncpus is None:
+            # we don't know
+            warn(
+                f"{__name__} could not determine number of CPUs from the pool, expecting 2"
+            )
+            ncpus = 2
 
     if "chunksize" not in run:
         if isinstance(nchunk, float):
@@ -154,6 +397,10 @@ def _pool_procs(pool, size: int):
             nchunk = size // tmp
         run["chunksize"] = nchunk
 
+    if isinstance(pool, BrillouinZonePool):
+        # persistent pools should not be restarted
+        return pool, run
+
     # Prepare the pool, just in case it has already been used.
     pool.terminate()
     pool.join()
@@ -161,6 +408,23 @@ def _pool_procs(pool, size: int):
     return pool, run
 
 
+def _pool_imap(pool, run, method, args, kwargs, wrap, parent, k, w):
+    """Iterate over results of `method` for all k-points in `pool` (ordered)"""
+    if isinstance(pool, BrillouinZonePool):
+        yield from pool.imap(method, k, w, args=args, kwargs=kwargs, wrap=wrap, **run)
+        return
+
+    pool.restart(True)
+
+    def func(k, w):
+        return wrap(method(*args, k=k, **kwargs), parent=parent, k=k, weight=w)
+
+    yield from pool.imap(func, k, w, **run)
+
+    pool.close()
+    pool.join()
+
+
 @set_module("sisl.physics")
 class BrillouinZoneApply(AbstractDispatch):
     # this dispatch function will do stuff on the BrillouinZone object
@@ -224,26 +488,21 @@ class IteratorApply(BrillouinZoneParentApply):
 
             @wraps(method)
             def func(*args, wrap=None, eta=None, **kwargs):
-                pool.restart(True)
                 bz, parent, wrap, eta = self._parse_kwargs(wrap, eta, eta_key=eta_key)
                 k = bz.k
                 w = bz.weight
 
-                def func(k, w):
-                    return wrap(
-                        method(*args, k=k, **kwargs), parent=parent, k=k, weight=w
-                    )
-
-                for ret in pool.imap(func, k, w, **pool_run):
-                    eta.update()
-                    yield ret
-
                 # TODO notify users that this may be bad when used with zip
                 # unless this generator is the first argument of zip
                 # zip has left-to-right checks of length and stops querying
                 # elements as soon as the left-most one stops.
-                pool.close()
-                pool.join()
+                # The pool will be closed when the iterator is exhausted.
+                for ret in _pool_imap(
+                    pool, pool_run, method, args, kwargs, wrap, parent, k, w
+                ):
+                    eta.update()
+                    yield ret
+
                 eta.close()
 
         return func
@@ -392,18 +651,14 @@ class NDArrayApply(BrillouinZoneParentApply):
 
             @wraps(method)
             def func(*args, wrap=None, eta=None, **kwargs):
-                pool.restart(True)
                 bz, parent, wrap, eta = self._parse_kwargs(wrap, eta, eta_key=eta_key)
                 k = bz.k
                 nk = len(k)
                 w = bz.weight
 
-                def func(k, w):
-                    return wrap(
-                        method(*args, k=k, **kwargs), parent=parent, k=k, weight=w
-                    )
-
-                it = pool.imap(func, k, w, **pool_run)
+                it = _pool_imap(
+                    pool, pool_run, method, args, kwargs, wrap, parent, k, w
+                )
                 v = next(it)
                 eta.update()
 
@@ -419,8 +674,6 @@ class NDArrayApply(BrillouinZoneParentApply):
                         a[i] = v
                         eta.update()
                 del v
-                pool.close()
-                pool.join()
                 eta.close()
                 return a
 
@@ -476,33 +729,134 @@ class AverageApply(BrillouinZoneParentApply):
 
             @wraps(method)
             def func(*args, wrap=None, eta=None, **kwargs):
-                pool.restart(True)
-
                 bz, parent, wrap, eta = self._parse_kwargs(wrap, eta, eta_key="average")
                 k = bz.k
                 w = bz.weight
 
-                def func(k, w):
-                    return w * _asoplist(
-                        wrap(method(*args, k=k, **kwargs), parent=parent, k=k, weight=w)
+                def wrap_avg(v, parent=None, k=None, weight=None):
+                    return weight * _asoplist(
+                        wrap(v, parent=parent, k=k, weight=weight)
                     )
 
-                iret = pool.imap(func, k, w, **pool_run)
+                iret = _pool_imap(
+                    pool, pool_run, method, args, kwargs, wrap_avg, parent, k, w
+                )
                 avg = next(iret)
                 eta.update()
                 for it in iret:
                     avg += it
                     eta.update()
 
-                pool.close()
-                pool.join()
-
                 eta.close()
                 return avg
 
         return func
 
 
+def _reduce_add(out, v, w, tmp=None):
+    """Add ``w * v`` to `out` (in-place when possible), returns the new `out` and a temporary buffer"""
+    if isinstance(out, tuple):
+        if tmp is None:
+            tmp = (None,) * len(out)
+        ret = tuple(_reduce_add(o, vi, w, t) for o, vi, t in zip(out, v, tmp))
+        return tuple(r[0] for r in ret), tuple(r[1] for r in ret)
+
+    if isinstance(out, np.ndarray):
+        if tmp is None:
+            tmp = np.empty_like(out)
+        # the returned value is not changed, it may be used elsewhere
+        np.multiply(v, w, out=tmp)
+        out += tmp
+        return out, tmp
+
+    # other objects, e.g. sparse matrices or oplist
+    out += _asoplist(v) * w
+    return out, tmp
+
+
+def _reduce_init(out, v, w):
+    """Initialize the reduction from the first value"""
+    if isinstance(v, tuple):
+        if out is None:
+            out = (None,) * len(v)
+        return tuple(_reduce_init(o, vi, w) for o, vi in zip(out, v))
+
+    if isinstance(v, np.ndarray):
+        if out is None:
+            out = np.empty_like(v, dtype=np.result_type(v, w))
+        np.multiply(v, w, out=out)
+        return out
+
+    if out is not None:
+        raise ValueError(
+            f"{__name__}.reduce can only use a preallocated out argument for numpy.ndarray values"
+        )
+    return _asoplist(v) * w
+
+
+@set_module("sisl.physics")
+class ReduceApply(BrillouinZoneParentApply):
+    def __str__(self, message="reduce"):
+        return super().__str__(message)
+
+    def dispatch(self, method):
+        """Dispatch the method by accumulating the weighted values in-place
+
+        The weighted values are added to a single output, no additional
+        arrays are retained per k-point.
+        The output may be preallocated by passing ``out=``.
+        Tuples of values (e.g. returned by `wrap`) are reduced separately.
+        """
+        pool, pool_run = _pool_procs(self._attrs.get("pool"), len(self._get_object()))
+
+        if pool is None:
+
+            @wraps(method)
+            def func(*args, wrap=None, eta=None, out=None, **kwargs):
+                bz, parent, wrap, eta = self._parse_kwargs(wrap, eta, eta_key="reduce")
+                k = bz.k
+                w = bz.weight
+                v = wrap(
+                    method(*args, k=k[0], **kwargs), parent=parent, k=k[0], weight=w[0]
+                )
+                out = _reduce_init(out, v, w[0])
+                del v
+                eta.update()
+                tmp = None
+                for i, ki in enumerate(k[1:], 1):
+                    v = wrap(
+                        method(*args, k=ki, **kwargs), parent=parent, k=ki, weight=w[i]
+                    )
+                    out, tmp = _reduce_add(out, v, w[i], tmp)
+                    del v
+                    eta.update()
+                eta.close()
+                return out
+
+        else:
+
+            @wraps(method)
+            def func(*args, wrap=None, eta=None, out=None, **kwargs):
+                bz, parent, wrap, eta = self._parse_kwargs(wrap, eta, eta_key="reduce")
+                k = bz.k
+                w = bz.weight
+
+                iret = _pool_imap(
+                    pool, pool_run, method, args, kwargs, wrap, parent, k, w
+                )
+                out = _reduce_init(out, next(iret), w[0])
+                eta.update()
+                tmp = None
+                for i, v in enumerate(iret, 1):
+                    out, tmp = _reduce_add(out, v, w[i], tmp)
+                    eta.update()
+
+                eta.close()
+                return out
+
+        return func
+
+
 @set_module("sisl.physics")
 class XArrayApply(NDArrayApply):
     def __str__(self, message="xarray"):
@@ -596,6 +950,7 @@ class XArrayApply(NDArrayApply):
 apply_dispatch = BrillouinZone.apply
 apply_dispatch.register("iter", IteratorApply, default=True)
 apply_dispatch.register("average", AverageApply)
+apply_dispatch.register("reduce", ReduceApply)
 apply_dispatch.register("sum", SumApply)
 apply_dispatch.register("array", NDArrayApply)
 apply_dispatch.register("ndarray", NDArrayApply)
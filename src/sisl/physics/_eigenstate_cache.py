@@ -0,0 +1,223 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+from __future__ import annotations
+
+"""Cache of eigenstates at k-points
+
+Diagonalizing the Hamiltonian is typically the expensive part of Brillouin
+zone analyses. When several analyses (DOS, PDOS, COOP, spin moments...) are
+performed on the same k-points the eigenstates may be re-used.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+import sisl._array as _a
+from sisl._help import LRUCache
+from sisl._internal import set_module
+from sisl.typing import GaugeType, KPoint
+
+from ._feature import comply_gauge
+
+__all__ = ["EigenstateCache"]
+
+
+def _to_python(value):
+    """Convert numpy scalars and arrays (also nested) to plain Python objects
+
+    This ensures that equal arguments hash equally (``repr(np.int64(0)) != repr(0)``)
+    and that they are JSON serializable.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _to_python(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(map(_to_python, value))
+    return value
+
+
+@set_module("sisl.physics")
+class EigenstateCache:
+    r"""Explicitly managed cache of eigenstates, in memory and (optionally) on disk
+
+    The eigenstates are keyed on the content of the matrix (the sparse elements,
+    the lattice, the atomic positions and the spin configuration), the k-point, the gauge and any
+    additional arguments passed to the eigenvalue solver (such as ``spin``).
+    Changing the matrix will thus invalidate the cached eigenstates.
+
+    The most recently used eigenstates are kept in memory. If `directory` is
+    specified, all calculated eigenstates are also stored in ``.npz`` files
+    in the directory, which are re-used by subsequent calculations (also
+    across sessions).
+
+    The cache is passed to `Hamiltonian.eigenstate` through the ``cache`` argument,
+    and may thus be used transparently in `BrillouinZone.apply` calls.
+
+    Parameters
+    ----------
+    maxsize :
+       maximum number of eigenstates kept in memory, the least recently used
+       eigenstates will be discarded first.
+    directory :
+       directory for storing the eigenstates on disk, if not specified
+       the eigenstates are only kept in memory.
+    maxdisk :
+       maximum number of eigenstates stored in `directory`, the least recently used
+       files will be deleted first. If not specified, the files are never deleted.
+
+    Examples
+    --------
+    Calculate the DOS and PDOS using the same eigenstates
+
+    >>> cache = EigenstateCache(directory="eigenstates")
+    >>> bz = MonkhorstPack(H, [10, 10, 1])
+    >>> DOS = bz.apply.average.eigenstate(cache=cache, wrap=lambda es: es.DOS(E))
+    >>> PDOS = bz.apply.average.eigenstate(cache=cache, wrap=lambda es: es.PDOS(E))
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 64,
+        directory: Optional[Union[str, Path]] = None,
+        maxdisk: Optional[int] = None,
+    ):
+        self._cache = LRUCache(maxsize)
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.maxdisk = maxdisk
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self, disk: bool = False) -> None:
+        """Remove all eigenstates from the memory cache
+
+        Parameters
+        ----------
+        disk :
+           also delete the eigenstates stored on disk
+        """
+        self._cache.clear()
+        if disk and self.directory is not None:
+            for f in self._files():
+                f.unlink(missing_ok=True)
+
+    @staticmethod
+    def _key(M, k: KPoint, gauge: GaugeType, kwargs: dict) -> str:
+        """Hash uniquely determining the eigenstates"""
+        h = hashlib.sha1()
+        h.update(M.__class__.__name__.encode())
+        csr = M._csr
+        # only the used elements (the sparse pattern may have holes)
+        idx = _a.array_arangei(csr.ptr[:-1], n=csr.ncol)
+        for arr in (
+            csr.ncol,
+            csr.col[idx],
+            np.ascontiguousarray(csr._D[idx]),
+            M.lattice.cell,
+            M.nsc,
+            # the phases of non-cell gauges depend on the positions
+            M.geometry.xyz,
+            M.geometry.orbitals,
+        ):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        h.update(
+            repr(
+                (
+                    csr.shape,
+                    str(csr.dtype),
+                    M.orthogonal,
+                    str(getattr(M, "spin", None)),
+                    _a.asarrayd(k).ravel().tolist(),
+                    gauge,
+                    sorted((key, repr(_to_python(val))) for key, val in kwargs.items()),
+                )
+            ).encode()
+        )
+        return h.hexdigest()
+
+    def _files(self):
+        return list(self.directory.glob("eigenstate-*.npz"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"eigenstate-{key}.npz"
+
+    def _read(self, key: str):
+        """Read eigenstate data from disk, or None if not stored"""
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path) as f:
+                data = (f["state"], f["c"], json.loads(str(f["info"])))
+        except (OSError, KeyError, ValueError):
+            return None
+        # mark as recently used
+        os.utime(path)
+        return data
+
+    def _write(self, key: str, data) -> None:
+        """Store eigenstate data on disk, and remove the least recently used files"""
+        if self.directory is None:
+            return
+        state, c, info = data
+        path = self._path(key)
+        # write to a temporary file, and move it to ensure complete files
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, state=state, c=c, info=json.dumps(info))
+        tmp.replace(path)
+
+        if self.maxdisk is not None:
+            files = self._files()
+            if len(files) > self.maxdisk:
+                files.sort(key=lambda f: f.stat().st_mtime)
+                for f in files[: len(files) - self.maxdisk]:
+                    f.unlink(missing_ok=True)
+
+    def eigenstate(self, M, k: KPoint = (0, 0, 0), gauge: GaugeType = "cell", **kwargs):
+        """Return the eigenstates of `M` at `k`, either from the cache, or calculated
+
+        Parameters
+        ----------
+        M : Hamiltonian
+           the matrix for which the eigenstates are calculated
+        k :
+           the k-point at which to evaluate the eigenstates at
+        gauge :
+           the gauge used for calculating the eigenstates
+        **kwargs :
+           passed directly to ``M.eigenstate``
+
+        Returns
+        -------
+        EigenstateElectron
+            the eigenstates (a copy of the cached data, it may be changed freely)
+        """
+        from .electron import EigenstateElectron
+
+        gauge = comply_gauge(gauge)
+        key = self._key(M, k, gauge, kwargs)
+
+        data = self._cache.get(key)
+        if data is None:
+            data = self._read(key)
+            if data is None:
+                es = M.eigenstate(k, gauge, **kwargs)
+                info = _to_python(dict(es.info))
+                info["k"] = _a.asarrayd(info["k"]).tolist()
+                data = (es.state.copy(), es.c.copy(), info)
+                self._write(key, data)
+            self._cache[key] = data
+
+        state, c, info = data
+        return EigenstateElectron(state.copy(), c.copy(), M, **info)
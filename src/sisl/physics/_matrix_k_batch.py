@@ -0,0 +1,160 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+from __future__ import annotations
+
+"""Batched evaluation of sparse matrices at many k-points
+
+Instead of walking the sparse pattern once per k-point, the pattern is
+folded into the unit-cell once, and all k-points are evaluated in a single
+(sparse) matrix product.
+"""
+
+import numpy as np
+from numpy import pi
+from scipy.sparse import csr_matrix
+
+import sisl._array as _a
+
+from ._feature import comply_gauge
+from ._phase import phase_dtype
+
+__all__ = ["matrix_k_batch"]
+
+
+def _batch_dtype(ks, M_dtype, dtype):
+    """Determine the resulting data-type for all k-points"""
+    dtypes = {phase_dtype(k, M_dtype, dtype) for k in ks}
+    if len(dtypes) == 1:
+        return dtypes.pop()
+    return np.result_type(*dtypes)
+
+
+def _fold_pattern(csr, no: int):
+    """Fold the sparse pattern of `csr` into the unit-cell
+
+    Returns
+    -------
+    idx :
+        indices of the non-zero elements in the data array of `csr`
+    isc :
+        supercell index of each non-zero element
+    upair :
+        the (sorted) unique unit-cell linear indices ``row * no + col``
+    inv :
+        for each non-zero element, the index into `upair`
+    """
+    ptr = csr.ptr
+    ncol = csr.ncol
+    idx = _a.array_arangel(ptr[:-1], n=ncol)
+    rows = np.repeat(_a.arangel(csr.shape[0]), ncol)
+    isc, cols = np.divmod(csr.col[idx], no)
+    upair, inv = np.unique(rows * no + cols, return_inverse=True)
+    return idx, isc, upair, inv.ravel()
+
+
+def matrix_k_batch(gauge, M, idx: int, sc, ks, dtype, format, out=None):
+    """Calculate the matrix at all k-points in `ks` in one pass over the sparse pattern
+
+    Parameters
+    ----------
+    gauge : {"cell", "atom"}
+        the gauge used for the phases
+    M : SparseOrbital
+        the sparse matrix
+    idx : int
+        the component of the sparse matrix to calculate
+    sc : Lattice
+        lattice with supercell offsets
+    ks : array_like
+        k-points, shape ``(nk, 3)``
+    dtype : numpy.dtype
+        data-type of the returned matrices
+    format : {"array", "dense", "matrix", "csr", ...}
+        for the dense formats a 3D array is returned, otherwise a list
+        of sparse matrices
+    out : numpy.ndarray, optional
+        preallocated output array of shape ``(nk, no, no)`` (only for dense formats)
+    """
+    ks = _a.asarrayd(ks).reshape(-1, 3)
+    nk = len(ks)
+    dtype = _batch_dtype(ks, M.dtype, dtype)
+    gauge = comply_gauge(gauge)
+
+    # Check that the dimension *works*
+    if idx < 0:
+        idx += M.shape[-1]
+    if idx < 0 or M.shape[-1] <= idx:
+        d = M.shape[-1]
+        raise ValueError(
+            f"matrix_k_batch: unknown index specification {idx} must be in 0:{d}"
+        )
+
+    if format.startswith("sc"):
+        raise ValueError(
+            "matrix_k_batch: does not support supercell formats, please use the per k-point methods."
+        )
+
+    if gauge == "atom":
+        M.finalize()
+
+    csr = M._csr
+    no = M.shape[0]
+    D = csr._D
+
+    if gauge == "cell":
+        i_nz, isc, upair, inv = _fold_pattern(csr, no)
+        n_s = sc.sc_off.shape[0]
+        # matrix of (supercell index, unit-cell element), duplicates are summed
+        MR = csr_matrix((D[i_nz, idx], (inv, isc)), shape=(len(upair), n_s))
+        # phases for all k-points (nk, n_s)
+        phases = np.exp((2j * pi) * ks @ sc.sc_off.T)
+        if not np.iscomplexobj(np.empty(0, dtype=dtype)):
+            # only possible at the Gamma-point
+            phases = phases.real
+        # (npairs, nk)
+        values = MR @ phases.T.astype(dtype, copy=False)
+
+    elif gauge == "atom":
+        i_nz, isc, upair, inv = _fold_pattern(csr, no)
+        rij = M.Rij()._csr._D[i_nz]
+        # phases for all k-points (nk, nnz)
+        phases = np.exp(1j * (ks @ sc.rcell) @ rij.T)
+        if not np.iscomplexobj(np.empty(0, dtype=dtype)):
+            phases = phases.real
+        phases = phases.astype(dtype, copy=False) * D[i_nz, idx]
+        # reduce the elements into the unit-cell pairs (npairs, nnz)
+        R = csr_matrix(
+            (np.ones(len(inv), dtype=dtype), (inv, _a.arangel(len(inv)))),
+            shape=(len(upair), len(inv)),
+        )
+        values = R @ phases.T
+
+    else:
+        raise ValueError("matrix_k_batch: gauge must be in [cell, atom]")
+
+    values = values.astype(dtype, copy=False)
+
+    if format in ("array", "matrix", "dense"):
+        if out is None:
+            out = np.zeros([nk, no, no], dtype=dtype)
+        else:
+            if out.shape != (nk, no, no) or not out.flags.c_contiguous:
+                raise ValueError(
+                    f"matrix_k_batch: out argument must be a C-contiguous array with shape {(nk, no, no)}"
+                )
+            out.fill(0)
+        out.reshape(nk, no * no)[:, upair] = values.T
+        return out
+
+    if out is not None:
+        raise ValueError("matrix_k_batch: out argument only works for dense formats")
+
+    # the unique pairs are sorted, hence they are already in CSR order
+    rows, cols = np.divmod(upair, no)
+    indptr = _a.zerosl(no + 1)
+    np.cumsum(np.bincount(rows, minlength=no), out=indptr[1:])
+    return [
+        csr_matrix((values[:, ik], cols, indptr), shape=(no, no)).asformat(format)
+        for ik in range(nk)
+    ]
@@ -0,0 +1,127 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+from __future__ import annotations
+
+"""Cache of orbital values on real-space grids
+
+Evaluating the basis orbitals on a grid is the expensive part of projecting
+wavefunctions and densities. The values only depend on the geometry, the grid
+and the basis, and may thus be re-used for many projections.
+"""
+from typing import TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+
+from sisl._core.geometry import Geometry
+from sisl._core.grid import Grid
+from sisl._help import LRUCache
+from sisl._internal import set_module
+
+if TYPE_CHECKING:
+    from sisl._sparse_grid import SparseGridOrbitalBZ
+
+__all__ = ["OrbitalValuesCache"]
+
+
+@set_module("sisl.physics")
+class OrbitalValuesCache:
+    r"""Explicitly managed cache of orbital values on real-space grids
+
+    The basis orbitals of a geometry are evaluated on all grid points
+    (including contributions from periodic images) and stored in a sparse
+    table (see `Geometry._orbital_values`). The tables are keyed on the geometry
+    (lattice and coordinates), the grid shape and the basis, such that projecting
+    many states on the same grid only evaluates the orbitals once.
+
+    The grids used together with the cache must have the same lattice as the
+    geometry.
+
+    Parameters
+    ----------
+    maxsize :
+       maximum number of orbital value tables stored, the least recently used
+       table will be discarded first.
+
+    Examples
+    --------
+    Project many eigenstates on the same grid, the orbitals are only evaluated once.
+
+    >>> cache = OrbitalValuesCache()
+    >>> for state in H.eigenstate():
+    ...     grid = Grid(0.1, geometry=H.geometry)
+    ...     state.wavefunction(grid, cache=cache)
+
+    The same cache may also be used for densities
+
+    >>> DM.density(grid, method="pre-compute", cache=cache)
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self._cache = LRUCache(maxsize)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        """Remove all orbital value tables from the cache"""
+        self._cache.clear()
+
+    @staticmethod
+    def _key(geometry: Geometry, shape: Tuple[int, int, int]):
+        """Key uniquely determining the orbital values"""
+        lattice = geometry.lattice
+        atoms = geometry.atoms
+        return (
+            tuple(int(s) for s in shape),
+            lattice.cell.tobytes(),
+            lattice.origin.tobytes(),
+            tuple(lattice.pbc.tolist()),
+            geometry.xyz.tobytes(),
+            atoms.species.tobytes(),
+            tuple((atom.Z, atom.tag, atom.no) for atom in atoms.atom),
+        )
+
+    @staticmethod
+    def _same_basis(atoms, other) -> bool:
+        """Whether the basis orbitals of `atoms` and `other` are the same"""
+        return all(a.equal(b, psi=True) for a, b in zip(atoms.atom, other.atom))
+
+    def get(
+        self, geometry: Geometry, grid: Union[Grid, Tuple[int, int, int]]
+    ) -> SparseGridOrbitalBZ:
+        """Retrieve the orbital values of `geometry` on `grid`, calculate them if not stored
+
+        Parameters
+        ----------
+        geometry :
+           the geometry containing the basis orbitals
+        grid :
+           the grid (or its shape) on which the orbitals are evaluated.
+           If a `Grid` it must have the same lattice as `geometry`.
+
+        Raises
+        ------
+        ValueError
+           if the lattice of `grid` is not the same as that of `geometry`
+        """
+        if isinstance(grid, Grid):
+            if not (
+                np.allclose(grid.cell, geometry.cell)
+                and np.allclose(grid.origin, geometry.lattice.origin)
+            ):
+                raise ValueError(
+                    f"{self.__class__.__name__}.get requires the grid to have the same lattice as the geometry."
+                )
+            shape = grid.shape
+        else:
+            shape = grid
+
+        key = self._key(geometry, shape)
+        values = self._cache.get(key)
+        if values is None or not self._same_basis(
+            geometry.atoms, values.geometry.atoms
+        ):
+            values = geometry._orbital_values(shape)
+            self._cache[key] = values
+        return values
@@ -9,6 +9,8 @@ r"""Bloch's theorem
 Bloch's theorem is a very powerful proceduce that enables one to utilize
 the periodicity of a given direction to describe the complete system.
 """
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence
 
 import numpy as np
@@ -65,6 +67,11 @@ class Bloch:
     >>> k_unfold = bloch.unfold_points([0] * 3)
     >>> M = [func(*args, k=k) for k in k_unfold]
     >>> bloch.unfold(M, k_unfold)
+
+    For large unfoldings the stack of matrices may be too big, instead the
+    contributions can be added one k-point at a time
+
+    >>> bloch.unfold_stream(func, [0] * 3, *args)
     """
 
     def __init__(self, *bloch):
@@ -190,3 +197,109 @@ class Bloch:
         if isinstance(M, (list, tuple)):
             M = np.stack(M)
         return bloch_unfold(self._bloch, k_unfold, M)
+
+    def unfold_stream(self, func, k: KPoint, *args, nthreads: int = 1, **kwargs):
+        """Return the Bloch unfolded matrix of `func` by adding each unfolding point as it is calculated
+
+        Equivalent to calling the `Bloch` object, but the matrices at the unfolding
+        points are never stored together. Each matrix is added to the blocks
+        of the unfolded matrix as soon as it has been calculated.
+        The extra memory is thus at most ``nthreads + 2`` matrices of the folded size
+        (instead of ``len(self)`` matrices on top of the unfolded matrix).
+
+        Parameters
+        ----------
+        func : callable
+           method called which returns a matrix, it *must* have a keyword argument ``k``.
+        k : (3, ) of float
+           k-point to be unfolded
+        *args : list
+           arguments passed directly to `func`
+        nthreads :
+           number of threads used to evaluate `func` at the unfolding points.
+           At most `nthreads` + 1 folded matrices are kept in memory while
+           the unfolded matrix is accumulated. `func` must be thread-safe.
+        **kwargs : dict
+           keyword arguments passed directly to `func`
+
+        Returns
+        -------
+        numpy.ndarray
+            unfolded Bloch matrix
+        """
+        K_unfold = self.unfold_points(k)
+
+        def calc(k):
+            return func(*args, k=k, **kwargs)
+
+        if len(K_unfold) == 1:
+            return calc(K_unfold[0])
+
+        # The unfolded matrix is block Toeplitz, block (J, I) only depends on
+        # the block displacement J - I. Hence the phase factor only has to be
+        # applied once per displacement, and then added to all its blocks.
+        disp, iblock = self._displacements()
+        N = len(K_unfold)
+        blocks = [np.argwhere(iblock == d) for d in range(len(disp))]
+
+        M = None
+        ms = _ordered_map(calc, K_unfold, nthreads)
+        for k_unfold in K_unfold:
+            # the previous matrix is released before the next is calculated
+            m = np.asarray(next(ms))
+            if M is None:
+                n1, n2 = m.shape
+                M = zeros([N, n1, N, n2], dtype=dtype_real_to_complex(m.dtype))
+                tmp = empty(m.shape, dtype=M.dtype)
+            # block displacement d gets: exp(2 pi i d . k) / N
+            ph = (exp((2j * np.pi) * (disp @ k_unfold)) / N).astype(M.dtype)
+            for d, JI in enumerate(blocks):
+                multiply(m, ph[d], out=tmp)
+                for J, I in JI:
+                    add(M[J, :, I], tmp, out=M[J, :, I])
+            del m
+        ms.close()
+        del tmp
+
+        return M.reshape(N * n1, N * n2)
+
+    def _displacements(self):
+        """Block displacements of the unfolded matrix, and the displacement index of each block (J, I)"""
+        B = self._bloch
+        # block indices along each lattice vector, same order as `unfold_points`
+        idx = np.stack(
+            np.meshgrid(
+                _a.arangei(B[2]), _a.arangei(B[1]), _a.arangei(B[0]), indexing="ij"
+            )[::-1],
+            axis=-1,
+        ).reshape(-1, 3)
+        # all displacements, first direction running fastest
+        nd = 2 * B - 1
+        disp = np.stack(
+            np.meshgrid(
+                _a.arangei(-B[2] + 1, B[2]),
+                _a.arangei(-B[1] + 1, B[1]),
+                _a.arangei(-B[0] + 1, B[0]),
+                indexing="ij",
+            )[::-1],
+            axis=-1,
+        ).reshape(-1, 3)
+        d = idx.reshape(-1, 1, 3) - idx.reshape(1, -1, 3) + B - 1
+        iblock = (d[..., 2] * nd[1] + d[..., 1]) * nd[0] + d[..., 0]
+        return disp, iblock
+
+
+def _ordered_map(func, iterable, nthreads: int = 1):
+    """Yield ``func(item)`` for all items, in order, with at most `nthreads` concurrent calls"""
+    if nthreads <= 1:
+        yield from map(func, iterable)
+        return
+
+    with ThreadPoolExecutor(nthreads) as pool:
+        futures = deque()
+        for item in iterable:
+            futures.append(pool.submit(func, item))
+            if len(futures) > nthreads:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
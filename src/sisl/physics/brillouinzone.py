@@ -129,6 +129,26 @@ The ``Pool`` should implement some standard methods that are
 existing in the ``pathos`` enviroment such as ``Pool.restart`` and ``Pool.terminate``
 and ``imap`` and ``uimap`` methods. See the ``pathos`` documentation for details.
 
+Creating a new pool of processes for each call can be costly, and the parent
+object is serialized for each k-point. For repeated calculations one may
+instead use a persistent `BrillouinZonePool` which keeps the worker processes
+alive and only ships the parent object to the workers when it has changed:
+
+>>> H = Hamiltonian(...)
+>>> mp = MonkhorstPack(H, [10, 10, 10])
+>>> with BrillouinZonePool(4) as pool:
+...     par = mp.apply.renew(pool=pool)
+...     eigs = par.array.eigh()
+...     DOS = par.average.eigenstate(wrap=lambda es: es.DOS(E))
+
+For eigenvalue calculations one may avoid processes altogether, the matrices
+for many k-points can be setup at once and solved using a pool of threads:
+
+>>> eigs = H.eigh_batch(mp.k)
+
+The number of BLAS threads used per eigenvalue problem is limited to avoid
+oversubscription (requires ``threadpoolctl``).
+
 Finally, the performance of the parallel pools are generally very dependent
 on the chunksize of the jobs. By default the chunksize is controlled by
 ``SISL_PAR_CHUNKSIZE``, and playing with this can heavily impact performance.
@@ -137,6 +157,7 @@ on the chunksize of the jobs. By default the chunksize is controlled by
    BrillouinZone
    MonkhorstPack
    BandStructure
+   BrillouinZonePool
 
 """
 from __future__ import annotations
@@ -187,6 +208,8 @@ class BrillouinZoneDispatcher(ClassDispatcher):
 
     - ``apply.iter``, the default iterator module
     - ``apply.average`` reduced result by averaging (using `BrillouinZone.weight` as the weight per k-point.
+    - ``apply.reduce`` same as ``apply.average``, but the values are accumulated in-place
+      into a single (possibly preallocated, ``out=``) output
     - ``apply.sum`` reduced result without weighing
     - ``apply.array`` return a single array with all values; has `len` equal to number of k-points
     - ``apply.none``, specialized method that is mainly useful when wrapping methods
@@ -3,9 +3,11 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+import itertools
 import math as m
+from concurrent.futures import ThreadPoolExecutor
 from numbers import Integral
-from typing import Literal, Optional
+from typing import Literal, Optional, Sequence, Union
 
 import numpy as np
 from numpy import add, dot, logical_and, repeat, subtract, unique
@@ -21,9 +23,12 @@ from sisl._core.sparse_geometry import SparseAtom, SparseOrbital
 from sisl._indices import indices_fabs_le, indices_le
 from sisl._internal import set_module
 from sisl._math_small import xyz_to_spherical_cos_phi
+from sisl.linalg.base import _available_cpus
 from sisl.messages import deprecate_argument, progressbar, warn
 from sisl.typing import AtomsIndex, GaugeType, SeqFloat
+from sisl.utils.mathematics import fnorm
 
+from ._orbital_values import OrbitalValuesCache
 from .sparse import SparseOrbitalBZSpin
 from .spin import Spin
 
@@ -694,7 +699,7 @@ class _densitymatrix(SparseOrbitalBZSpin):
         spinor=None,
         atol: float = 1e-7,
         eta: Optional[bool] = False,
-        method: Literal["pre-compute", "direct"] = "direct",
+        method: Literal["pre-compute", "direct", "tiled"] = "direct",
         **kwargs,
     ):
         r"""Expand the density matrix to the charge density on a grid
@@ -739,7 +744,11 @@ class _densitymatrix(SparseOrbitalBZSpin):
            It determines if the orbital values are computed on the fly (direct) or they are all pre-computed
            on the grid at the beginning(pre-compute).
            Pre computing orbitals results in a faster computation, but it requires more memory.
-           Currently pre-computing has a bug that results in out-of-bounds, it will be fixed.
+           The pre-computed orbital values may be re-used between calls by passing
+           an `OrbitalValuesCache` as ``cache``.
+           The tiled method splits the grid into blocks which are calculated independently
+           (possibly in parallel), see `_density_tiled` for the accepted `kwargs`
+           (``nthreads`` and ``block``).
 
         Notes
         -----
@@ -815,16 +824,8 @@ class _densitymatrix(SparseOrbitalBZSpin):
             csrDM = csr.tocsr(dim=0)
 
         if method == "pre-compute":
-            raise NotImplementedError(
-                "Currently a memory bug is happening, cannot be used until fixed, use the direct method"
-            )
             try:
-                # Compute orbital values on the grid
-                psi_values = uc_dm.geometry._orbital_values(grid.shape)
-
-                psi_values.reduce_orbital_products(
-                    csrDM, uc_dm.lattice, out=grid.grid, **kwargs
-                )
+                uc_dm._density_precompute(grid, csrDM, atol=atol, **kwargs)
             except MemoryError:
                 raise MemoryError(
                     "Ran out of memory while computing the density with the 'pre-compute'"
@@ -833,6 +834,275 @@ class _densitymatrix(SparseOrbitalBZSpin):
                 )
         elif method == "direct":
             self._density_direct(grid, csrDM, atol=atol, eta=eta)
+        elif method == "tiled":
+            uc_dm._density_tiled(grid, csrDM, atol=atol, eta=eta, **kwargs)
+        else:
+            raise ValueError(
+                f"{self.__class__.__name__}.density got unknown method {method!r}, "
+                "must be one of [pre-compute, direct, tiled]"
+            )
+
+    def _density_precompute(
+        self,
+        grid: Grid,
+        csrDM,
+        atol: float = 1e-7,
+        cache: Optional[OrbitalValuesCache] = None,
+    ):
+        r"""Compute the density from orbital values pre-computed on the grid
+
+        The orbital values :math:`\phi_I(\mathbf r)` for all orbitals (including periodic images)
+        are evaluated on the grid (or retrieved from `cache`) and the density is calculated as
+
+        .. math::
+            \rho(\mathbf r) = \sum_{IJ} \phi_I(\mathbf r) \mathbf D_{IJ} \phi_J(\mathbf r)
+
+        where the density matrix is expanded to all pairs of orbital images.
+
+        Parameters
+        ----------
+        grid : Grid
+           the grid on which to add the density (the density is in ``e/Ang^3``).
+           It must have the same lattice as the geometry.
+        csrDM : scipy.sparse.csr_matrix
+           the density matrix (with the spinor already reduced)
+        atol : float, optional
+           DM tolerance for accepted values. For all density matrix elements with absolute values below
+           the tolerance, they will be treated as strictly zeros.
+        cache : OrbitalValuesCache, optional
+           re-use the orbital values stored in this cache (they will be calculated and stored
+           if not present).
+        """
+        if cache is None:
+            cache = OrbitalValuesCache(maxsize=1)
+        geometry = self.geometry
+        values = cache.get(geometry, grid)
+        psi = values._csr.tocsr()
+
+        # Expand the density matrix to all pairs of orbitals in the
+        # auxiliary supercell of the orbital values
+        no = geometry.no
+        lattice = values.geometry.lattice
+        DM = csr_matrix(csrDM).tocoo()
+        idx = (np.fabs(DM.data) > atol).nonzero()[0]
+        i_s, col = np.divmod(DM.col[idx], no)
+        row = DM.row[idx]
+        data = DM.data[idx]
+        # supercell offsets of all the orbital images (n_s, nnz, 3)
+        isc = lattice.sc_off.reshape(-1, 1, 3) + geometry.sc_off[i_s].reshape(1, -1, 3)
+        I_s, nz = (np.fabs(isc) <= lattice.nsc // 2).all(2).nonzero()
+        J_s = lattice.isc_off[tuple(isc[I_s, nz].T)]
+        D = csr_matrix(
+            (data[nz], (I_s * no + row[nz], J_s * no + col[nz])),
+            shape=(psi.shape[1], psi.shape[1]),
+        )
+
+        rho = _a.asarrayd((psi @ D.T).multiply(psi).sum(1))
+        grid.grid += rho.reshape(grid.shape)
+
+    def _density_tiled(
+        self,
+        grid: Grid,
+        csrDM,
+        atol: float = 1e-7,
+        eta: Optional[bool] = None,
+        nthreads: Optional[int] = None,
+        block: Union[int, Sequence[int]] = 16,
+    ):
+        r"""Compute the density by splitting the grid into independent blocks
+
+        For each block of grid points all atoms (including periodic images) overlapping
+        the block are found. The spherical coordinates of the block points are calculated
+        once per atom, and all orbitals on the atom are evaluated from these.
+        The density of the block is then calculated as
+
+        .. math::
+            \rho(\mathbf r) = \sum_i \phi_i(\mathbf r) \sum_j \mathbf D_{ij} \phi_j(\mathbf r)
+
+        using a sparse matrix product of the reduced density matrix and the orbital values.
+
+        Blocks are disjoint and hence they can be calculated concurrently without any
+        synchronization. Each block is calculated in a separate buffer and subsequently
+        added to the grid.
+
+        Parameters
+        ----------
+        grid : Grid
+           the grid on which to add the density (the density is in ``e/Ang^3``)
+        csrDM : scipy.sparse.csr_matrix
+           the density matrix (with the spinor already reduced)
+        atol : float, optional
+           DM tolerance for accepted values. For all density matrix elements with absolute values below
+           the tolerance, they will be treated as strictly zeros.
+        eta : bool, optional
+           show a progressbar on stdout
+        nthreads : int, optional
+           number of threads used to calculate the blocks, defaults to the number
+           of available CPUs.
+        block : int or (3,) of int, optional
+           number of grid points along each lattice vector in a block
+        """
+        geometry = self.geometry
+        no = geometry.no
+
+        # Extract sub variables used throughout the loop
+        shape = _a.asarrayi(grid.shape)
+        dcell = grid.dcell
+        origin = grid.origin
+
+        csrDM = csr_matrix(csrDM)
+        csrDM.data = np.where(np.fabs(csrDM.data) > atol, csrDM.data, 0.0)
+        csrDM.eliminate_zeros()
+        csrDM.sort_indices()
+        indptr = csrDM.indptr
+        indices = csrDM.indices
+        data = csrDM.data
+
+        lattice = grid.lattice.copy()
+        # Find the periodic directions
+        pbc = [
+            bc == BC.PERIODIC or geometry.nsc[i] > 1
+            for i, bc in enumerate(grid.lattice.boundary_condition[:, 0])
+        ]
+        if grid.geometry is None:
+            # Create the actual geometry that encompass the grid
+            ia, xyz, _ = geometry.within_inf(lattice, periodic=pbc)
+            if len(ia) > 0:
+                grid.set_geometry(Geometry(xyz, geometry.atoms[ia], lattice=lattice))
+
+        # Retrieve all atoms that may overlap with the grid (see _density_direct)
+        add_R = _a.fulld(3, geometry.maxR())
+        o = lattice.to.Cuboid(orthogonal=True)
+        lattice = Lattice(o._v + np.diag(2 * add_R), origin=o.origin - add_R)
+        IA, XYZ, _ = geometry.within_inf(lattice, periodic=pbc)
+        # The returned supercell indices are relative to the atoms *wrapped*
+        # into the unit cell, we need them relative to the actual coordinates
+        # to be able to look up the density matrix connections.
+        ISC = np.rint((XYZ - geometry.xyz[IA]) @ geometry.icell.T).astype(np.int32)
+
+        # Remove atoms without any orbital extent
+        R_IA = geometry.atoms.maxR(all=True)[IA]
+        if np.any(R_IA <= 0.0):
+            for atom in geometry.atoms[np.unique(IA[R_IA <= 0.0])].atom:
+                warn(f"Atom '{atom}' does not have a wave-function, skipping atom.")
+            idx = (R_IA > 0.0).nonzero()[0]
+            IA, XYZ, ISC, R_IA = IA[idx], XYZ[idx], ISC[idx], R_IA[idx]
+
+        # Atoms are looked up through a linear index of (atom, supercell index)
+        isc_min = ISC.min(0) if len(ISC) > 0 else _a.zerosi(3)
+        isc_dims = (ISC.max(0) - isc_min + 1) if len(ISC) > 0 else _a.onesi(3)
+        key_dims = (geometry.na, *isc_dims)
+
+        def image_key(ia, isc):
+            return np.ravel_multi_index((ia, *(isc - isc_min).T), key_dims)
+
+        firsto = geometry.firsto
+        orbs_no = geometry.orbitals
+        o2a = geometry.o2a(_a.arangei(no))
+        sc_off = geometry.sc_off
+        atoms = geometry.atoms
+
+        # Create the list of blocks
+        block = np.broadcast_to(_a.asarrayi(block), 3)
+        blocks = list(
+            itertools.product(
+                *(
+                    [(i, min(i + b, n)) for i in range(0, n, b)]
+                    for n, b in zip(shape, block)
+                )
+            )
+        )
+
+        def calc_block(ranges):
+            """Calculate the density for a single block of grid points"""
+            idx = np.stack(
+                np.meshgrid(*(_a.arangei(*r) for r in ranges), indexing="ij"), axis=-1
+            ).reshape(-1, 3)
+            xyz = idx @ dcell + origin
+            center = xyz.mean(0)
+            radius = fnorm(xyz - center).max()
+
+            # Atoms overlapping with this block
+            img = (fnorm(XYZ - center) <= radius + R_IA).nonzero()[0]
+            if len(img) == 0:
+                return None
+
+            img_no = orbs_no[IA[img]]
+            img_off = _a.zerosl(len(img) + 1)
+            np.cumsum(img_no, out=img_off[1:])
+            n = img_off[-1]
+
+            # Calculate all orbital values in the block
+            psi = np.zeros([n, len(xyz)], dtype=np.float64)
+            for i, (ia, ia_xyz, R) in enumerate(zip(IA[img], XYZ[img], R_IA[img])):
+                rxyz = xyz - ia_xyz
+                ipts = indices_le((rxyz**2).sum(1), R**2)
+                if len(ipts) == 0:
+                    continue
+                rx = rxyz[ipts, 0].copy()
+                ry = rxyz[ipts, 1].copy()
+                rz = rxyz[ipts, 2].copy()
+                xyz_to_spherical_cos_phi(rx, ry, rz)
+                io = img_off[i]
+                for orb in atoms[ia].orbitals:
+                    if R - orb.R < 1e-6:
+                        psi[io, ipts] = orb.psi_spher(rx, ry, rz, cos_phi=True)
+                    else:
+                        ix = indices_le(rx, orb.R)
+                        psi[io, ipts[ix]] = orb.psi_spher(
+                            rx[ix], ry[ix], rz[ix], cos_phi=True
+                        )
+                    io += 1
+
+            # Extract the density matrix elements connecting the orbitals in the block
+            rows = _a.array_arangel(firsto[IA[img]], n=img_no)
+            ncol = indptr[rows + 1] - indptr[rows]
+            nz = _a.array_arangel(indptr[rows], n=ncol)
+            M_row = np.repeat(_a.arangel(n), ncol)
+            i_s, jo = np.divmod(indices[nz], no)
+            ja = o2a[jo]
+            isc = ISC[img][np.repeat(np.repeat(_a.arangel(len(img)), img_no), ncol)]
+            isc += sc_off[i_s]
+
+            # Only keep connections to atoms overlapping the block
+            keys = image_key(IA[img], ISC[img])
+            sort = np.argsort(keys)
+            keys = keys[sort]
+            valid = np.logical_and(isc >= isc_min, isc < isc_min + isc_dims).all(1)
+            j_key = np.full(len(nz), -1, dtype=np.int64)
+            j_key[valid] = image_key(ja[valid], isc[valid])
+            pos = np.searchsorted(keys, j_key).clip(max=len(keys) - 1)
+            valid = (keys[pos] == j_key).nonzero()[0]
+            M_col = img_off[sort[pos[valid]]] + jo[valid] - firsto[ja[valid]]
+            M = csr_matrix((data[nz[valid]], (M_row[valid], M_col)), shape=(n, n))
+
+            rho = (psi * (M @ psi)).sum(0)
+            return rho.reshape([r[1] - r[0] for r in ranges])
+
+        # Retrieve progressbar
+        eta = progressbar(
+            len(blocks), f"{self.__class__.__name__}.density", "block", eta
+        )
+
+        if nthreads is None:
+            nthreads = _available_cpus()
+        nthreads = max(1, min(int(nthreads), len(blocks)))
+
+        if nthreads == 1:
+            results = map(calc_block, blocks)
+        else:
+            pool = ThreadPoolExecutor(nthreads)
+            results = pool.map(calc_block, blocks)
+
+        try:
+            for ranges, rho in zip(blocks, results):
+                if rho is not None:
+                    grid.grid[tuple(slice(*r) for r in ranges)] += rho
+                eta.update()
+        finally:
+            if nthreads > 1:
+                pool.shutdown()
+        eta.close()
 
     def _density_direct(
         self, grid: Grid, csrDM, atol: float = 1e-7, eta: Optional[bool] = None
@@ -1242,6 +1512,7 @@ class DensityMatrix(_densitymatrix):
     def _reset(self):
         super()._reset()
         self.Dk = self.Pk
+        self.Dk_batch = self.Pk_batch
         self.dDk = self.dPk
         self.ddDk = self.ddPk
 
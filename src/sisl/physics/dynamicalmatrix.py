@@ -46,6 +46,7 @@ class DynamicalMatrix(SparseOrbitalBZ):
     def _reset(self):
         super()._reset()
         self.Dk = self._Pk
+        self.Dk_batch = self._Pk_batch
         self.dDk = self.dPk
         self.ddDk = self.ddPk
 
@@ -44,7 +44,7 @@ automatically passes the correct ``S`` because it knows the states :math:`\mathb
 """
 from __future__ import annotations
 
-from functools import reduce
+from functools import partial
 from typing import TYPE_CHECKING, Callable, Literal, Optional, Union
 
 import numpy as np
@@ -63,6 +63,7 @@ from numpy import (
     int32,
     log,
     matmul,
+    multiply,
     ogrid,
     pi,
     sin,
@@ -95,7 +96,7 @@ from sisl.utils.misc import direction
 if TYPE_CHECKING:
     from .brillouinzone import BrillouinZone
 
-from .distribution import get_distribution
+from .distribution import gaussian, get_distribution, lorentzian
 from .sparse import SparseOrbitalBZSpin
 from .spin import Spin
 from .state import Coefficient, State, StateC, _FakeMatrix, degenerate_decouple
@@ -104,13 +105,107 @@ __all__ = ["DOS", "PDOS", "COP"]
 __all__ += ["spin_moment", "spin_contamination"]
 __all__ += ["berry_phase", "berry_curvature"]
 __all__ += ["ahc", "shc", "conductivity"]
-__all__ += ["wavefunction"]
+__all__ += ["wavefunction", "wavefunction_batch"]
 __all__ += ["CoefficientElectron", "StateElectron", "StateCElectron"]
 __all__ += ["EigenvalueElectron", "EigenvectorElectron", "EigenstateElectron"]
 
 
+# Number of standard deviations where the Gaussian has dropped below machine precision
+_GAUSSIAN_CUTOFF = 8.5
+
+
+def _broadening(E, eig, distribution, cutoff, nchunk: int):
+    r"""Evaluate a distribution function for chunks of eigenvalues, in energy windows
+
+    The eigenvalues are sorted and processed in chunks of `nchunk` eigenvalues.
+    For each chunk only the energies within `cutoff` of the chunk's eigenvalues
+    are evaluated (found by `numpy.searchsorted` on the sorted energies).
+
+    Parameters
+    ----------
+    E : numpy.ndarray
+       energies (1D)
+    eig : numpy.ndarray
+       eigenvalues (1D)
+    distribution : func or str
+       the distribution function, sisl distribution functions (a `str` or
+       a function returned by `get_distribution`) are evaluated for a chunk at once
+    cutoff : float or None
+       only energies with :math:`|E-\epsilon - x_0| \le` `cutoff` are evaluated,
+       for Gaussian distributions it defaults to where the Gaussian drops below machine precision.
+       Otherwise all energies will be evaluated.
+    nchunk :
+       number of eigenvalues evaluated at once
+
+    Yields
+    ------
+    idx : numpy.ndarray
+        indices of the eigenvalues in the chunk
+    Eidx : slice or numpy.ndarray
+        indices of the energies in the window
+    D : numpy.ndarray
+        distribution function with shape ``(len(idx), len(E[Eidx]))``
+    """
+    if isinstance(distribution, str):
+        distribution = get_distribution(distribution)
+
+    # sisl distribution functions are element-wise and accept arrays of any shape
+    # (as long as their arguments are scalars)
+    x0 = 0.0
+    vectorized = (
+        isinstance(distribution, partial)
+        and distribution.func.__module__ == gaussian.__module__
+        and not distribution.args
+        and all(np.ndim(v) == 0 for v in distribution.keywords.values())
+    )
+    if vectorized and distribution.func in (gaussian, lorentzian):
+        x0 = distribution.keywords.get("x0", 0.0)
+        if cutoff is None and distribution.func is gaussian:
+            cutoff = _GAUSSIAN_CUTOFF * distribution.keywords.get("sigma", 0.1)
+
+    ns = len(eig)
+    if cutoff is None:
+        for i0 in range(0, ns, nchunk):
+            idx = _a.arangei(i0, min(i0 + nchunk, ns))
+            if vectorized:
+                D = distribution(E.reshape(1, -1) - eig[idx].reshape(-1, 1))
+            else:
+                D = np.array([distribution(E - e) for e in eig[idx]])
+            yield idx, slice(None), D.reshape(len(idx), len(E))
+        return
+
+    order = np.argsort(eig, kind="stable")
+    eig = eig[order]
+    if np.all(E[1:] >= E[:-1]):
+        Eorder = None
+        Es = E
+    else:
+        Eorder = np.argsort(E, kind="stable")
+        Es = E[Eorder]
+
+    for i0 in range(0, ns, nchunk):
+        e = eig[i0 : i0 + nchunk]
+        lo = np.searchsorted(Es, e[0] + x0 - cutoff, "left")
+        hi = np.searchsorted(Es, e[-1] + x0 + cutoff, "right")
+        if lo >= hi:
+            continue
+
+        dE = Es[lo:hi].reshape(1, -1) - e.reshape(-1, 1)
+        if vectorized:
+            D = distribution(dE)
+        else:
+            D = np.array([distribution(de) for de in dE])
+        # ensure the results are independent on the chunk size
+        D[np.fabs(dE - x0) > cutoff] = 0
+
+        if Eorder is None:
+            yield order[i0 : i0 + nchunk], slice(lo, hi), D
+        else:
+            yield order[i0 : i0 + nchunk], Eorder[lo:hi], D
+
+
 @set_module("sisl.physics.electron")
-def DOS(E, eig, distribution="gaussian"):
+def DOS(E, eig, distribution="gaussian", cutoff: Optional[float] = None):
     r"""Calculate the density of states (DOS) for a set of energies, `E`, with a distribution function
 
     The :math:`\mathrm{DOS}(E)` is calculated as:
@@ -131,6 +226,12 @@ def DOS(E, eig, distribution="gaussian"):
     distribution : func or str, optional
        a function that accepts :math:`\Delta E` as argument and calculates the
        distribution function.
+    cutoff : float, optional
+       only eigenvalues within `cutoff` of the distribution center contributes to the
+       DOS at a given energy.
+       For Gaussian distributions this defaults to where the Gaussian has dropped below
+       machine precision (:math:`8.5\sigma`), for all other distributions no cutoff is used.
+       Only use this for distributions that are localized (Gaussian and Lorentzian).
 
     See Also
     --------
@@ -144,14 +245,30 @@ def DOS(E, eig, distribution="gaussian"):
     numpy.ndarray
         DOS calculated at energies, has same length as `E`
     """
-    if isinstance(distribution, str):
-        distribution = get_distribution(distribution)
+    E = np.asarray(E)
+    shape = E.shape
+    E = E.ravel()
+    eig = np.asarray(eig).ravel()
 
-    return reduce(lambda DOS, eig: DOS + distribution(E - eig), eig, 0.0)
+    DOS = zeros(len(E), dtype=np.result_type(E.dtype, eig.dtype, np.float64))
+    # Limit the temporary memory
+    nchunk = max(1, 2**22 // max(1, len(E)))
+    for _, Eidx, D in _broadening(E, eig, distribution, cutoff, nchunk):
+        DOS[Eidx] += D.sum(0)
+    return DOS.reshape(shape)
 
 
 @set_module("sisl.physics.electron")
-def PDOS(E, eig, state, S=None, distribution="gaussian", spin=None):
+def PDOS(
+    E,
+    eig,
+    state,
+    S=None,
+    distribution="gaussian",
+    spin=None,
+    projection=None,
+    cutoff: Optional[float] = None,
+):
     r""" Calculate the projected density of states (PDOS) for a set of energies, `E`, with a distribution function
 
     The :math:`\mathrm{PDOS}(E)` is calculated as:
@@ -210,6 +327,13 @@ def PDOS(E, eig, state, S=None, distribution="gaussian", spin=None):
     spin : str or Spin, optional
        the spin configuration. This is generally only needed when the eigenvectors correspond to a non-colinear
        calculation.
+    projection : array_like or list of array_like, optional
+       only calculate the PDOS for these orbitals (in the given order). If a list of
+       orbital indices, the PDOS of each group of orbitals is summed (e.g. one group per atom).
+       Only the requested orbitals are projected.
+    cutoff : float, optional
+       only states with eigenvalues within `cutoff` of the distribution center contributes
+       to the PDOS at a given energy, see `DOS`.
 
     See Also
     --------
@@ -225,10 +349,8 @@ def PDOS(E, eig, state, S=None, distribution="gaussian", spin=None):
         projected DOS calculated at energies, has dimension ``(1, state.shape[1], len(E))``.
         For non-colinear calculations it will be ``(4, state.shape[1] // 2, len(E))``, ordered as
         indicated in the above list.
+        With `projection` the second dimension is the number of requested orbitals (or groups).
     """
-    if isinstance(distribution, str):
-        distribution = get_distribution(distribution)
-
     # Figure out whether we are dealing with a non-colinear calculation
     if S is None:
         S = _FakeMatrix(state.shape[1])
@@ -240,59 +362,113 @@ def PDOS(E, eig, state, S=None, distribution="gaussian", spin=None):
         else:
             spin = Spin()
 
+    E = np.asarray(E).ravel()
+    eig = np.asarray(eig).ravel()
+    state = np.asarray(state)
+
     # check for non-colinear (or SO)
-    if spin.kind > Spin.POLARIZED:
-        # Non colinear eigenvectors
+    non_colinear = spin.kind > Spin.POLARIZED
+    if non_colinear:
         if S.shape[1] == state.shape[1]:
             # Since we are going to reshape the eigen-vectors
             # to more easily get the mixed states, we can reduce the overlap matrix
             S = S[::2, ::2]
+        no = state.shape[1] // 2
+    else:
+        no = state.shape[1]
+
+    orbs, group = _projection_orbitals(projection, no)
+    if isinstance(S, _FakeMatrix):
+        S = None
+    elif orbs is not None:
+        # only the requested rows are needed
+        S = S[orbs]
+    nproj = no if orbs is None else len(orbs)
+
+    PDOS = zeros(
+        [4 if non_colinear else 1, nproj, len(E)],
+        dtype=state.real.dtype,
+    )
 
-        # Initialize data
-        PDOS = empty([4, state.shape[1] // 2, len(E)], dtype=state.real.dtype)
-
-        # Do spin-box calculations:
-        #  PDOS[0] = total DOS (diagonal)
-        #  PDOS[1] = x == < psi | \sigma_x S | psi >
-        #  PDOS[2] = y == < psi | \sigma_y S | psi >
-        #  PDOS[3] = z == < psi | \sigma_z S | psi >
-
-        d = distribution(E - eig[0]).reshape(1, -1)
-        cs = conj(state[0]).reshape(-1, 2)
-        v = S @ state[0].reshape(-1, 2)
-        D1 = (cs * v).real  # uu,dd PDOS
-        PDOS[0, :, :] = D1.sum(1).reshape(-1, 1) * d  # total DOS
-        PDOS[3, :, :] = (D1[:, 0] - D1[:, 1]).reshape(-1, 1) * d  # z-dos
-        D1 = (cs[:, 1] * v[:, 0]).reshape(-1, 1)  # d,u
-        D2 = (cs[:, 0] * v[:, 1]).reshape(-1, 1)  # u,d
-        PDOS[1, :, :] = (D1.real + D2.real) * d  # x-dos
-        PDOS[2, :, :] = (D2.imag - D1.imag) * d  # y-dos
-        for i in range(1, len(eig)):
-            d = distribution(E - eig[i]).reshape(1, -1)
-            cs = conj(state[i]).reshape(-1, 2)
-            v = S @ state[i].reshape(-1, 2)
-            D1 = (cs * v).real
-            PDOS[0, :, :] += D1.sum(1).reshape(-1, 1) * d
-            PDOS[3, :, :] += (D1[:, 0] - D1[:, 1]).reshape(-1, 1) * d
-            D1 = (cs[:, 1] * v[:, 0]).reshape(-1, 1)
-            D2 = (cs[:, 0] * v[:, 1]).reshape(-1, 1)
-            PDOS[1, :, :] += (D1.real + D2.real) * d
-            PDOS[2, :, :] += (D2.imag - D1.imag) * d
+    # Limit the temporary memory
+    nchunk = max(1, 2**22 // max(1, state.shape[1] + len(E)))
+    for idx, Eidx, D in _broadening(E, eig, distribution, cutoff, nchunk):
+        psi = state[idx]
 
-    else:
-        PDOS = (conj(state[0]) * (S @ state[0])).real.reshape(-1, 1) * distribution(
-            E - eig[0]
-        ).reshape(1, -1)
+        if non_colinear:
+            # psi[state, orbital, spin]
+            psi = psi.reshape(len(idx), no, 2)
+            if S is None:
+                v = psi if orbs is None else psi[:, orbs]
+            else:
+                # S @ psi for all states and spin-components at once
+                v = np.asarray(S @ psi.transpose(1, 0, 2).reshape(no, -1))
+                v = v.reshape(nproj, len(idx), 2).transpose(1, 0, 2)
+            cs = conj(psi if orbs is None else psi[:, orbs])
+
+            # Do spin-box calculations:
+            #  PDOS[0] = total DOS (diagonal)
+            #  PDOS[1] = x == < psi | \sigma_x S | psi >
+            #  PDOS[2] = y == < psi | \sigma_y S | psi >
+            #  PDOS[3] = z == < psi | \sigma_z S | psi >
+            D1 = (cs * v).real  # uu,dd PDOS
+            D2 = cs[..., 1] * v[..., 0]  # d,u
+            D3 = cs[..., 0] * v[..., 1]  # u,d
+            PDOS[..., Eidx] += np.stack(
+                [
+                    D1.sum(-1).T @ D,  # total DOS
+                    (D2.real + D3.real).T @ D,  # x-dos
+                    (D3.imag - D2.imag).T @ D,  # y-dos
+                    (D1[..., 0] - D1[..., 1]).T @ D,  # z-dos
+                ]
+            )
 
-        for i in range(1, len(eig)):
-            PDOS += (conj(state[i]) * (S @ state[i])).real.reshape(
-                -1, 1
-            ) * distribution(E - eig[i]).reshape(1, -1)
-        PDOS.shape = (1, *PDOS.shape)
+        else:
+            if S is None:
+                v = psi.T if orbs is None else psi[:, orbs].T
+            else:
+                v = np.asarray(S @ psi.T)
+            cs = conj(psi.T if orbs is None else psi[:, orbs].T)
+            PDOS[0][:, Eidx] += (cs * v).real @ D
+
+    if group is not None:
+        PDOS = np.stack([group @ P for P in PDOS])
 
     return PDOS
 
 
+def _projection_orbitals(projection, no: int):
+    """Orbitals and summation of orbitals for a projection
+
+    Returns
+    -------
+    orbs : numpy.ndarray or None
+       orbitals to project on, None for all orbitals
+    group : scipy.sparse.csr_matrix or None
+       matrix summing the projected orbitals into groups, None if no summation
+    """
+    if projection is None:
+        return None, None
+    if isinstance(projection, (list, tuple)) and any(
+        not np.isscalar(p) for p in projection
+    ):
+        groups = [_a.asarrayl(p).ravel() for p in projection]
+        n = _a.arrayl([len(g) for g in groups])
+        orbs = np.concatenate(groups) if len(groups) > 0 else _a.arrayl([])
+        ptr = _a.zerosl(len(groups) + 1)
+        np.cumsum(n, out=ptr[1:])
+        group = csr_matrix(
+            (np.ones(len(orbs)), _a.arangel(len(orbs)), ptr),
+            shape=(len(groups), len(orbs)),
+        )
+    else:
+        orbs = _a.asarrayl(projection).ravel()
+        group = None
+    if np.any(orbs < 0) or np.any(orbs >= no):
+        raise ValueError(f"PDOS: projection orbitals must be in the range [0, {no})")
+    return orbs, group
+
+
 @set_module("sisl.physics.electron")
 @deprecate_argument(
     "tol",
@@ -301,7 +477,15 @@ def PDOS(E, eig, state, S=None, distribution="gaussian", spin=None):
     "0.15",
     "0.16",
 )
-def COP(E, eig, state, M, distribution="gaussian", atol: float = 1e-10):
+def COP(
+    E,
+    eig,
+    state,
+    M,
+    distribution="gaussian",
+    atol: float = 1e-10,
+    orbitals=None,
+):
     r"""Calculate the Crystal Orbital Population for a set of energies, `E`, with a distribution function
 
     The :math:`\mathrm{COP}(E)` is calculated as:
@@ -335,11 +519,14 @@ def COP(E, eig, state, M, distribution="gaussian", atol: float = 1e-10):
        considering an eigenstate to contribute to an energy point,
        a higher value means that more energy points are discarded and so the calculation
        is faster.
+    orbitals : array_like, optional
+       only calculate the COP for these orbitals (rows of `M`), the columns are retained.
 
     Notes
     -----
     This is not tested for non-collinear states.
-    This requires substantial amounts of memory for big systems with lots of energy points.
+    This requires substantial amounts of memory for big systems with lots of energy points,
+    consider only calculating the COP for the required `orbitals`.
 
     This method is considered experimental and implementation may change in the future.
 
@@ -354,85 +541,85 @@ def COP(E, eig, state, M, distribution="gaussian", atol: float = 1e-10):
     -------
     ~sisl.oplist.oplist
         COP calculated at energies, has dimension ``(len(E), *M.shape)``.
+        With `orbitals` the dimension is ``(len(E), len(orbitals), M.shape[1])``.
     """
     if isinstance(distribution, str):
+        # the sisl distributions accept arrays of any shape
         distribution = get_distribution(distribution)
+        vectorized = True
+    else:
+        vectorized = False
 
     assert len(eig) == len(
         state
     ), "COP: number of eigenvalues and states are not consistent"
 
+    E = np.asarray(E)
+    eig = np.asarray(eig)
+    state = np.asarray(state)
+
     # get default dtype
     dtype = state.real.dtype
 
     # initialize the COP values
     no = M.shape[0]
     n_s = M.shape[1] // M.shape[0]
+    if orbitals is None:
+        orbs = _a.arangel(no)
+    else:
+        orbs = _a.asarrayl(orbitals).ravel()
+    shape = (len(orbs), M.shape[1])
+
+    def distributions(e):
+        """Distribution of all states in `e`, ignoring contributions below `atol`"""
+        if vectorized:
+            D = distribution(E.reshape(1, -1) - e.reshape(-1, 1))
+        else:
+            D = np.array([distribution(E - ei) for ei in e])
+        return np.where(D >= atol, D, 0.0)
 
     if isinstance(M, _FakeMatrix):
         # A fake matrix equals the identity matrix.
         # Hence we can do all calculations only on the diagonal,
         # then finally we recreate the full matrix dimensions.
-        cop = oplist(zeros(no, dtype=dtype) for _ in range(len(E)))
-
-        def new_list(bools, tmp, we):
-            for bl, w in zip(bools, we):
-                if bl:
-                    yield tmp * w
-                else:
-                    yield 0.0
-
-        for e, s in zip(eig, state):
-            # calculate contribution from this state
-            we = distribution(E - e)
-            bools = we >= atol
-            if np.any(bools):
-                tmp = (s.conj() * s).real
-                cop += new_list(bools, tmp, we)
+        diag = distributions(eig).T @ (conj(state[:, orbs]) * state[:, orbs]).real
 
         # Now recreate the full size (in sparse form)
-        idx = np.arange(no)
-
-        def tosize(diag, idx):
-            return csr_matrix((diag, (idx, idx)), shape=M.shape)
-
-        cop = oplist(tosize(d, idx) for d in cop)
+        idx = _a.arangel(len(orbs))
+        cop = oplist(csr_matrix((d, (idx, orbs)), shape=shape) for d in diag)
 
     elif issparse(M):
-        # create the new list
-        cop0 = M.multiply(0.0).real
-        cop = oplist(cop0.copy() for _ in range(len(E)))
-        del cop0
-
-        # split M, then we will rejoin afterwards
-        Ms = [M[:, i * no : (i + 1) * no] for i in range(n_s)]
-
-        def new_list(bools, tmp, we):
-            for bl, w in zip(bools, we):
-                if bl:
-                    yield tmp.multiply(w)
-                else:
-                    yield 0.0
-
-        for e, s in zip(eig, state):
-            # calculate contribution from this state
-            we = distribution(E - e)
-            bools = we >= atol
-            if np.any(bools):
-                s = np.outer(s.conj(), s)
-                tmp = hstack([m.multiply(s).real for m in Ms])
-                cop += new_list(bools, tmp, we)
+        # All contributions share the sparsity pattern of M, so only the
+        # non-zero values are calculated (without forming dense outer products).
+        M = M.tocsr()[orbs]
+        M.sort_indices()
+        rows = np.repeat(orbs, np.diff(M.indptr))
+        cols = M.indices % no
+        data = np.zeros([len(E), M.nnz], dtype=dtype)
+
+        # Limit the temporary memory
+        nchunk = max(1, 2**22 // max(1, M.nnz + len(E)))
+        for i0 in range(0, len(eig), nchunk):
+            s = state[i0 : i0 + nchunk]
+            W = (M.data * conj(s[:, rows]) * s[:, cols]).real
+            data += distributions(eig[i0 : i0 + nchunk]).T @ W
+
+        cop = oplist(
+            csr_matrix((d, M.indices, M.indptr), shape=shape, dtype=dtype) for d in data
+        )
 
     else:
-        old_shape = M.shape
-        Ms = M.reshape(old_shape[0], n_s, old_shape[0])
-        cop = oplist(zeros(old_shape, dtype=dtype) for _ in range(len(E)))
-
+        M = np.asarray(M)[orbs].reshape(len(orbs), n_s, no)
+        cop = zeros([len(E), *shape], dtype=dtype)
+        # expand the state and do multiplication
         for e, s in zip(eig, state):
-            we = distribution(E - e)
-            # expand the state and do multiplication
-            s = np.outer(s.conj(), s)[:, None, :]
-            cop += we.reshape(-1, 1, 1) * (Ms * s).real.reshape(old_shape)
+            we = distributions(np.array([e]))[0]
+            nz = we.nonzero()[0]
+            if len(nz) == 0:
+                continue
+            W = (conj(s[orbs]).reshape(-1, 1, 1) * M * s.reshape(1, 1, -1)).real
+            cop[nz] += we[nz].reshape(-1, 1, 1) * W.reshape(1, *shape)
+        cop = oplist(cop)
 
     return cop
 
@@ -1213,8 +1400,77 @@ def berry_phase(
     return ret
 
 
+def _wavefunction_setup(name: str, v, grid, geometry, k, spinor, spin):
+    """Parse and check the arguments for the wavefunction routines
+
+    Returns the coefficients (for the chosen spinor), the geometry, the k-point
+    and whether the k-point is not Gamma.
+    """
+    # Decipher v from State type
+    if isinstance(v, State):
+        if geometry is None:
+            geometry = v._geometry()
+        if k is None:
+            k = v.info.get("k", k)
+        elif not np.allclose(k, v.info.get("k", k)):
+            raise ValueError(
+                f"{name}: k passed and k in info does not match: {k} and {v.info.get('k')}"
+            )
+        v = v.state
+    if geometry is None:
+        geometry = grid.geometry
+    if geometry is None:
+        raise SislError(
+            f"{name}: did not find a usable Geometry through keywords or the Grid!"
+        )
+
+    # We cannot move stuff since outside stuff may rely on exact coordinates.
+    # If people have out-liers, they should do it them-selves.
+    # We'll do this and warn if they are dissimilar.
+    dxyz = geometry.lattice.cell2length(1e-6).sum(0)
+    dxyz = (
+        geometry.move(dxyz).translate2uc(axes=(0, 1, 2)).move(-dxyz).xyz - geometry.xyz
+    )
+    if not np.allclose(dxyz, 0):
+        info(
+            f"{name}: coordinates may be outside your primary unit-cell. "
+            "Translating all into the primary unit cell could disable this information"
+        )
+
+    v = np.asarray(v)
+    if spin is None:
+        if v.shape[-1] // 2 == geometry.no:
+            # We can see from the input that the vector *must* be a non-colinear calculation
+            v = v.reshape(*v.shape[:-1], -1, 2)[..., spinor]
+            info(
+                f"{name}: assumes the input wavefunction coefficients to originate from a non-colinear calculation!"
+            )
+
+    elif spin.kind > Spin.POLARIZED:
+        # For non-colinear cases the user selects the spinor component.
+        v = v.reshape(*v.shape[:-1], -1, 2)[..., spinor]
+
+    if v.shape[-1] != geometry.no:
+        raise ValueError(
+            f"{name}: require wavefunction coefficients corresponding to number of orbitals in the geometry."
+        )
+
+    # Check for k-points
+    k = _a.asarrayd(k)
+    kl = k.dot(k) ** 0.5
+    has_k = kl > 0.000001
+    if has_k:
+        info(f"{name}: k != Gamma is currently untested!")
+    else:
+        k = _a.zerosd(3)
+
+    return v, geometry, k, has_k
+
+
 @set_module("sisl.physics.electron")
-def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
+def wavefunction(
+    v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None, cache=None
+):
     r"""Add the wave-function (`Orbital.psi`) component of each orbital to the grid
 
     This routine calculates the real-space wave-function components in the
@@ -1283,37 +1539,14 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
        influence for non-colinear wavefunctions where `spinor` choice is important.
     eta : bool, optional
        Display a console progressbar.
+    cache : OrbitalValuesCache, optional
+       re-use orbital values stored in this cache (they will be calculated and stored if
+       not present). This greatly speeds up projecting many states on the same grid.
+       The grid must have the same lattice as the geometry.
     """
-    # Decipher v from State type
-    if isinstance(v, State):
-        if geometry is None:
-            geometry = v._geometry()
-        if k is None:
-            k = v.info.get("k", k)
-        elif not np.allclose(k, v.info.get("k", k)):
-            raise ValueError(
-                f"wavefunction: k passed and k in info does not match: {k} and {v.info.get('k')}"
-            )
-        v = v.state
-    if geometry is None:
-        geometry = grid.geometry
-    if geometry is None:
-        raise SislError(
-            "wavefunction: did not find a usable Geometry through keywords or the Grid!"
-        )
-
-    # We cannot move stuff since outside stuff may rely on exact coordinates.
-    # If people have out-liers, they should do it them-selves.
-    # We'll do this and warn if they are dissimilar.
-    dxyz = geometry.lattice.cell2length(1e-6).sum(0)
-    dxyz = (
-        geometry.move(dxyz).translate2uc(axes=(0, 1, 2)).move(-dxyz).xyz - geometry.xyz
+    v, geometry, k, has_k = _wavefunction_setup(
+        "wavefunction", v, grid, geometry, k, spinor, spin
     )
-    if not np.allclose(dxyz, 0):
-        info(
-            f"wavefunction: coordinates may be outside your primary unit-cell. "
-            "Translating all into the primary unit cell could disable this information"
-        )
 
     # In case the user has passed several vectors we sum them to plot the summed state
     if v.ndim == 2:
@@ -1323,30 +1556,6 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
             )
         v = v.sum(0)
 
-    if spin is None:
-        if len(v) // 2 == geometry.no:
-            # We can see from the input that the vector *must* be a non-colinear calculation
-            v = v.reshape(-1, 2)[:, spinor]
-            info(
-                "wavefunction: assumes the input wavefunction coefficients to originate from a non-colinear calculation!"
-            )
-
-    elif spin.kind > Spin.POLARIZED:
-        # For non-colinear cases the user selects the spinor component.
-        v = v.reshape(-1, 2)[:, spinor]
-
-    if len(v) != geometry.no:
-        raise ValueError(
-            "wavefunction: require wavefunction coefficients corresponding to number of orbitals in the geometry."
-        )
-
-    # Check for k-points
-    k = _a.asarrayd(k)
-    kl = k.dot(k) ** 0.5
-    has_k = kl > 0.000001
-    if has_k:
-        info("wavefunction: k != Gamma is currently untested!")
-
     # Check that input/grid makes sense.
     # If the coefficients are complex valued, then the grid *has* to be
     # complex valued.
@@ -1357,10 +1566,141 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
             "wavefunction: input coefficients are complex, while grid only contains real."
         )
 
-    if is_complex:
-        psi_init = _a.zerosz
+    if cache is not None:
+        # Use the pre-calculated orbital values
+        values = cache.get(geometry, grid)
+        grid.grid += values.reduce_orbitals(v, k=k).grid
+        return
+
+    _wavefunction_grid(
+        "wavefunction",
+        v.reshape(1, -1),
+        grid,
+        geometry,
+        k,
+        has_k,
+        grid.grid[np.newaxis],
+        eta,
+    )
+
+
+@set_module("sisl.physics.electron")
+def wavefunction_batch(
+    v,
+    grid,
+    geometry=None,
+    k=None,
+    spinor=0,
+    spin=None,
+    weight=None,
+    eta=None,
+    cache=None,
+):
+    r"""Calculate the real-space wavefunctions of many states in a single pass
+
+    Contrary to `wavefunction`, which sums all states, this calculates each
+    state separately. The orbital values and phase factors are only calculated
+    once for all states.
+
+    If `weight` is passed, the weighted sum of the densities of the states is added to `grid`:
+
+    .. math::
+
+       \rho(\mathbf r) = \sum_\alpha w_\alpha |\psi_\alpha(\mathbf r)|^2
+
+    which is useful for calculating LDOS or STM images.
+
+    Parameters
+    ----------
+    v : array_like
+       coefficients for the orbital expansion on the real-space grid, shape ``(nstates, no)``.
+       See `wavefunction` for details.
+    grid : Grid
+       grid defining the real-space points. Only if `weight` is passed will this grid
+       be altered (the density is *added*).
+    geometry : Geometry, optional
+       geometry where the orbitals are defined, see `wavefunction`
+    k : array_like, optional
+       k-point associated with wavefunction, see `wavefunction`
+    spinor : int, optional
+       the spinor for non-colinear/spin-orbit calculations, see `wavefunction`
+    spin : Spin, optional
+       specification of the spin configuration of the orbital coefficients, see `wavefunction`
+    weight : array_like, optional
+       weights of the states, shape ``(nstates,)``. The states are then calculated in chunks
+       to limit the memory usage.
+    eta : bool, optional
+       Display a console progressbar.
+    cache : OrbitalValuesCache, optional
+       re-use orbital values stored in this cache, see `wavefunction`
+
+    Returns
+    -------
+    numpy.ndarray
+        the wavefunctions with shape ``(nstates, *grid.shape)``, only returned if `weight`
+        is None.
+
+    See Also
+    --------
+    wavefunction : calculate the sum of the wavefunctions on a grid
+    """
+    v, geometry, k, has_k = _wavefunction_setup(
+        "wavefunction_batch", v, grid, geometry, k, spinor, spin
+    )
+    v = np.atleast_2d(v)
+    nstates = v.shape[0]
+    if weight is not None:
+        weight = _a.asarrayd(weight).ravel()
+        if len(weight) != nstates:
+            raise ValueError(
+                f"wavefunction_batch: weight must have length equal to the number of states ({nstates})."
+            )
+
+    if cache is not None:
+        # Use the pre-calculated orbital values
+        values = cache.get(geometry, grid)
     else:
-        psi_init = _a.zerosd
+        dtype = np.result_type(v, grid.grid)
+        if has_k:
+            dtype = np.result_type(dtype, np.complex128)
+
+    def calc(v):
+        """Wavefunctions of the states `v`, shape ``(len(v), *grid.shape)``"""
+        if cache is not None:
+            out = values.reduce_orbitals(v.T, k=k)
+            if isinstance(out, Grid):
+                return out.grid[np.newaxis]
+            return np.ascontiguousarray(np.moveaxis(out, -1, 0))
+        out = np.zeros([len(v), *grid.shape], dtype=dtype)
+        _wavefunction_grid("wavefunction_batch", v, grid, geometry, k, has_k, out, eta)
+        return out
+
+    if weight is None:
+        return calc(v)
+
+    # Only a bounded number of wavefunctions are in memory at any time,
+    # the densities are added to the grid as they are calculated
+    nchunk = max(1, 2**22 // max(1, grid.grid.size))
+    for i0 in range(0, nstates, nchunk):
+        out = calc(v[i0 : i0 + nchunk])
+        for w, psi in zip(weight[i0 : i0 + nchunk], out):
+            grid.grid += w * (psi.conj() * psi).real
+        del out, psi
+
+
+def _wavefunction_grid(name: str, v, grid, geometry, k, has_k: bool, out, eta):
+    """Add the real-space wavefunctions of the states `v` to `out`
+
+    All states are calculated in one traversal of the atoms and grid points.
+
+    Parameters
+    ----------
+    v : (nstates, no)
+       coefficients of the states
+    out : (nstates, *grid.shape)
+       array where the wavefunctions are added
+    """
+    nstates = v.shape[0]
 
     # Extract sub variables used throughout the loop
     shape = _a.asarrayi(grid.shape)
@@ -1445,7 +1785,7 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
 
     if all_negative_R:
         raise SislError(
-            "wavefunction: Cannot create wavefunction since no atoms have an associated basis-orbital on a real-space grid"
+            f"{name}: Cannot create wavefunction since no atoms have an associated basis-orbital on a real-space grid"
         )
 
     # Now we have min-max for all atoms
@@ -1497,7 +1837,7 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
     phase = 1
 
     # Retrieve progressbar
-    eta = progressbar(len(IA), "wavefunction", "atom", eta)
+    eta = progressbar(len(IA), name, "atom", eta)
 
     # Loop over all atoms in the grid-cell
     for ia, xyz, isc in zip(IA, XYZ, ISC):
@@ -1507,9 +1847,7 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
         # Extract maximum R
         R = atom.maxR()
         if R <= 0.0:
-            warn(
-                f"wavefunction: Atom '{atom}' does not have a wave-function, skipping atom."
-            )
+            warn(f"{name}: Atom '{atom}' does not have a wave-function, skipping atom.")
             eta.update()
             continue
 
@@ -1562,7 +1900,7 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
             phase = exp(1j * phk.dot(isc))
 
         # Allocate a temporary array where we add the psi elements
-        psi = psi_init(n)
+        psi = np.zeros([n, nstates], dtype=out.dtype)
 
         # Loop on orbitals on this atom, grouped by radius
         for os in atom.iter(True):
@@ -1571,7 +1909,7 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
 
             if oR <= 0.0:
                 warn(
-                    f"wavefunction: Orbital(s) '{os}' does not have a wave-function, skipping orbital!"
+                    f"{name}: Orbital(s) '{os}' does not have a wave-function, skipping orbital!"
                 )
                 # Skip these orbitals
                 io += len(os)
@@ -1594,8 +1932,8 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
             # Loop orbitals with the same radius
             for o in os:
                 # Evaluate psi component of the wavefunction and add it for this atom
-                psi[idx1] += o.psi_spher(r1, theta1, phi1, cos_phi=True) * (
-                    v[io] * phase
+                psi[idx1] += multiply.outer(
+                    o.psi_spher(r1, theta1, phi1, cos_phi=True), v[:, io] * phase
                 )
                 io += 1
 
@@ -1603,8 +1941,8 @@ def wavefunction(v, grid, geometry=None, k=None, spinor=0, spin=None, eta=None):
         del idx1, r1, theta1, phi1, idx, r, theta, phi
 
         # Convert to correct shape and add the current atom contribution to the wavefunction
-        psi.shape = idxM - idxm
-        grid.grid[idxm[0] : idxM[0], idxm[1] : idxM[1], idxm[2] : idxM[2]] += psi
+        psi = psi.T.reshape(nstates, *(idxM - idxm))
+        out[:, idxm[0] : idxM[0], idxm[1] : idxM[1], idxm[2] : idxM[2]] += psi
 
         # Clean-up
         del psi
@@ -1709,7 +2047,7 @@ class _electron_State:
         """
         return spin_moment(self.state, self.Sk(), project=project)
 
-    def wavefunction(self, grid, spinor=0, eta=None):
+    def wavefunction(self, grid, spinor=0, eta=None, cache=None):
         r"""Expand the coefficients as the wavefunction on `grid` *as-is*
 
         See `~sisl.physics.electron.wavefunction` for argument details, the arguments not present
@@ -1734,7 +2072,50 @@ class _electron_State:
         k = self.info.get("k", _a.zerosd(3))
 
         wavefunction(
-            self.state, grid, geometry=geometry, k=k, spinor=spinor, spin=spin, eta=eta
+            self.state,
+            grid,
+            geometry=geometry,
+            k=k,
+            spinor=spinor,
+            spin=spin,
+            eta=eta,
+            cache=cache,
+        )
+
+    def wavefunction_batch(self, grid, spinor=0, weight=None, eta=None, cache=None):
+        r"""Expand each of the states as a wavefunction on `grid` in a single pass
+
+        See `~sisl.physics.electron.wavefunction_batch` for argument details, the arguments not present
+        in this method are automatically passed from this object.
+        """
+        spin = getattr(self.parent, "spin", None)
+
+        if isinstance(self.parent, Geometry):
+            geometry = self.parent
+        else:
+            geometry = getattr(self.parent, "geometry", None)
+
+        if not isinstance(grid, Grid):
+            # probably the grid is a Real, or a tuple that denotes the shape
+            # at least this makes it easier to parse
+            grid = Grid(grid, geometry=geometry, dtype=self.dtype)
+
+        # Ensure we are dealing with the R gauge
+        self.change_gauge("cell")
+
+        # Retrieve k
+        k = self.info.get("k", _a.zerosd(3))
+
+        return wavefunction_batch(
+            self.state,
+            grid,
+            geometry=geometry,
+            k=k,
+            spinor=spinor,
+            spin=spin,
+            weight=weight,
+            eta=eta,
+            cache=cache,
         )
 
 
@@ -1822,7 +2203,7 @@ class EigenvalueElectron(CoefficientElectron):
             distribution = get_distribution(distribution)
         return distribution(self.eig)
 
-    def DOS(self, E, distribution="gaussian"):
+    def DOS(self, E, distribution="gaussian", cutoff: Optional[float] = None):
         r"""Calculate DOS for provided energies, `E`.
 
         This routine calls `sisl.physics.electron.DOS` with appropriate arguments
@@ -1830,7 +2211,7 @@ class EigenvalueElectron(CoefficientElectron):
 
         See `~sisl.physics.electron.DOS` for argument details.
         """
-        return DOS(E, self.eig, distribution)
+        return DOS(E, self.eig, distribution, cutoff)
 
 
 @set_module("sisl.physics.electron")
@@ -1875,7 +2256,7 @@ class EigenstateElectron(StateCElectron):
             distribution = get_distribution(distribution)
         return distribution(self.eig)
 
-    def DOS(self, E, distribution="gaussian"):
+    def DOS(self, E, distribution="gaussian", cutoff: Optional[float] = None):
         r"""Calculate DOS for provided energies, `E`.
 
         This routine calls `sisl.physics.electron.DOS` with appropriate arguments
@@ -1883,16 +2264,41 @@ class EigenstateElectron(StateCElectron):
 
         See `~sisl.physics.electron.DOS` for argument details.
         """
-        return DOS(E, self.c, distribution)
+        return DOS(E, self.c, distribution, cutoff)
 
-    def PDOS(self, E, distribution="gaussian"):
+    def PDOS(self, E, distribution="gaussian", projection=None, cutoff=None):
         r"""Calculate PDOS for provided energies, `E`.
 
         This routine calls `~sisl.physics.electron.PDOS` with appropriate arguments
         and returns the PDOS.
 
         See `~sisl.physics.electron.PDOS` for argument details.
+
+        Parameters
+        ----------
+        projection : {"atoms", "species"} or array_like or list of array_like, optional
+           reduce the PDOS while calculating it, ``"atoms"`` sums the orbitals of each atom
+           and ``"species"`` sums the orbitals of each species.
+           Otherwise the orbitals (or groups of orbitals) as described in `~sisl.physics.electron.PDOS`.
         """
+        if isinstance(projection, str):
+            geom = self._geometry()
+            if projection in ("atom", "atoms"):
+                projection = [
+                    _a.arangei(geom.firsto[ia], geom.firsto[ia + 1])
+                    for ia in range(geom.na)
+                ]
+            elif projection == "species":
+                species = geom.atoms.species
+                projection = [
+                    geom.a2o((species == i).nonzero()[0], all=True)
+                    for i in range(geom.atoms.nspecies)
+                ]
+            else:
+                raise ValueError(
+                    f"{self.__class__.__name__}.PDOS got unknown projection {projection!r}, "
+                    "must be one of [atoms, species] or orbital indices"
+                )
         return PDOS(
             E,
             self.c,
@@ -1900,6 +2306,8 @@ class EigenstateElectron(StateCElectron):
             self.Sk(),
             distribution,
             getattr(self.parent, "spin", None),
+            projection=projection,
+            cutoff=cutoff,
         )
 
     def COP(self, E, M, *args, **kwargs):
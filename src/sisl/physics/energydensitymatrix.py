@@ -92,6 +92,7 @@ class EnergyDensityMatrix(_densitymatrix):
     def _reset(self):
         super()._reset()
         self.Ek = self.Pk
+        self.Ek_batch = self.Pk_batch
         self.dEk = self.dPk
         self.ddEk = self.ddPk
 
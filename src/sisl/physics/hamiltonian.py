@@ -95,6 +95,7 @@ class Hamiltonian(SparseOrbitalBZSpin):
     def _reset(self):
         super()._reset()
         self.Hk = self.Pk
+        self.Hk_batch = self.Pk_batch
         self.dHk = self.dPk
         self.ddHk = self.ddPk
 
@@ -169,6 +170,67 @@ class Hamiltonian(SparseOrbitalBZSpin):
         """
         pass
 
+    def Hk_batch(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format="array",
+        out=None,
+        *args,
+        **kwargs,
+    ):
+        r"""Setup the Hamiltonian for many k-points at once
+
+        This is equivalent to stacking `Hk` for all k-points, however the
+        sparse pattern is only traversed once and the phases for all k-points
+        are evaluated in a single vectorized operation.
+        This can be much faster than individual calls for small to medium sized
+        Hamiltonians, e.g. when calculating band-structures.
+
+        For non-collinear and spin-orbit Hamiltonians this is equivalent to
+        stacking the individual `Hk` calls.
+
+        Parameters
+        ----------
+        ks : array_like
+           the k-points to setup the Hamiltonian at, shape ``(nk, 3)``
+        dtype : numpy.dtype , optional
+           the data type of the returned matrices. Do NOT request non-complex
+           data-type for non-Gamma k.
+           The default data-type is `numpy.complex128`
+        gauge :
+           the chosen gauge, ``cell`` for cell vector gauge, and ``atom`` for atomic distance
+           gauge.
+        format : {'array', 'dense', 'csr', ...}
+           the returned format of the matrices. Dense formats return a single
+           array with shape ``(nk, no, no)``, sparse formats return a list of sparse
+           matrices (one per k-point). Supercell formats are not allowed.
+        out : numpy.ndarray, optional
+           preallocated output array for dense formats, must have shape ``(nk, no, no)``.
+        spin : int, optional
+           if the Hamiltonian is a spin polarized one can extract the specific spin direction
+           matrix by passing an integer (0 or 1). If the Hamiltonian is not `Spin.POLARIZED`
+           this keyword is ignored.
+
+        Examples
+        --------
+        >>> bs = BandStructure(H, [[0, 0, 0], [0.5, 0, 0]], 100)
+        >>> Hk = H.Hk_batch(bs.k)
+        >>> Hk.shape == (len(bs), H.no, H.no)
+        True
+
+        See Also
+        --------
+        Hk : Hamiltonian for a single k-point
+
+        Returns
+        -------
+        matrix : numpy.ndarray or list of scipy.sparse.*_matrix
+            the Hamiltonian matrices at all :math:`\mathbf k`. The returned object depends on `format`.
+        """
+        pass
+
     def dHk(
         self,
         k=(0, 0, 0),
@@ -386,6 +448,9 @@ class Hamiltonian(SparseOrbitalBZSpin):
         format : str, optional
             see `eigh` for details, this will be passed to the EigenstateElectron
             instance to be used in subsequent calls, may speed up post-processing.
+        cache : EigenstateCache, optional
+            re-use eigenstates calculated previously (with the same arguments),
+            and store the calculated eigenstates in the cache.
         **kwargs : dict, optional
             passed arguments to the eigenvalue calculator routine
 
@@ -399,6 +464,9 @@ class Hamiltonian(SparseOrbitalBZSpin):
         EigenstateElectron
         """
         gauge = comply_gauge(gauge)
+        cache = kwargs.pop("cache", None)
+        if cache is not None:
+            return cache.eigenstate(self, k, gauge, **kwargs)
         format = kwargs.pop("format", None)
         if kwargs.pop("sparse", False):
             e, v = self.eigsh(k, gauge=gauge, eigvals_only=False, **kwargs)
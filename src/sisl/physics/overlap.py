@@ -47,6 +47,7 @@ class Overlap(SparseOrbitalBZ):
     def _reset(self):
         super()._reset()
         self.Sk = self._Pk
+        self.Sk_batch = self._Pk_batch
         self.dSk = self._dPk
         self.ddSk = self._ddPk
 
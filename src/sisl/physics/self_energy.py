@@ -3,7 +3,10 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
-from typing import Literal, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Literal, Optional, Union
 
 import numpy as np
 from numpy import abs as _abs
@@ -25,7 +28,7 @@ from sisl._core.sparse_geometry import _SparseGeometry
 from sisl._help import array_replace
 from sisl._internal import set_module
 from sisl.linalg import inv, linalg_info, solve
-from sisl.linalg.base import _compute_lwork
+from sisl.linalg.base import _available_cpus, _blas_limits, _compute_lwork
 from sisl.messages import deprecate_argument, deprecation, info, warn
 from sisl.physics.bloch import Bloch
 from sisl.physics.brillouinzone import MonkhorstPack
@@ -304,6 +307,35 @@ class RecursiveSI(SemiInfinite):
         r"""Dimension of the self-energy"""
         return len(self.spgeom0)
 
+    def prepare(self, k=(0, 0, 0), dtype=None, **kwargs) -> RecursiveSIPrepared:
+        r"""Prepare the self-energy calculation at a fixed k-point for sweeping many energies
+
+        The dense matrices of the principal layer and its coupling are only calculated
+        once, and the returned object can calculate the self-energy (or Green function) at many
+        energies in batches.
+
+        Parameters
+        ----------
+        k : array_like, optional
+          k-point at which the self-energy should be evaluated.
+          the k-point should be in units of the reciprocal lattice vectors.
+        dtype : numpy.dtype
+          the resulting data type, default to ``np.complex128``
+        **kwargs : dict, optional
+           arguments passed directly to the ``self.parent.Pk`` method (not ``self.parent.Sk``), for instance ``spin``
+
+        Examples
+        --------
+        >>> SE = RecursiveSI(H, "+A")
+        >>> E = np.linspace(-1, 1, 1000)
+        >>> se = SE.prepare(k=[0, 0.1, 0]).self_energy(E)
+        >>> se.shape == (len(E), len(SE), len(SE))
+        True
+        >>> np.allclose(se[10], SE.self_energy(E[10], k=[0, 0.1, 0]))
+        True
+        """
+        return RecursiveSIPrepared(self, k, dtype, **kwargs)
+
     @deprecate_argument(
         "eps", "atol", "eps argument is deprecated in favor of atol", "0.15", "0.16"
     )
@@ -665,6 +697,284 @@ class RecursiveSI(SemiInfinite):
         )
 
 
+class RecursiveSIPrepared:
+    r"""Self-energy of a `RecursiveSI` object at a fixed k-point
+
+    The dense matrices of the principal layer (:math:`\mathbf H_0`, :math:`\mathbf S_0`)
+    and the coupling (:math:`\mathbf H_1`, :math:`\mathbf S_1`) are calculated once.
+    Many energies are calculated simultaneously by stacking the recursions,
+    energies are removed from the stack once converged.
+    The work arrays are retained between calls.
+
+    Objects should be created through `RecursiveSI.prepare`.
+
+    Parameters
+    ----------
+    se : RecursiveSI
+       the self-energy object
+    k : array_like
+       k-point at which the self-energy should be evaluated.
+    dtype : numpy.dtype
+       the resulting data type, default to ``np.complex128``
+    **kwargs : dict, optional
+       arguments passed directly to the ``se.spgeom0.Pk`` method, for instance ``spin``
+    """
+
+    def __init__(self, se: RecursiveSI, k=(0, 0, 0), dtype=None, **kwargs):
+        if dtype is None:
+            dtype = complex128
+        self.dtype = np.dtype(dtype)
+        self.k = _a.asarrayd(k)
+        self.eta = se.eta
+        self.semi_inf_dir = se.semi_inf_dir
+
+        sp0 = se.spgeom0
+        sp1 = se.spgeom1
+        k = self.k
+        self._H0 = sp0.Pk(k, dtype=dtype, format="array", **kwargs)
+        self._S0 = sp0.Sk(k, dtype=dtype, format="array")
+        self._H1 = sp1.Pk(k, dtype=dtype, format="array", **kwargs)
+        if sp1.orthogonal:
+            self._S1 = None
+        else:
+            self._S1 = sp1.Sk(k, dtype=dtype, format="array")
+        # work arrays, allocated on first use
+        self._work = None
+
+    def __len__(self) -> int:
+        r"""Dimension of the self-energy"""
+        return self._H0.shape[0]
+
+    def _energies(self, E):
+        """Energies as a 1D complex array, real energies gets the imaginary part `eta`"""
+        E = np.asarray(E)
+        is_scalar = E.ndim == 0
+        E = E.ravel()
+        E = np.where(E.imag == 0.0, E.real + 1j * self.eta, E).astype(
+            self.dtype, copy=False
+        )
+        return E, is_scalar
+
+    def _get_work(self, nb: int):
+        """Retrieve (and possibly allocate) the work arrays for `nb` energies"""
+        n = len(self)
+        if self._work is None or self._work[0].shape[0] < nb:
+            dtype = self.dtype
+            self._work = (
+                empty([nb, n, n], dtype=dtype),  # bulk
+                empty([nb, n, 2 * n], dtype=dtype),  # alpha/beta
+                empty([nb, n, n], dtype=dtype),  # surface
+                empty([nb, n, n], dtype=dtype),  # temporary
+            )
+        return self._work
+
+    def _recursion(self, E, atol: float, batch: Union[int, None], store):
+        """Run the Lopez-Sancho recursion for all energies in `E`
+
+        `store(idx, GB, GS)` is called for converged energies ``E[idx]`` with the
+        bulk and surface matrices.
+        """
+        n = len(self)
+        nE = len(E)
+        if batch is None:
+            # keep the work arrays of a batch at ~4 MB, larger batches
+            # are slower since the matrices are evicted from the caches
+            batch = min(256, 2**22 // (7 * n * n * self.dtype.itemsize))
+        batch = max(1, min(nE, batch))
+        GB_w, ab_w, GS_w, tmp_w = self._get_work(batch)
+
+        H0, S0, H1, S1 = self._H0, self._S0, self._H1, self._S1
+        H1H = conjugate(H1.T)
+        if S1 is not None:
+            S1H = conjugate(S1.T)
+
+        for i0 in range(0, nE, batch):
+            iE = _a.arangei(i0, min(i0 + batch, nE))
+            nb = len(iE)
+            GB = GB_w[:nb]
+            ab = ab_w[:nb]
+            GS = GS_w[:nb]
+            tmp = tmp_w[:nb]
+            alpha = ab[:, :, :n]
+            beta = ab[:, :, n:]
+
+            e = E[iE].reshape(-1, 1, 1)
+            np.multiply(S0, e, out=GB)
+            GB -= H0
+            if S1 is None:
+                alpha[...] = H1
+                beta[...] = H1H
+            else:
+                np.multiply(S1, e, out=alpha)
+                np.subtract(H1, alpha, out=alpha)
+                np.multiply(S1H, e, out=beta)
+                np.subtract(H1H, beta, out=beta)
+            GS.fill(0)
+
+            na = nb
+            while na > 0:
+                tab = np.linalg.solve(GB[:na], ab[:na])
+                t0 = tab[:, :, :n]
+                t1 = tab[:, :, n:]
+
+                matmul(alpha[:na], t1, out=tmp[:na])
+                # Update bulk Green function
+                subtract(GB[:na], tmp[:na], out=GB[:na])
+                subtract(GB[:na], matmul(beta[:na], t0), out=GB[:na])
+                # Update surface self-energy
+                subtract(GS[:na], tmp[:na], out=GS[:na])
+
+                # Update forward/backward
+                matmul(alpha[:na], t0, out=tmp[:na])
+                alpha[:na] = tmp[:na]
+                matmul(beta[:na], t1, out=tmp[:na])
+                beta[:na] = tmp[:na]
+                del tab, t0, t1
+
+                # Convergence criteria, it could be stricter
+                conv = (_abs(alpha[:na]).max(axis=(1, 2)) < atol).nonzero()[0]
+                if len(conv) == 0:
+                    continue
+                store(iE[conv], GB[conv], GS[conv])
+                # move the non-converged energies to the front
+                for i in conv[::-1]:
+                    na -= 1
+                    if i != na:
+                        GB[i] = GB[na]
+                        ab[i] = ab[na]
+                        GS[i] = GS[na]
+                        iE[i] = iE[na]
+
+    def self_energy(
+        self, E, atol: float = 1e-14, bulk: bool = False, batch: Optional[int] = None
+    ) -> np.ndarray:
+        r"""Return the self-energy at energies `E`
+
+        Parameters
+        ----------
+        E : complex or array_like
+          energies at which the calculation will take place, real energies
+          will get the imaginary part ``eta``
+        atol :
+          convergence criteria for the recursion
+        bulk :
+          if true, :math:`E\cdot \mathbf S - \mathbf H -\boldsymbol\Sigma` is returned, else
+          :math:`\boldsymbol\Sigma` is returned (default).
+        batch :
+          number of energies calculated simultaneously, defaults to limit the work
+          memory of a batch to approximately 4 MB.
+
+        Returns
+        -------
+        numpy.ndarray
+            the self-energies, with shape ``(len(E), n, n)`` (or ``(n, n)`` for a scalar energy)
+        """
+        E, is_scalar = self._energies(E)
+        n = len(self)
+        out = empty([len(E), n, n], dtype=self.dtype)
+
+        def store(idx, GB, GS):
+            if bulk:
+                # E S - H - Sigma
+                out[idx] = E[idx].reshape(-1, 1, 1) * self._S0 - self._H0 + GS
+            else:
+                out[idx] = -GS
+
+        self._recursion(E, atol, batch, store)
+        if is_scalar:
+            return out[0]
+        return out
+
+    def self_energy_lr(
+        self, E, atol: float = 1e-14, bulk: bool = False, batch: Optional[int] = None
+    ):
+        r"""Return two self-energies (left and right) at energies `E`
+
+        See `RecursiveSI.self_energy_lr` for details.
+
+        Parameters
+        ----------
+        E : complex or array_like
+          energies at which the calculation will take place, real energies
+          will get the imaginary part ``eta``
+        atol :
+          convergence criteria for the recursion
+        bulk :
+          if true, :math:`E\cdot \mathbf S - \mathbf H -\boldsymbol\Sigma` is returned, else
+          :math:`\boldsymbol\Sigma` is returned (default).
+        batch :
+          number of energies calculated simultaneously, defaults to limit the work
+          memory of a batch to approximately 4 MB.
+
+        Returns
+        -------
+        left : numpy.ndarray
+            the left self-energies, with shape ``(len(E), n, n)`` (or ``(n, n)`` for a scalar energy)
+        right : numpy.ndarray
+            the right self-energies
+        """
+        E, is_scalar = self._energies(E)
+        n = len(self)
+        GS_out = empty([len(E), n, n], dtype=self.dtype)
+        GB_out = empty([len(E), n, n], dtype=self.dtype)
+
+        def store(idx, GB, GS):
+            GS_out[idx] = GS
+            GB_out[idx] = GB
+
+        self._recursion(E, atol, batch, store)
+
+        SmH0 = E.reshape(-1, 1, 1) * self._S0 - self._H0
+        if bulk:
+            # the surface is E S - H - Sigma, and the other side is the remainder
+            SmH0 += GS_out
+            GB_out -= GS_out
+            surf, other = SmH0, GB_out
+        else:
+            SmH0 -= GB_out
+            SmH0 += GS_out
+            np.negative(GS_out, out=GS_out)
+            surf, other = GS_out, SmH0
+
+        if is_scalar:
+            surf, other = surf[0], other[0]
+        if self.semi_inf_dir == 1:
+            # the surface is the "right" self-energy
+            return other, surf
+        return surf, other
+
+    def green(self, E, atol: float = 1e-14, batch: Optional[int] = None) -> np.ndarray:
+        r"""Return the bulk Green function at energies `E`
+
+        Parameters
+        ----------
+        E : complex or array_like
+          energies at which the calculation will take place, real energies
+          will get the imaginary part ``eta``
+        atol :
+          convergence criteria for the recursion
+        batch :
+          number of energies calculated simultaneously, defaults to limit the work
+          memory of a batch to approximately 4 MB.
+
+        Returns
+        -------
+        numpy.ndarray
+            the bulk Green functions, with shape ``(len(E), n, n)`` (or ``(n, n)`` for a scalar energy)
+        """
+        E, is_scalar = self._energies(E)
+        n = len(self)
+        out = empty([len(E), n, n], dtype=self.dtype)
+
+        def store(idx, GB, GS):
+            out[idx] = np.linalg.inv(GB)
+
+        self._recursion(E, atol, batch, store)
+        if is_scalar:
+            return out[0]
+        return out
+
+
 @set_module("sisl.physics")
 class RealSpaceSE(SelfEnergy):
     r"""Bulk real-space self-energy (or Green function) for a given physical object with periodicity
@@ -1290,6 +1600,223 @@ class RealSpaceSE(SelfEnergy):
             return (G + G.T) * 0.5
         return G
 
+    def green_batch(
+        self,
+        E,
+        k=(0, 0, 0),
+        dtype=None,
+        nthreads: Optional[int] = None,
+        blas_threads: Optional[int] = None,
+        timings: Optional[dict] = None,
+        **kwargs,
+    ) -> np.ndarray:
+        r"""Calculate the real-space Green function at many energies
+
+        Equivalent to calling `green` for each energy, but each k-point in the
+        integration is only processed once for all energies.
+        For each k-point the surface self-energies are calculated for all
+        energies simultaneously (see `RecursiveSI.prepare`), and the Green functions
+        are Bloch unfolded and added to the integrated Green function.
+
+        The k-points are distributed on a pool of threads, each thread
+        has its own work arrays and the reduction into the integrated
+        Green function is serialized.
+
+        Parameters
+        ----------
+        E : array_like
+           energies to evaluate the real-space Green function at
+        k : array_like, optional
+           only viable for 3D bulk systems with real-space Green functions along 2 directions.
+           I.e. this would correspond to a circular real-space Green function
+        dtype : numpy.dtype, optional
+          the resulting data type, default to ``np.complex128``
+        nthreads :
+           number of threads used for the k-points, defaults to the number of available CPUs
+           (but at most the number of k-points).
+           Each thread requires memory for the Green functions at all energies.
+        blas_threads :
+           number of threads each BLAS/LAPACK call may use (requires ``threadpoolctl``),
+           defaults to the number of available CPUs divided by `nthreads`.
+        timings :
+           if passed, the time spent (in seconds, summed over all threads) in each stage of
+           the calculation is added to the dictionary, the keys are
+           ``self_energy`` (setup of the k-point and the surface self-energies), ``green``
+           (inversions and tiling along the semi-infinite direction), ``unfold`` (Bloch
+           unfolding) and ``reduce`` (summation into the integrated Green function).
+        **kwargs : dict, optional
+           arguments passed directly to the ``self.parent.Pk`` method (not ``self.parent.Sk``), for instance ``spin``
+
+        Returns
+        -------
+        numpy.ndarray
+            the real-space Green functions, with shape ``(len(E), len(self), len(self))``
+
+        Examples
+        --------
+        >>> rse = RealSpaceSE(H, 0, 1, (3, 4, 1))
+        >>> timings = {}
+        >>> G = rse.green_batch(np.linspace(-1, 1, 21), timings=timings)
+        >>> np.allclose(G[0], rse.green(-1.))
+        True
+        """
+        opt = self._options
+
+        # Retrieve integration k-grid
+        bz = opt["bz"]
+        try:
+            # If the BZ implements TRS (MonkhorstPack) then force it
+            trs = bz._trs >= 0
+        except Exception:
+            trs = opt["trs"]
+
+        if dtype is None:
+            dtype = complex128
+        dtype = np.dtype(dtype)
+
+        E = np.asarray(E).ravel()
+        E = np.where(E.imag == 0, E.real + 1j * opt["eta"], E).astype(dtype)
+        nE = len(E)
+
+        # Used axes
+        s_ax = self._semi_axis
+        k_ax = self._k_axes
+
+        k = _a.asarrayd(k)
+        if np.any(k != 0.0):
+            axes = [s_ax] + k_ax.tolist()
+            if np.any(k[axes] != 0.0):
+                raise ValueError(
+                    f"{self.__class__.__name__}.green_batch requires the k-point to be zero along the integrated axes."
+                )
+            if trs:
+                raise ValueError(
+                    f"{self.__class__.__name__}.green_batch requires a k-point sampled Green function to not use time reversal symmetry."
+                )
+        # Shift k-points to get the correct k-point in the larger one.
+        ks = bz.k + k.reshape(1, 3)
+        weights = bz.weight
+
+        SE = self._calc["SE"]
+
+        # Define Bloch unfolding routine and number of tiles along the semi-inf direction
+        unfold = self._unfold.copy()
+        tile = unfold[s_ax]
+        unfold[s_ax] = 1
+        bloch = Bloch(unfold)
+        nb = len(bloch)
+
+        # Tiling indices
+        idx0 = _a.arangei(tile)
+        no = len(self.parent)
+        nt = tile * no
+        n = len(self)
+
+        def calc_green(kb):
+            """Green functions at the folded k-point `kb` for all energies"""
+            t0 = perf_counter()
+            p = SE.prepare(kb, dtype=dtype, **kwargs)
+            if tile == 1:
+                SL, SR = p.self_energy_lr(E)
+                t1 = perf_counter()
+                SL += SR
+                del SR
+                np.subtract(E.reshape(-1, 1, 1) * p._S0 - p._H0, SL, out=SL)
+                G = np.linalg.inv(SL)
+                return G, t1 - t0, perf_counter() - t1
+
+            # A1 == Gf, because of memory usage
+            Gf, A2 = p.self_energy_lr(E, bulk=True)
+            t1 = perf_counter()
+            if p._S1 is None:
+                # skip negation since we don't do negation on tY/tX
+                B = np.broadcast_to(p._H1, A2.shape)
+                C = np.broadcast_to(conjugate(p._H1.T), A2.shape)
+            else:
+                e = E.reshape(-1, 1, 1)
+                B = p._H1 - p._S1 * e
+                C = conjugate(p._H1.T) - conjugate(p._S1.T) * e
+
+            tY = np.linalg.solve(Gf, C)
+            Gf = np.linalg.inv(A2 - matmul(B, tY))
+            tX = np.linalg.solve(A2, B)
+            del A2, B, C
+
+            # G11 and G22 are the same (pristine bulk), see `green`
+            G = empty([nE, tile, no, tile, no], dtype=dtype)
+            # advanced indices separated by a slice are moved to the front
+            G[:, idx0, :, idx0, :] = Gf.reshape(1, nE, no, no)
+            for i in range(1, tile):
+                G[:, idx0[i:], :, idx0[:-i], :] = matmul(
+                    tX, G[:, i - 1, :, 0, :]
+                ).reshape(1, nE, no, no)
+                G[:, idx0[:-i], :, idx0[i:], :] = matmul(
+                    tY, G[:, 0, :, i - 1, :]
+                ).reshape(1, nE, no, no)
+            return G.reshape(nE, nt, nt), t1 - t0, perf_counter() - t1
+
+        G = zeros([nE, n, n], dtype=dtype)
+        lock = threading.Lock()
+        local = threading.local()
+        stages = dict.fromkeys(("self_energy", "green", "unfold", "reduce"), 0.0)
+
+        def integrate(ik):
+            t = dict.fromkeys(stages, 0.0)
+            if nb == 1:
+                Gk, t["self_energy"], t["green"] = calc_green(ks[ik])
+            else:
+                # per-thread work array for the folded Green functions
+                M = getattr(local, "M", None)
+                if M is None:
+                    M = local.M = empty([nE, nb, nt, nt], dtype=dtype)
+                k_unfold = bloch.unfold_points(ks[ik])
+                for ib, kb in enumerate(k_unfold):
+                    M[:, ib], tse, tg = calc_green(kb)
+                    t["self_energy"] += tse
+                    t["green"] += tg
+                t0 = perf_counter()
+                Gk = empty([nE, n, n], dtype=dtype)
+                for ie in range(nE):
+                    Gk[ie] = bloch.unfold(M[ie], k_unfold)
+                t["unfold"] = perf_counter() - t0
+
+            w = weights[ik]
+            t0 = perf_counter()
+            with lock:
+                Gk *= w
+                G[...] += Gk
+                t["reduce"] = perf_counter() - t0
+                for key, val in t.items():
+                    stages[key] += val
+
+        nk = len(ks)
+        ncpus = _available_cpus()
+        if nthreads is None:
+            nthreads = ncpus
+        nthreads = max(1, min(int(nthreads), nk))
+        if blas_threads is None:
+            blas_threads = max(1, ncpus // nthreads)
+
+        with _blas_limits(blas_threads):
+            if nthreads == 1:
+                for ik in range(nk):
+                    integrate(ik)
+            else:
+                with ThreadPoolExecutor(nthreads) as pool:
+                    # consume to propagate exceptions
+                    for _ in pool.map(integrate, range(nk)):
+                        pass
+
+        if timings is not None:
+            for key, val in stages.items():
+                timings[key] = timings.get(key, 0.0) + val
+
+        if trs:
+            # Faster to do it once, than per G
+            G += G.transpose(0, 2, 1)
+            G *= 0.5
+        return G
+
     def clear(self):
         """Clears the internal arrays created in `setup`"""
         del self._calc
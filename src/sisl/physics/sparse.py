@@ -21,6 +21,7 @@ from sisl.typing import AtomsIndex, GaugeType, KPoint
 from ._matrix_ddk import matrix_ddk, matrix_ddk_nc, matrix_ddk_nc_diag, matrix_ddk_so
 from ._matrix_dk import matrix_dk, matrix_dk_nc, matrix_dk_nc_diag, matrix_dk_so
 from ._matrix_k import matrix_k, matrix_k_nc, matrix_k_nc_diag, matrix_k_so
+from ._matrix_k_batch import matrix_k_batch
 from .spin import Spin
 
 __all__ = ["SparseOrbitalBZ", "SparseOrbitalBZSpin"]
@@ -30,6 +31,21 @@ __all__ = ["SparseOrbitalBZ", "SparseOrbitalBZSpin"]
 warnings.filterwarnings("ignore", category=SparseEfficiencyWarning)
 
 
+def _stack_k(func, ks, dtype, gauge, format, out, **kwargs):
+    """Evaluate `func` for each k-point and stack the results (fall-back for batched methods)"""
+    ks = _a.asarrayd(ks).reshape(-1, 3)
+    if format in ("array", "matrix", "dense"):
+        for ik, k in enumerate(ks):
+            P = func(k, dtype=dtype, gauge=gauge, format="array", **kwargs)
+            if out is None:
+                out = np.empty([len(ks), *P.shape], dtype=P.dtype)
+            out[ik] = P
+        return out
+    if out is not None:
+        raise ValueError("out argument only works for dense formats")
+    return [func(k, dtype=dtype, gauge=gauge, format=format, **kwargs) for k in ks]
+
+
 @set_module("sisl.physics")
 class SparseOrbitalBZ(SparseOrbital):
     r"""Sparse object containing the orbital connections in a Brillouin zone
@@ -87,15 +103,18 @@ class SparseOrbitalBZ(SparseOrbital):
         r"""Reset object according to the options, please refer to `SparseOrbital.reset` for details"""
         if self.orthogonal:
             self.Sk = self._Sk_diagonal
+            self.Sk_batch = self._Sk_batch_diagonal
             self.S_idx = -100
 
         else:
             self.S_idx = self.shape[-1] - 1
             self.Sk = self._Sk
+            self.Sk_batch = self._Sk_batch
             self.dSk = self._dSk
             self.ddSk = self._ddSk
 
         self.Pk = self._Pk
+        self.Pk_batch = self._Pk_batch
         self.dPk = self._dPk
         self.ddPk = self._ddPk
 
@@ -237,6 +256,33 @@ class SparseOrbitalBZ(SparseOrbital):
         k = _a.asarrayd(k).ravel()
         return matrix_k(gauge, self, _dim, self.lattice, k, dtype, format)
 
+    def _Pk_batch(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+        _dim=0,
+    ):
+        r"""Matrices at all k-points `ks` evaluated in a single pass over the sparse pattern
+
+        Parameters
+        ----------
+        ks : array_like
+           k-points, shape ``(nk, 3)``
+        dtype : numpy.dtype, optional
+           default to `numpy.complex128`
+        gauge :
+           chosen gauge
+        format :
+           for dense formats a ``(nk, no, no)`` array is returned, otherwise a list
+           of sparse matrices
+        out : numpy.ndarray, optional
+           preallocated output array (only for dense formats)
+        """
+        return matrix_k_batch(gauge, self, _dim, self.lattice, ks, dtype, format, out)
+
     def _dPk(
         self,
         k: KPoint = (0, 0, 0),
@@ -394,6 +440,87 @@ class SparseOrbitalBZ(SparseOrbital):
         """
         return self._Pk(k, dtype=dtype, gauge=gauge, format=format, _dim=self.S_idx)
 
+    def Sk_batch(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+        *args,
+        **kwargs,
+    ):  # pylint: disable=E0202
+        r"""Setup the overlap matrix for many k-points at once
+
+        This is equivalent to stacking `Sk` for all k-points, however the
+        sparse pattern is only traversed once and the phases for all k-points
+        are evaluated in a single vectorized operation.
+        This can be much faster than individual calls for small to medium sized
+        matrices.
+
+        Parameters
+        ----------
+        ks : array_like
+           the k-points to setup the overlap at, shape ``(nk, 3)``
+        dtype : numpy.dtype, optional
+           the data type of the returned matrices. Do NOT request non-complex
+           data-type for non-Gamma k.
+           The default data-type is `numpy.complex128`
+        gauge :
+           the chosen gauge, ``cell`` for cell vector gauge, and ``atom`` for atomic distance
+           gauge.
+        format : {"array", "dense", "matrix", "csr", ...}
+           the returned format of the matrices. Dense formats return a single
+           array with shape ``(nk, no, no)``, sparse formats return a list of sparse
+           matrices (one per k-point). Supercell formats are not allowed.
+        out : numpy.ndarray, optional
+           preallocated output array for dense formats, must have shape ``(nk, no, no)``.
+
+        See Also
+        --------
+        Sk : Overlap matrix for a single k-point
+
+        Returns
+        -------
+        matrix : numpy.ndarray or list of scipy.sparse.*_matrix
+            the overlap matrices at all :math:`\mathbf k`. The returned object depends on `format`.
+        """
+        pass
+
+    def _Sk_batch_diagonal(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+    ):
+        r"""For an orthogonal case we always return the identity matrix"""
+        return _stack_k(self._Sk_diagonal, ks, dtype, gauge, format, out)
+
+    def _Sk_batch(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+    ):
+        r"""Overlap matrices at all `ks` evaluated in a single pass over the sparse pattern
+
+        Parameters
+        ----------
+        ks : array_like
+           k-points, shape ``(nk, 3)``
+        dtype : numpy.dtype, optional
+           default to `numpy.complex128`
+        gauge :
+           chosen gauge
+        """
+        return self._Pk_batch(
+            ks, dtype=dtype, gauge=gauge, format=format, out=out, _dim=self.S_idx
+        )
+
     def dSk(
         self,
         k: KPoint = (0, 0, 0),
@@ -646,6 +773,93 @@ class SparseOrbitalBZ(SparseOrbital):
         S = self.Sk(k=k, dtype=dtype, gauge=gauge, format="array")
         return lin.eigh_destroy(P, S, eigvals_only=eigvals_only, **kwargs)
 
+    def eigh_batch(
+        self,
+        k,
+        gauge: GaugeType = "cell",
+        eigvals_only: bool = True,
+        nthreads: Optional[int] = None,
+        blas_threads: Optional[int] = None,
+        chunksize: int = 32,
+        **kwargs,
+    ):
+        r"""Returns the eigenvalues of the physical quantity for many k-points
+
+        The matrices are setup in chunks of `chunksize` k-points
+        (see `Pk_batch`) and the eigenvalue problems are solved by a pool of threads
+        (see `sisl.linalg.eigh_batch`).
+        For many k-points this is typically much faster than looping `eigh`,
+        and it does not have the overhead of multiple processes.
+
+        Parameters
+        ----------
+        k : array_like
+           the k-points, shape ``(nk, 3)``
+        gauge :
+           the chosen gauge
+        eigvals_only :
+           whether only the eigenvalues are returned
+        nthreads :
+           number of threads used for solving the eigenvalue problems, defaults to the
+           number of available CPUs
+        blas_threads :
+           number of threads each BLAS/LAPACK call may use (requires ``threadpoolctl``).
+           Defaults to avoid oversubscription of the CPUs.
+        chunksize :
+           number of k-points setup in each batch, controls the memory usage
+        **kwargs :
+           passed directly to `scipy.linalg.eigh`
+
+        Examples
+        --------
+        >>> bs = BandStructure(H, [[0, 0, 0], [0.5, 0, 0]], 1000)
+        >>> eigs = H.eigh_batch(bs.k)
+        >>> eigs.shape == (len(bs), len(H))
+        True
+
+        Returns
+        -------
+        eigenvalues : (nk, n) numpy.ndarray
+        eigenvectors : (nk, n, n) numpy.ndarray
+           only returned if `eigvals_only` is false
+        """
+        dtype = kwargs.pop("dtype", None)
+        # only passed for matrices with spin-components
+        Pk_kwargs = kwargs.pop("_Pk_kwargs", {})
+        k = _a.asarrayd(k).reshape(-1, 3)
+        nk = len(k)
+        chunksize = max(1, chunksize)
+
+        out = None
+        for ik in range(0, nk, chunksize):
+            ks = k[ik : ik + chunksize]
+            P = self.Pk_batch(ks, dtype=dtype, gauge=gauge, format="array", **Pk_kwargs)
+            if self.orthogonal:
+                S = None
+            else:
+                S = self.Sk_batch(ks, dtype=dtype, gauge=gauge, format="array")
+            res = lin.eigh_batch(
+                P,
+                S,
+                eigvals_only=eigvals_only,
+                nthreads=nthreads,
+                blas_threads=blas_threads,
+                overwrite=True,
+                **kwargs,
+            )
+            if eigvals_only:
+                if out is None:
+                    out = np.empty([nk, *res.shape[1:]], dtype=res.dtype)
+                out[ik : ik + len(ks)] = res
+            else:
+                if out is None:
+                    out = tuple(
+                        np.empty([nk, *r.shape[1:]], dtype=r.dtype) for r in res
+                    )
+                out[0][ik : ik + len(ks)] = res[0]
+                out[1][ik : ik + len(ks)] = res[1]
+        return out
+
     def eigsh(
         self,
         k: KPoint = (0, 0, 0),
@@ -768,7 +982,9 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
             self.UP = 0
             self.DOWN = 0
             self.Pk = self._Pk_unpolarized
+            self.Pk_batch = self._Pk_batch
             self.Sk = self._Sk
+            self.Sk_batch = self._Sk_batch
             self.dPk = self._dPk_unpolarized
             self.dSk = self._dSk
 
@@ -776,8 +992,10 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
             self.UP = 0
             self.DOWN = 1
             self.Pk = self._Pk_polarized
+            self.Pk_batch = self._Pk_batch_polarized
             self.dPk = self._dPk_polarized
             self.Sk = self._Sk
+            self.Sk_batch = self._Sk_batch
             self.dSk = self._dSk
 
         elif self.spin.is_noncolinear:
@@ -792,7 +1010,9 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
                 self.M12 = 2
                 raise NotImplementedError("Currently not implemented")
             self.Pk = self._Pk_non_colinear
+            self.Pk_batch = self._Pk_batch_stack
             self.Sk = self._Sk_non_colinear
+            self.Sk_batch = self._Sk_batch_stack
             self.dPk = self._dPk_non_colinear
             self.dSk = self._dSk_non_colinear
             self.ddPk = self._ddPk_non_colinear
@@ -819,7 +1039,9 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
                 raise NotImplementedError("Currently not implemented")
             # The overlap is the same as non-collinear
             self.Pk = self._Pk_spin_orbit
+            self.Pk_batch = self._Pk_batch_stack
             self.Sk = self._Sk_non_colinear
+            self.Sk_batch = self._Sk_batch_stack
             self.dPk = self._dPk_spin_orbit
             self.dSk = self._dSk_non_colinear
             self.ddPk = self._ddPk_spin_orbit
@@ -827,6 +1049,7 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
 
         if self.orthogonal:
             self.Sk = self._Sk_diagonal
+            self.Sk_batch = self._Sk_batch_diagonal
 
     # Override to enable spin configuration and orthogonality
     def _cls_kwargs(self):
@@ -958,6 +1181,18 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
                     self[ia, ix[ix_ge]] = p
                     self[ia, ix[~ix_ge]] = pc
 
+            def vectorized(self, ia, ja, d):
+                shell = np.searchsorted(R, d)
+                ja_ge = ((ja % na) >= ia).reshape(-1, 1)
+                data = np.where(
+                    ja_ge, np.asarray(param)[shell], np.asarray(paramH)[shell]
+                )
+                self.set_bulk(ia, ja, data)
+
+            func.R = R
+            func.params = param
+            func.vectorized = vectorized
+
             return func
 
         return super().create_construct(R, param)
@@ -1031,6 +1266,47 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
         """
         return self._Pk(k, dtype=dtype, gauge=gauge, format=format, _dim=spin)
 
+    def _Pk_batch_polarized(
+        self,
+        ks,
+        spin=0,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+    ):
+        r"""Matrices at all k-points `ks` for a polarized system
+
+        Parameters
+        ----------
+        ks : array_like
+           k-points, shape ``(nk, 3)``
+        spin : int, optional
+           the spin-index of the quantity
+        dtype : numpy.dtype, optional
+           default to `numpy.complex128`
+        gauge :
+           chosen gauge
+        """
+        return self._Pk_batch(
+            ks, dtype=dtype, gauge=gauge, format=format, out=out, _dim=spin
+        )
+
+    def _Pk_batch_stack(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+    ):
+        r"""Matrices at all k-points `ks` by stacking individual `Pk` calls
+
+        The spin-box structure of non-collinear and spin-orbit matrices
+        are not handled by the batched kernel.
+        """
+        return _stack_k(self.Pk, ks, dtype, gauge, format, out)
+
     def _Pk_non_colinear(
         self,
         k: KPoint = (0, 0, 0),
@@ -1241,6 +1517,17 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
         k = _a.asarrayd(k).ravel()
         return matrix_k_nc_diag(gauge, self, self.S_idx, self.lattice, k, dtype, format)
 
+    def _Sk_batch_stack(
+        self,
+        ks,
+        dtype=None,
+        gauge: GaugeType = "cell",
+        format: str = "array",
+        out=None,
+    ):
+        r"""Overlap matrices at all k-points `ks` by stacking individual `Sk` calls"""
+        return _stack_k(self.Sk, ks, dtype, gauge, format, out)
+
     def _dSk_non_colinear(
         self,
         k: KPoint = (0, 0, 0),
@@ -1336,6 +1623,28 @@ class SparseOrbitalBZSpin(SparseOrbitalBZ):
         S = self.Sk(k=k, dtype=dtype, gauge=gauge, format="array")
         return lin.eigh_destroy(P, S, eigvals_only=eigvals_only, **kwargs)
 
+    def eigh_batch(
+        self,
+        k,
+        gauge: GaugeType = "cell",
+        eigvals_only: bool = True,
+        **kwargs,
+    ):
+        r"""Returns the eigenvalues of the physical quantity for many k-points
+
+        See `SparseOrbitalBZ.eigh_batch` for details.
+
+        Parameters
+        ----------
+        spin : int, optional
+           the spin-component to calculate the eigenvalue spectrum of, note that
+           this parameter is only valid for `Spin.POLARIZED` matrices.
+        """
+        spin = kwargs.pop("spin", 0)
+        if self.spin.kind == Spin.POLARIZED:
+            kwargs["_Pk_kwargs"] = {"spin": spin}
+        return super().eigh_batch(k, gauge=gauge, eigvals_only=eigvals_only, **kwargs)
+
     def eigsh(
         self,
         k: KPoint = (0, 0, 0),
@@ -76,3 +76,53 @@ def test_bloch_H_same(nx, ny, nz, dtype):
         assert np.allclose(H_big, H_big.T.conj(), atol=atol)
         assert np.allclose(H_unfold, H_unfold.T.conj(), atol=atol)
         assert np.allclose(H_unfold, H_big, atol=atol)
+
+
+@pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+@pytest.mark.parametrize("nthreads", [1, 3])
+@pytest.mark.parametrize("B", [[1, 1, 1], [3, 1, 1], [1, 4, 2], [2, 3, 2]])
+def test_bloch_unfold_stream(B, nthreads, dtype):
+    H = get_H()
+    b = Bloch(B)
+    K = [0.1, 0.23, -0.3]
+    M = b(H.Hk, K, format="array", dtype=dtype)
+    M_stream = b.unfold_stream(H.Hk, K, format="array", dtype=dtype, nthreads=nthreads)
+    assert M_stream.dtype == M.dtype
+    assert np.allclose(M, M_stream, atol=1e-6)
+
+
+def test_bloch_unfold_stream_real():
+    H = get_H()
+    b = Bloch([2, 2, 1])
+    # Gamma point Hamiltonians are real
+    M = b.unfold_stream(H.Hk, [0] * 3, format="array", dtype=np.float64)
+    assert np.iscomplexobj(M)
+    assert np.allclose(M, b(H.Hk, [0] * 3, format="array"))
+
+
+@pytest.mark.parametrize("nthreads", [1, 2])
+def test_bloch_unfold_stream_memory(nthreads):
+    tracemalloc = pytest.importorskip("tracemalloc")
+    # large enough that numpy's (fixed size) ufunc buffers are negligible
+    n = 160
+    rng = np.random.default_rng(1234)
+    base = rng.random([n, n]) + 1j * rng.random([n, n])
+
+    def func(k):
+        return base * np.exp(2j * np.pi * k[0])
+
+    b = Bloch([3, 2, 1])
+    M_ref = b(func, [0.1, 0.2, 0])
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        M = b.unfold_stream(func, [0.1, 0.2, 0], nthreads=nthreads)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert np.allclose(M, M_ref)
+
+    # only the unfolded matrix, and the folded matrices in flight
+    nfolded = (peak - M.nbytes) / base.nbytes
+    assert nfolded < nthreads + 3
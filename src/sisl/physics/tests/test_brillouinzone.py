@@ -467,6 +467,35 @@ class TestMonkhorstPack:
             assert np.allclose(ds1.data_vars[var].values, data)
         assert len(ds1.coords) < len(ds0.coords)
 
+    def test_reduce(self):
+        from sisl import Hamiltonian, geom
+
+        g = geom.graphene()
+        H = Hamiltonian(g)
+        H.construct([[0.1, 1.44], [0, -2.7]])
+
+        E = np.linspace(-2, 2, 20)
+        bz = MonkhorstPack(H, [3, 3, 1], trs=False)
+
+        def wrap(es):
+            return es.DOS(E), es.PDOS(E)
+
+        DOS, PDOS = bz.apply.average.eigenstate(wrap=wrap)
+        rDOS, rPDOS = bz.apply.reduce.eigenstate(wrap=wrap)
+        assert np.allclose(DOS, rDOS)
+        assert np.allclose(PDOS, rPDOS)
+
+        out = np.empty_like(PDOS)
+        rPDOS = bz.apply.reduce.eigenstate(wrap=lambda es: es.PDOS(E), out=out)
+        assert rPDOS is out
+        assert np.allclose(PDOS, out)
+
+        # sparse matrices are also reduced
+        COOP = bz.apply.average.eigenstate(wrap=lambda es: es.COOP(E))
+        rCOOP = bz.apply.reduce.eigenstate(wrap=lambda es: es.COOP(E))
+        for c, rc in zip(COOP, rCOOP):
+            assert np.allclose(c.toarray(), rc.toarray())
+
     def test_bz_parallel_pathos(self):
         pytest.importorskip("pathos", reason="pathos not available")
 
@@ -507,7 +536,7 @@ class TestMonkhorstPack:
         papply = bz.apply.renew(pool=nprocs)
         assert str(apply) != str(papply)
 
-        for method in ("iter", "average", "sum", "array", "list", "oplist"):
+        for method in ("iter", "average", "reduce", "sum", "array", "list", "oplist"):
             # TODO One should be careful with zip
             # zip will stop when it hits the final element in the first
             # list.
@@ -529,7 +558,7 @@ class TestMonkhorstPack:
         papply = bz.apply.renew(pool=True).eigh
         assert str(apply) != str(papply)
 
-        for method in ("iter", "average", "sum", "array", "list", "oplist"):
+        for method in ("iter", "average", "reduce", "sum", "array", "list", "oplist"):
             # TODO One should be careful with zip
             # zip will stop when it hits the final element in the first
             # list.
@@ -538,6 +567,52 @@ class TestMonkhorstPack:
             for v1, v2 in zip(papply[method](), apply[method]()):
                 assert np.allclose(v1, v2)
 
+    def test_bz_parallel_persistent_pool(self):
+        pytest.importorskip("pathos", reason="pathos not available")
+
+        from sisl import Hamiltonian, geom
+        from sisl.physics import BrillouinZonePool
+
+        g = geom.graphene()
+        H = Hamiltonian(g)
+        H.construct([[0.1, 1.44], [0, -2.7]])
+
+        bz = MonkhorstPack(H, [3, 3, 1], trs=False)
+
+        with BrillouinZonePool(2) as pool:
+            assert pool.is_open
+            papply = bz.apply.renew(pool=pool)
+            for _ in range(2):
+                for method in (
+                    "iter",
+                    "average",
+                    "reduce",
+                    "sum",
+                    "array",
+                    "list",
+                    "oplist",
+                ):
+                    V1 = papply[method].eigh()
+                    V2 = bz.apply[method].eigh()
+                    for v1, v2 in zip(V1, V2):
+                        assert np.allclose(v1, v2)
+
+            # the shipped version should be re-used
+            token = pool.ship(H)
+            assert token == pool.ship(H)
+
+            # changing the parent should ship a new version
+            H[0, 0] = 1.0
+            assert token != pool.ship(H)
+            assert np.allclose(
+                papply.array.eigh(wrap=lambda eig: eig[0]),
+                bz.apply.array.eigh(wrap=lambda eig: eig[0]),
+            )
+
+        assert not pool.is_open
+        with pytest.raises(SislError):
+            pool.ship(H)
+
     def test_as_single(self):
         from sisl import Hamiltonian, geom
 
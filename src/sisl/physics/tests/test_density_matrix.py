@@ -3,6 +3,7 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 from __future__ import annotations
 
+import itertools
 import math as m
 
 import numpy as np
@@ -20,6 +21,7 @@ from sisl import (
     SphericalOrbital,
     Spin,
 )
+from sisl.physics import OrbitalValuesCache
 
 
 @pytest.fixture
@@ -92,12 +94,8 @@ def setup():
     scope="module",
     params=[
         "direct",
-        pytest.param(
-            "pre-compute",
-            marks=pytest.mark.xfail(
-                reason="raises NotImplementedError due to seg-fault"
-            ),
-        ),
+        "tiled",
+        "pre-compute",
     ],
 )
 def density_method(request):
@@ -490,6 +488,84 @@ class TestDensityMatrix:
         assert not np.allclose(D_mull, d_mull)
         assert np.allclose(D_mull[0], d_mull[0])
 
+    @pytest.mark.parametrize("nthreads", [1, 2])
+    @pytest.mark.parametrize("block", [5, (3, 7, 11)])
+    def test_rho_tiled(self, nthreads, block):
+        bond = 1.42
+        sq3h = 3.0**0.5 * 0.5
+        lattice = Lattice(
+            np.array(
+                [[1.5, sq3h, 0.0], [1.5, -sq3h, 0.0], [0.0, 0.0, 10.0]], np.float64
+            )
+            * bond,
+            nsc=[3, 3, 1],
+        )
+
+        n = 60
+        rf = np.linspace(0, bond * 1.01, n)
+        rf = (rf, np.exp(-rf))
+        orb = SphericalOrbital(1, rf, 2.0)
+        C = Atom(6, orb.toAtomicOrbital())
+        # ensure no grid points are on top of the atoms
+        g = Geometry(
+            np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]], np.float64) * bond + 0.05,
+            atoms=C,
+            lattice=lattice,
+        )
+        D = DensityMatrix(g)
+        np.random.seed(1)
+        for ia in range(g.na):
+            for ja in g.close(ia, R=bond + 0.01):
+                for io in g.a2o(ia, all=True):
+                    for jo in g.a2o(ja, all=True):
+                        D[io, jo] = np.random.rand()
+        D = (D + D.transpose()) / 2
+
+        grid = Grid(0.2, geometry=g)
+        D.density(grid, method="tiled", nthreads=nthreads, block=block)
+
+        # Explicit summation of all periodic images
+        idx = np.indices(grid.shape).reshape(3, -1).T
+        xyz = idx @ grid.dcell
+        psi = {}
+
+        def get_psi(io, isc):
+            key = (io, *isc)
+            if key not in psi:
+                ia = g.o2a(io)
+                r = xyz - g.xyz[ia] - isc @ g.cell
+                psi[key] = g.atoms[ia].orbitals[io - g.firsto[ia]].psi(r)
+            return psi[key]
+
+        DM = D.tocsr(0).tocoo()
+        rho = np.zeros(len(xyz))
+        for isc in itertools.product([-2, -1, 0, 1, 2], [-2, -1, 0, 1, 2], [-1, 0, 1]):
+            isc = np.array(isc)
+            for io, jo, d in zip(DM.row, DM.col, DM.data):
+                i_s, jo = divmod(jo, g.no)
+                rho += d * get_psi(io, isc) * get_psi(jo, isc + g.sc_off[i_s])
+        assert np.allclose(grid.grid, rho.reshape(grid.shape))
+
+    def test_rho_pre_compute_cache(self, setup):
+        D = setup.D.copy()
+        D.construct(setup.func)
+        tiled = Grid(0.2, geometry=setup.D.geometry)
+        D.density(tiled, method="tiled")
+
+        cache = OrbitalValuesCache()
+        for _ in range(2):
+            grid = Grid(0.2, geometry=setup.D.geometry)
+            D.density(grid, method="pre-compute", cache=cache)
+            assert np.allclose(grid.grid, tiled.grid)
+        assert len(cache) == 1
+
+    def test_rho_unknown_method(self, setup):
+        D = setup.D.copy()
+        D.construct(setup.func)
+        grid = Grid(0.2, geometry=setup.D.geometry)
+        with pytest.raises(ValueError):
+            D.density(grid, method="unknown")
+
     def test_rho_eta(self, setup, density_method):
         D = setup.D.copy()
         D.construct(setup.func)
@@ -501,7 +577,12 @@ class TestDensityMatrix:
         D.construct(setup.func)
         lattice = setup.D.geometry.cell.copy() / 2
         grid = Grid(0.2, geometry=setup.D.geometry.copy(), lattice=lattice)
-        D.density(grid, method=density_method)
+        if density_method == "pre-compute":
+            # orbital values are only calculated on the geometry lattice
+            with pytest.raises(ValueError):
+                D.density(grid, method=density_method)
+        else:
+            D.density(grid, method=density_method)
 
     def test_rho_fail_p(self, density_method):
         bond = 1.42
@@ -7,6 +7,8 @@ import numpy as np
 import pytest
 
 from sisl import Atom, Geometry, Hamiltonian, HydrogenicOrbital
+from sisl.physics.distribution import get_distribution
+from sisl.physics.electron import DOS, PDOS
 
 pytestmark = [pytest.mark.physics]
 
@@ -37,3 +39,33 @@ def test_EigenstateElectron_norm2():
     assert state3.norm2(projection="orbital").shape == (ns, H.no)
     assert state3.norm2(projection="atom").shape == (ns, H.na)
     assert state3.norm2(projection="atom").sum() == pytest.approx(ns)
+
+
+@pytest.mark.parametrize("distribution", ["gaussian", "lorentzian"])
+def test_DOS_window(distribution):
+    rng = np.random.default_rng(1234)
+    eig = rng.uniform(-5, 5, 200)
+    state = rng.random((200, 200)) + 1j * rng.random((200, 200))
+    state /= np.linalg.norm(state, axis=1).reshape(-1, 1)
+    E = np.linspace(-6, 6, 501)
+
+    dist = get_distribution(distribution)
+    DOS_ref = sum(dist(E - e) for e in eig)
+    PDOS_ref = sum(
+        (s.conj() * s).real.reshape(-1, 1) * dist(E - e) for e, s in zip(eig, state)
+    )
+    assert np.allclose(DOS(E, eig, distribution), DOS_ref)
+    assert np.allclose(PDOS(E, eig, state, distribution=distribution)[0], PDOS_ref)
+
+    # unsorted energies and user-defined functions
+    idx = rng.permutation(len(E))
+    assert np.allclose(DOS(E[idx], eig, lambda x: dist(x)), DOS_ref[idx])
+    assert np.allclose(PDOS(E[idx], eig, state, distribution=dist)[0], PDOS_ref[:, idx])
+
+    # a cutoff only includes the eigenvalues within a window
+    cut = DOS(E, eig, distribution, cutoff=0.5)
+    ref = sum(np.where(np.fabs(E - e) <= 0.5, dist(E - e), 0) for e in eig)
+    assert np.allclose(cut, ref)
+    assert np.allclose(
+        PDOS(E, eig, state, distribution=dist, cutoff=0.5)[0].sum(0), ref
+    )
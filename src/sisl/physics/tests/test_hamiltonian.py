@@ -20,6 +20,7 @@ from sisl import (
     Atom,
     BandStructure,
     BrillouinZone,
+    EigenstateCache,
     Geometry,
     Grid,
     Hamiltonian,
@@ -245,6 +246,110 @@ class TestHamiltonian:
         for gauge in ("atom", "atoms", "atom", "orbitals", "r"):
             assert H.eigenstate(gauge=gauge).info["gauge"] == "atom"
 
+    def test_eigenstate_cache(self, setup, sisl_tmp):
+        H = setup.HS.copy()
+        H.construct([(0.1, 1.5), ((1.0, 2.0), (0.1, 0.2))])
+        d = sisl_tmp("eigenstates")
+        cache = EigenstateCache(maxsize=2, directory=d, maxdisk=3)
+
+        k = [0.1, 0.2, 0]
+        es = H.eigenstate(k, cache=cache)
+        ref = H.eigenstate(k)
+        assert np.allclose(es.eig, ref.eig)
+        assert np.allclose(es.state, ref.state)
+        assert es.info["gauge"] == "cell"
+        assert len(cache) == 1
+
+        # returned states are copies
+        es.state[:] = 0.0
+        es = H.eigenstate(k, cache=cache)
+        assert np.allclose(es.state, ref.state)
+
+        # different arguments are different entries
+        es = H.eigenstate(k, gauge="atom", cache=cache)
+        assert es.info["gauge"] == "atom"
+        assert np.allclose(es.state, H.eigenstate(k, gauge="atom").state)
+        H.eigenstate([0.2, 0, 0], cache=cache)
+        assert len(cache) == 2
+        H.eigenstate([0.3, 0, 0], cache=cache)
+        assert len(list(cache.directory.glob("*.npz"))) == 3
+
+        # changing the matrix is a new entry
+        H2 = H.copy()
+        H2[0, 0] = (2.0, 1.0)
+        assert not np.allclose(
+            H2.eigenstate(k, cache=cache).eig, H.eigenstate(k, cache=cache).eig
+        )
+
+        # stored eigenstates are read from disk
+        cache = EigenstateCache(directory=d)
+        es = H.eigenstate([0.3, 0, 0], cache=cache)
+        assert np.allclose(es.state, H.eigenstate([0.3, 0, 0]).state)
+        cache.clear(disk=True)
+        assert len(cache) == 0
+        assert len(list(cache.directory.glob("*.npz"))) == 0
+
+    def test_eigenstate_cache_geometry(self, setup):
+        H = setup.H.copy()
+        H.construct([(0.1, 1.5), (1.0, 0.1)])
+        H.finalize()
+        cache = EigenstateCache()
+
+        k = [0.1, 0.2, 0]
+        H.eigenstate(k, gauge="atom", cache=cache)
+        H.eigenstate(k, gauge="atom", cache=cache)
+        assert len(cache) == 1
+
+        # moving an atom changes the phases in the atom gauge
+        H.geometry.xyz[0, 0] += 0.1
+        es = H.eigenstate(k, gauge="atom", cache=cache)
+        assert len(cache) == 2
+        ref = H.eigenstate(k, gauge="atom")
+        assert np.allclose(es.state, ref.state)
+
+    def test_eigenstate_cache_polarized(self, setup, sisl_tmp):
+        H = Hamiltonian(setup.g, spin=Spin("P"))
+        H.construct([(0.1, 1.5), ((1.0, 2.0), (0.1, 0.2))])
+        d = sisl_tmp("eigenstates_polarized")
+        cache = EigenstateCache(directory=d)
+
+        k = [0.1, 0.2, 0]
+        # numpy integers are equivalent to plain integers
+        for spin in np.arange(2):
+            es = H.eigenstate(k, spin=spin, cache=cache)
+            assert es.info["spin"] == spin
+            assert np.allclose(es.eig, H.eigh(k, spin=spin))
+        assert len(cache) == 2
+        H.eigenstate(k, spin=1, cache=cache)
+        assert len(cache) == 2
+        assert len(list(cache.directory.glob("*.npz"))) == 2
+
+        # stored eigenstates are read from disk
+        cache = EigenstateCache(directory=d)
+        es = H.eigenstate(k, spin=np.int32(1), cache=cache)
+        assert es.info["spin"] == 1
+        assert np.allclose(es.eig, H.eigh(k, spin=1))
+        assert len(list(cache.directory.glob("*.npz"))) == 2
+
+    def test_eigenstate_cache_bz(self, setup):
+        H = setup.H.copy()
+        H.construct([(0.1, 1.5), (1.0, 0.1)])
+        cache = EigenstateCache()
+        bz = MonkhorstPack(H, [3, 3, 1])
+        E = np.linspace(-2, 2, 11)
+        DOS = bz.apply.average.eigenstate(wrap=lambda es: es.DOS(E))
+        DOS_cache = bz.apply.average.eigenstate(cache=cache, wrap=lambda es: es.DOS(E))
+        assert np.allclose(DOS, DOS_cache)
+        assert len(cache) == len(bz)
+
+        # the second pass does not diagonalize
+        def fail(*args, **kwargs):
+            raise AssertionError("eigh should not be called")
+
+        H.eigh = fail
+        DOS_cache = bz.apply.average.eigenstate(cache=cache, wrap=lambda es: es.DOS(E))
+        assert np.allclose(DOS, DOS_cache)
+
     @pytest.mark.parametrize("k", [[0, 0, 0], [0.15, 0.15, 0.15]])
     def test_Hk_format(self, setup, k):
         H = setup.HS.copy()
@@ -300,6 +405,71 @@ class TestHamiltonian:
                     csr -= sc_csr1[:, isc * no : (isc + 1) * no]
                 assert allclose(csr.toarray(), 0.0)
 
+    @pytest.mark.parametrize("orthogonal", [True, False])
+    @pytest.mark.parametrize("gauge", ["cell", "atom"])
+    @pytest.mark.parametrize(
+        "spin", ["unpolarized", "polarized", "non-collinear", "spin-orbit"]
+    )
+    def test_Hk_batch(self, orthogonal, gauge, spin, sisl_complex):
+        g = Geometry(
+            [[i, 0, 0] for i in range(4)],
+            Atom(6, R=1.01),
+            lattice=Lattice([4, 1, 5.0], nsc=[3, 3, 1]),
+        )
+        dtype, atol, rtol = sisl_complex
+        allclose = partial(np.allclose, atol=atol, rtol=rtol)
+
+        H = Hamiltonian(g, dtype=np.float64, orthogonal=orthogonal, spin=Spin(spin))
+        nd = H._csr._D.shape[-1]
+        for ia in g:
+            idx = g.close(ia, R=(0.1, 1.01))[1]
+            H[ia, ia] = 1.0
+            H[ia, idx] = np.random.rand(nd)
+        H = (H + H.transpose(hermitian=True)) / 2
+
+        ks = [[0, 0, 0], [0.15, 0.1, 0.05], [0.5, 0.25, 0]]
+        for attr, kwargs in [("Hk", {"gauge": gauge}), ("Sk", {"gauge": gauge})]:
+            Mk = getattr(H, attr)
+            Mk_batch = getattr(H, f"{attr}_batch")
+            arr = Mk_batch(ks, dtype=dtype, **kwargs)
+            assert arr.shape == (len(ks), len(H), len(H))
+            csr = Mk_batch(ks, format="csr", dtype=dtype, **kwargs)
+            assert len(csr) == len(ks)
+            for ik, k in enumerate(ks):
+                mat = Mk(k, format="array", dtype=dtype, **kwargs)
+                assert allclose(arr[ik], mat)
+                assert allclose(csr[ik].toarray(), mat)
+
+            # preallocated buffer
+            out = np.empty_like(arr)
+            assert Mk_batch(ks, dtype=dtype, out=out, **kwargs) is out
+            assert allclose(out, arr)
+
+    def test_Hk_batch_fail(self, setup):
+        H = setup.H.copy()
+        H.construct([(0.1, 1.5), (1.0, 0.1)])
+        with pytest.raises(ValueError):
+            H.Hk_batch([[0, 0, 0]], format="sc:csr")
+        with pytest.raises(ValueError):
+            H.Hk_batch([[0, 0, 0]], out=np.empty([2, 2, 2]))
+
+    @pytest.mark.parametrize("spin", ["unpolarized", "polarized", "nc", "so"])
+    def test_construct_neighbor(self, setup, spin):
+        g = setup.g.tile(3, 0).tile(2, 1)
+        H1 = Hamiltonian(g, spin=spin)
+        n = H1.shape[-1]
+        on = np.arange(n) + 1.0
+        if spin == "so":
+            # ensure Hermitian on-site
+            on[[2, 3]] = on[[6, 7]] * [1, -1]
+            on[4:6] = 0
+        param = [(0.1, 1.5, 2.6), [tuple(on * f) for f in (1, 0.1, 0.01)]]
+        H1.construct(param)
+        H2 = Hamiltonian(g, spin=spin)
+        H2.construct(param, method="neighbor")
+        assert H1.spsame(H2)
+        assert np.allclose((H1 - H2)._csr._D, 0)
+
     def test_construct_raise_default(self, setup):
         # Test that construct fails with more than one
         # orbital
@@ -563,6 +733,34 @@ class TestHamiltonian:
         assert np.allclose(Hg.eigh(), Hc.eigh())
         del Hc, H
 
+    @pytest.mark.parametrize("orthogonal", [True, False])
+    @pytest.mark.parametrize("nthreads", [1, 2])
+    def test_eigh_batch(self, setup, orthogonal, nthreads):
+        if orthogonal:
+            H = setup.H.copy()
+            H.construct([(0.1, 1.5), (1.0, 0.1)])
+        else:
+            H = setup.HS.copy()
+            H.construct([(0.1, 1.5), ((1.0, 1.0), (0.1, 0.2))])
+
+        bz = MonkhorstPack(H, [3, 3, 1])
+        eigs = H.eigh_batch(bz.k, nthreads=nthreads, chunksize=2)
+        assert np.allclose(eigs, bz.apply.array.eigh())
+
+        eigs, vecs = H.eigh_batch(bz.k, eigvals_only=False, nthreads=nthreads)
+        for ik, k in enumerate(bz.k):
+            es = H.eigenstate(k)
+            assert np.allclose(eigs[ik], es.eig)
+            assert vecs[ik].shape == (len(H), len(H))
+
+    def test_eigh_batch_polarized(self, setup):
+        H = Hamiltonian(setup.g, spin=Spin("P"))
+        H.construct([(0.1, 1.5), ((1.0, 2.0), (0.1, 0.2))])
+        bz = MonkhorstPack(H, [3, 3, 1])
+        for spin in (0, 1):
+            eigs = H.eigh_batch(bz.k, spin=spin)
+            assert np.allclose(eigs, bz.apply.array.eigh(spin=spin))
+
     def test_eigh_vs_eig(self, setup, sisl_tolerance):
         atol, rtol = sisl_tolerance[np.complex64]
         allclose = partial(np.allclose, atol=atol, rtol=rtol)
@@ -1363,6 +1561,51 @@ class TestHamiltonian:
             for c_sp, c_np in zip(COOP_sp, COOP_np):
                 assert np.allclose(c_sp.toarray(), c_np)
 
+    def test_pdos_projection(self, setup):
+        HS = setup.HS.copy()
+        HS.construct([(0.1, 1.5), ((0.0, 1.0), (1.0, 0.1))])
+        HS = HS.tile(2, 0)
+        E = np.linspace(-4, 4, 21)
+        es = HS.eigenstate([0.1, 0.2, 0])
+        PDOS = es.PDOS(E)
+
+        assert np.allclose(es.PDOS(E, projection=[3, 1]), PDOS[:, [3, 1]])
+        PDOS_g = es.PDOS(E, projection=[[0, 1], [2]])
+        assert PDOS_g.shape == (1, 2, len(E))
+        assert np.allclose(PDOS_g[:, 0], PDOS[:, :2].sum(1))
+        assert np.allclose(PDOS_g[:, 1], PDOS[:, 2])
+
+        PDOS_a = es.PDOS(E, projection="atoms")
+        assert PDOS_a.shape == (1, HS.na, len(E))
+        assert np.allclose(PDOS_a, PDOS)
+        PDOS_s = es.PDOS(E, projection="species")
+        assert np.allclose(PDOS_s[:, 0], PDOS.sum(1))
+
+        # user-defined distributions
+        def dist(E):
+            return get_distribution("lorentzian")(E)
+
+        assert np.allclose(es.PDOS(E, dist), es.PDOS(E, "lorentzian"))
+
+        with pytest.raises(ValueError):
+            es.PDOS(E, projection="unknown")
+        with pytest.raises(ValueError):
+            es.PDOS(E, projection=[len(HS)])
+
+    def test_coop_orbitals(self, setup):
+        HS = setup.HS.copy()
+        HS.construct([(0.1, 1.5), ((0.0, 1.0), (1.0, 0.1))])
+        E = np.linspace(-4, 4, 21)
+        for format in ("csr", "array"):
+            es = HS.eigenstate([0.2] * 3, format=format)
+            COOP = es.COOP(E, "lorentzian")
+            COOP1 = es.COOP(E, "lorentzian", orbitals=[1])
+            for c, c1 in zip(COOP, COOP1):
+                if issparse(c):
+                    c, c1 = c.toarray(), c1.toarray()
+                assert c1.shape == (1, c.shape[1])
+                assert np.allclose(c[[1]], c1)
+
     def test_spin1(self, setup):
         g = Geometry(
             [[i, 0, 0] for i in range(10)],
@@ -2216,3 +2459,68 @@ def test_wavefunction_eta():
     grid = Grid(0.1, dtype=np.complex128, lattice=Lattice([2, 2, 2], origin=[-1] * 3))
     grid.fill(0.0)
     ES.sub(0).wavefunction(grid, eta=True)
+
+
+@pytest.mark.parametrize("spin", ["unpolarized", "nc"])
+def test_wavefunction_batch(spin):
+    N = 50
+    o1 = SphericalOrbital(0, (np.linspace(0, 2, N), np.exp(-np.linspace(0, 100, N))))
+    G = Geometry([[1] * 3, [2] * 3], Atom(6, o1), lattice=[4, 4, 4])
+    H = Hamiltonian(G, spin=Spin(spin))
+    R = [0.1, 1.5]
+    if spin == "nc":
+        param = [[0.0, 0.0, 0.1, -0.1], [1.0, 1.0, 0.1, -0.1]]
+    else:
+        param = [1.0, 0.1]
+    H.construct([R, param])
+    ES = H.eigenstate()
+
+    grid = Grid(0.1, dtype=np.complex128, geometry=G)
+    psi = ES.wavefunction_batch(grid, spinor=1)
+    assert psi.shape == (len(ES), *grid.shape)
+    # the grid is not altered
+    assert np.allclose(grid.grid, 0)
+
+    for i, es in enumerate(ES):
+        grid.fill(0.0)
+        es.wavefunction(grid, spinor=1)
+        assert np.allclose(psi[i], grid.grid)
+
+    weight = np.arange(len(ES))
+    grid = Grid(0.1, geometry=G)
+    ES.wavefunction_batch(grid, spinor=1, weight=weight)
+    assert np.allclose(grid.grid, np.einsum("i,i...->...", weight, np.abs(psi) ** 2))
+
+    with pytest.raises(ValueError):
+        ES.wavefunction_batch(grid, weight=[1.0])
+
+
+def test_wavefunction_batch_weight_memory():
+    tracemalloc = pytest.importorskip("tracemalloc")
+    N = 50
+    o1 = SphericalOrbital(0, (np.linspace(0, 2, N), np.exp(-np.linspace(0, 100, N))))
+    G = Geometry([[1] * 3, [2] * 3], Atom(6, o1), lattice=[4, 4, 4])
+    G = G.tile(2, 0).tile(2, 1).tile(2, 2)
+    H = Hamiltonian(G)
+    H.construct([[0.1, 1.5], [1.0, 0.1]])
+    ES = H.eigenstate()
+    weight = np.linspace(0.5, 1, len(ES))
+
+    # large enough that the states are calculated in chunks
+    grid = Grid([128, 128, 64], geometry=G)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        ES.wavefunction_batch(grid, weight=weight)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # much less than the wavefunctions of all states
+    assert peak / grid.grid.nbytes < len(ES) / 2
+
+    ref = np.zeros(grid.shape)
+    for w, es in zip(weight, ES):
+        psi = Grid(grid.shape, dtype=np.complex128, geometry=G)
+        es.wavefunction(psi)
+        ref += w * np.abs(psi.grid) ** 2
+    assert np.allclose(grid.grid, ref)
@@ -189,6 +189,43 @@ def test_sancho_green(setup):
     assert np.allclose(SL.green(E, k), SR.green(E, k))
 
 
+@pytest.mark.parametrize("D", ["+A", "-A"])
+@pytest.mark.parametrize("orthogonal", [True, False])
+def test_sancho_prepare(setup, D, orthogonal):
+    H = setup.H if orthogonal else setup.HS
+    SE = RecursiveSI(H, D)
+    k = [0, 0.13, 0]
+    E = np.linspace(-1, 1, 11)
+    p = SE.prepare(k)
+    assert len(p) == len(SE)
+
+    for batch in [None, 1, 4]:
+        se = p.self_energy(E, batch=batch)
+        bulk = p.self_energy(E, bulk=True, batch=batch)
+        G = p.green(E, batch=batch)
+        L, R = p.self_energy_lr(E, batch=batch)
+        assert se.shape == (len(E), len(SE), len(SE))
+        for i, e in enumerate(E):
+            assert np.allclose(se[i], SE.self_energy(e, k))
+            assert np.allclose(bulk[i], SE.self_energy(e, k, bulk=True))
+            assert np.allclose(G[i], SE.green(e, k))
+            SL, SR = SE.self_energy_lr(e, k)
+            assert np.allclose(L[i], SL)
+            assert np.allclose(R[i], SR)
+
+    # scalar energies
+    assert p.self_energy(0.1).shape == (len(SE), len(SE))
+    assert np.allclose(p.self_energy(0.1), SE.self_energy(0.1, k))
+
+
+def test_sancho_prepare_dtype(setup):
+    SE = RecursiveSI(setup.HS, "+A")
+    p = SE.prepare(dtype=np.complex64)
+    s64 = p.self_energy([0.1, 0.2])
+    assert s64.dtype == np.complex64
+    assert np.allclose(s64[0], SE.self_energy(0.1))
+
+
 def test_wideband_1(setup):
     SE = WideBandSE(10, 1e-2)
     assert SE.self_energy().shape == (10, 10)
@@ -230,6 +267,37 @@ def test_real_space_H(setup, k_axes, semi_axis, trs, bz, unfold):
     RSE.self_energy(0.1)
 
 
+@pytest.mark.parametrize("orthogonal", [True, False])
+@pytest.mark.parametrize("semi_axis", [0, 1])
+@pytest.mark.parametrize("trs", [True, False])
+@pytest.mark.parametrize("unfold", [(1, 1, 1), (2, 1, 1), (1, 3, 1), (2, 3, 1)])
+@pytest.mark.parametrize("nthreads", [1, 2])
+def test_real_space_green_batch(setup, orthogonal, semi_axis, trs, unfold, nthreads):
+    H = setup.H if orthogonal else setup.HS
+    RSE = RealSpaceSE(H, semi_axis, 1 - semi_axis, unfold, trs=trs, dk=20)
+    E = [0.1, -0.5 + 1e-3j, 1.2]
+    timings = {}
+    G = RSE.green_batch(E, nthreads=nthreads, timings=timings)
+    assert G.shape == (len(E), len(RSE), len(RSE))
+    for i, e in enumerate(E):
+        assert np.allclose(G[i], RSE.green(e))
+    assert set(timings.keys()) == {"self_energy", "green", "unfold", "reduce"}
+    assert timings["self_energy"] > 0
+
+
+def test_real_space_green_batch_k():
+    lattice = Lattice(1.0, nsc=[3] * 3)
+    H = Atom(Z=1, R=[1.001])
+    geom = Geometry([0] * 3, atoms=H, lattice=lattice)
+    H = Hamiltonian(geom)
+    H.construct(([0.001, 1.01], (0, -1)))
+    RSE = RealSpaceSE(H, 0, 1, (2, 3, 2), dk=20, trs=False)
+    k = [0, 0, 0.2]
+    G = RSE.green_batch([0.1, 0.3], k)
+    assert np.allclose(G[0], RSE.green(0.1, k))
+    assert np.allclose(G[1], RSE.green(0.3, k))
+
+
 def test_real_space_H_3d():
     lattice = Lattice(1.0, nsc=[3] * 3)
     H = Atom(Z=1, R=[1.001])
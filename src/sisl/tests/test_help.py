@@ -10,6 +10,7 @@ import numpy as np
 import pytest
 
 from sisl._help import (
+    LRUCache,
     array_fill_repeat,
     array_replace,
     dtype_complex_to_real,
@@ -65,3 +66,22 @@ def test_array_replace():
     arnew = array_replace(ar, ([1, 3], None), (5, None), other=4)
     assert np.all(arnew[[1, 3, 5]] == [1, 3, 5])
     assert np.all(np.delete(arnew, [1, 3, 5]) == 4)
+
+
+def test_lru_cache():
+    c = LRUCache(2)
+    c["a"] = 1
+    c["b"] = 2
+    assert c.get("a") == 1
+    c["c"] = 3
+    # "b" is the least recently used
+    assert "b" not in c
+    assert "a" in c and "c" in c
+    assert len(c) == 2
+    assert c.get("b", 4) == 4
+    c.clear()
+    assert len(c) == 0
+
+    c = LRUCache(0)
+    c["a"] = 1
+    assert len(c) == 0
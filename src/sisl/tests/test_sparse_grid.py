@@ -92,6 +92,74 @@ def test_wavefunction_correct(H, grid_shape, psi_values, k):
     assert np.allclose(from_psi_grid.grid, wf_grid.grid)
 
 
+@pytest.mark.parametrize("k", [(0, 0, 0), (0.25, -0.1, 0)])
+def test_wavefunction_skewed(k):
+    """Orbital values for a non-orthogonal lattice"""
+    r = np.linspace(0, 2.0, 50)
+    f = np.exp(-r)
+    orb = sisl.AtomicOrbital("2pzZ", (r, f))
+    geom = sisl.geom.graphene(atoms=sisl.Atom(6, orb)).translate([0.3, 0, 0.05])
+    H = sisl.Hamiltonian(geom)
+    H.construct([(0.1, 1.44), (0, -2.7)])
+
+    eig = H.eigenstate(k=k)[0]
+    eig.change_gauge("cell")
+    wf_grid = sisl.Grid(0.2, geometry=geom, dtype=np.complex128)
+    eig.wavefunction(wf_grid)
+
+    psi_values = geom._orbital_values(wf_grid.shape)
+    from_psi_grid = psi_values.reduce_orbitals(eig.state.T, k=k)
+
+    assert np.allclose(from_psi_grid.grid, wf_grid.grid)
+
+
+@pytest.mark.parametrize("k", [(0, 0, 0), (0.5, 0, 0)])
+def test_wavefunction_cache(H, grid_shape, k):
+    cache = sisl.physics.OrbitalValuesCache()
+    eigs = H.eigenstate(k=k)
+
+    for eig in eigs:
+        wf_grid = sisl.Grid(grid_shape, geometry=H.geometry, dtype=np.complex128)
+        eig.wavefunction(wf_grid)
+        cache_grid = sisl.Grid(grid_shape, geometry=H.geometry, dtype=np.complex128)
+        eig.wavefunction(cache_grid, cache=cache)
+        assert np.allclose(cache_grid.grid, wf_grid.grid)
+    # only a single evaluation of the orbitals
+    assert len(cache) == 1
+
+    # another grid shape
+    grid = sisl.Grid(0.2, geometry=H.geometry, dtype=np.complex128)
+    eigs.sub(0).wavefunction(grid, cache=cache)
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("k", [(0, 0, 0), (0.5, 0, 0)])
+def test_wavefunction_batch_cache(H, grid_shape, k):
+    cache = sisl.physics.OrbitalValuesCache()
+    eigs = H.eigenstate(k=k)
+    grid = sisl.Grid(grid_shape, geometry=H.geometry, dtype=np.complex128)
+    psi = eigs.wavefunction_batch(grid)
+    assert np.allclose(eigs.wavefunction_batch(grid, cache=cache), psi)
+    assert np.allclose(eigs.sub(1).wavefunction_batch(grid, cache=cache), psi[1:2])
+    assert len(cache) == 1
+
+    weight = np.arange(len(eigs)) + 1
+    grid = sisl.Grid(grid_shape, geometry=H.geometry)
+    eigs.wavefunction_batch(grid, weight=weight, cache=cache)
+    assert np.allclose(grid.grid, np.einsum("i,i...->...", weight, np.abs(psi) ** 2))
+
+
+def test_wavefunction_cache_lattice(H, grid_shape):
+    cache = sisl.physics.OrbitalValuesCache()
+    eig = H.eigenstate().sub(0)
+    grid = sisl.Grid(grid_shape, lattice=H.lattice.cell / 2, dtype=np.complex128)
+    with pytest.raises(ValueError):
+        eig.wavefunction(grid, cache=cache)
+
+
 @pytest.mark.skip(reason="bug in array indices, data-sc-off (sometimes)")
 @pytest.mark.parametrize(
     ["k", "ncoeffs"],
@@ -518,7 +518,7 @@ class BandsData(XarrayData):
 
         # Loop through eigenstates in the WFSX file and add their contribution to the bands
         ik = -1
-        for eigenstate in wfsx_sile.yield_eigenstate():
+        for eigenstate in wfsx_sile.yield_eigenstate(prefetch=2):
             i_spin = eigenstate.info.get("spin", 0)
             # Every time we encounter spin 0, we are in a new k point.
             if i_spin == 0:
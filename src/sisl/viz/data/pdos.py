@@ -387,7 +387,7 @@ class PDOSData(OrbitalData):
         # Loop through eigenstates in the WFSX file and add their contribution to the PDOS.
         # Note that we pass the hamiltonian as the parent here so that the overlap matrix
         # for each point can be calculated by eigenstate.PDOS()
-        for eigenstate in wfsx_sile.yield_eigenstate():
+        for eigenstate in wfsx_sile.yield_eigenstate(prefetch=2):
             spin = eigenstate.info.get("spin", 0)
             if nspin == 4:
                 spin = slice(None)